@@ -0,0 +1,79 @@
+"""
+Micro-benchmark: CPU time per query to get the top result out of a saved
+YouTube search response.
+
+Compares the fast-path scanner (spm2ytm.clients.yt_fast_search) against
+what a full parse costs: locating ytInitialData, json.loads on the whole
+document and walking it to the first videoRenderer (what yt-dlp does).
+
+Usage:
+    python scripts/bench_fast_search.py [--repeat 2000] [fixture ...]
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from spm2ytm.clients.yt_fast_search import parse_video_renderers  # noqa: E402
+
+DEFAULT_FIXTURES = [ROOT / "tests" / "fixtures" / "youtube_search_results.html"]
+INITIAL_DATA_RE = re.compile(r"var ytInitialData = (\{.*?\});</script>", re.S)
+
+
+def full_parse(page: str) -> str | None:
+    """Full-document baseline: parse everything, then walk to the first video."""
+    match = INITIAL_DATA_RE.search(page)
+    data = json.loads(match.group(1)) if match else json.loads(page)
+
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if "videoRenderer" in node:
+                return node["videoRenderer"]["videoId"]
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return None
+
+
+def fast_parse(page: str) -> str | None:
+    hits = parse_video_renderers(page, limit=1)
+    return hits[0].video_id if hits else None
+
+
+def bench(fn, page: str, repeat: int) -> float:
+    """CPU microseconds per call."""
+    start = time.process_time()
+    for _ in range(repeat):
+        fn(page)
+    return (time.process_time() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("fixtures", nargs="*", type=Path, default=DEFAULT_FIXTURES)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'fixture':<32} {'KB':>6} {'full us':>9} {'fast us':>9} {'speedup':>8}")
+    for path in args.fixtures:
+        page = path.read_text(encoding="utf-8")
+        assert full_parse(page) == fast_parse(page), "parsers disagree"
+
+        full = bench(full_parse, page, args.repeat)
+        fast = bench(fast_parse, page, args.repeat)
+        print(
+            f"{path.name:<32} {len(page) / 1024:>6.0f} {full:>9.1f} {fast:>9.1f}"
+            f" {full / fast:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark the search stage with thread vs process workers.
+
+By default searches go through a CPU-bound stand-in provider that parses a
+synthetic search response the way yt-dlp does (full JSON parse plus regex
+scans), so the numbers show GIL contention without touching the network.
+Pass --provider ytdlp to measure real searches instead.
+
+--log-mode measures logging overhead with a per-song message at DEBUG:
+"sync" writes each record inline (the old StreamHandler setup), "queue"
+hands records to the background listener with per-item rate limiting, and
+"quiet" only lets warnings through. Redirect stderr to take the terminal
+out of the measurement, or leave it to include it.
+
+Usage:
+    python scripts/bench_search_executors.py [--songs 200] [--workers 1 2 4 8]
+        [--log-mode sync queue quiet] 2>/dev/null
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+os.environ.setdefault("TQDM_DISABLE", "1")
+
+from spm2ytm.clients.search_providers import (SearchHit,  # noqa: E402
+                                              SearchProvider,
+                                              get_search_provider)
+from spm2ytm.core.create import generate_video_ids_file  # noqa: E402
+from spm2ytm.logging_setup import setup_logging, stop_logging  # noqa: E402
+
+LOG_MODES = {
+    "sync": dict(level=logging.DEBUG, background=False, item_rate=None),
+    "queue": dict(level=logging.DEBUG),
+    "quiet": dict(quiet=True),
+}
+
+VIDEO_ID_RE = re.compile(r'"videoId":"([A-Za-z0-9_-]{11})"')
+
+
+class SimulatedParseProvider(SearchProvider):
+    """Parses a ~0.5 MB synthetic search response per query."""
+
+    name = "simulated"
+
+    def __init__(self, renderers: int = 400):
+        # 400 renderers ≈ 0.5 MB, roughly a real results page
+        self.renderers = renderers
+        self._page = None
+
+    def _response(self) -> str:
+        if self._page is None:
+            contents = [
+                {
+                    "videoRenderer": {
+                        "videoId": f"{i:011d}",
+                        "title": {"runs": [{"text": f"Video title {i}"}]},
+                        "ownerText": {"runs": [{"text": f"Channel {i}"}]},
+                        "lengthText": {"simpleText": "3:45"},
+                        "thumbnail": {"thumbnails": [{"url": "x" * 200}] * 3},
+                    }
+                }
+                for i in range(self.renderers)
+            ]
+            self._page = json.dumps({"contents": contents}, separators=(",", ":"))
+        return self._page
+
+    def search(self, query: str) -> SearchHit | None:
+        data = json.loads(self._response())
+        ids = VIDEO_ID_RE.findall(self._response())
+        first = data["contents"][0]["videoRenderer"]
+        return SearchHit(video_id=ids[0], title=first["title"]["runs"][0]["text"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--songs", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--provider", default="simulated")
+    parser.add_argument("--renderers", type=int, default=400)
+    parser.add_argument(
+        "--log-mode", nargs="+", choices=list(LOG_MODES), default=["quiet"]
+    )
+    args = parser.parse_args()
+
+    if args.provider == "simulated":
+        provider = SimulatedParseProvider(args.renderers)
+    else:
+        provider = get_search_provider(args.provider)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        song_file = Path(tmp) / "songs.txt"
+        song_file.write_text(
+            "\n".join(f"Song {i} Artist {i}" for i in range(args.songs))
+        )
+
+        print(
+            f"{'log mode':>8} {'workers':>7} {'threads s':>10} "
+            f"{'processes s':>12} {'speedup':>8}"
+        )
+        for mode, workers in itertools.product(args.log_mode, args.workers):
+            setup_logging(**LOG_MODES[mode])
+            timings = {}
+            for kind in ("thread", "process"):
+                start = time.perf_counter()
+                generate_video_ids_file(
+                    str(song_file),
+                    max_workers=workers,
+                    provider=provider,
+                    executor_kind=kind,
+                )
+                timings[kind] = time.perf_counter() - start
+            stop_logging()
+            print(
+                f"{mode:>8} {workers:>7} {timings['thread']:>10.2f} "
+                f"{timings['process']:>12.2f} "
+                f"{timings['thread'] / timings['process']:>7.2f}x",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
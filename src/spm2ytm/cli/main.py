@@ -1,27 +1,154 @@
 import os
-import re
+from contextlib import closing
 
 import click
-from dotenv import load_dotenv
 
-from spm2ytm.clients.spotify_client import SpotifyClient
-from spm2ytm.core.create import create_youtube_playlist_from_spotify
-from spm2ytm.core.extract import (extract_liked_songs_to_text,
-                                  extract_playlist_to_text)
+from spm2ytm.clients.search_providers import PROVIDERS
 
-# Load .env into the shell environment
-load_dotenv()
+add_mode_option = click.option(
+    "--add-mode",
+    type=click.Choice(["direct", "click", "mirror"]),
+    default="direct",
+    show_default=True,
+    help=(
+        "Add videos with batched playlist-edit requests, click through the UI, "
+        "or mirror: also remove and reorder so the playlist matches exactly"
+    ),
+)
+
+preflight_option = click.option(
+    "--preflight/--no-preflight",
+    default=True,
+    help="Check every video ID is still available before adding it",
+)
+
+force_option = click.option(
+    "--force",
+    is_flag=True,
+    help=(
+        "Mirror even if some songs have no video ID; their entries are kept "
+        "and nothing is removed"
+    ),
+)
+
+
+def search_options(f):
+    """Add the search stage options to a command."""
+    f = click.option(
+        "--history/--no-history",
+        default=True,
+        help="Answer songs closely matching ones resolved before in data/playlists",
+    )(f)
+    f = click.option(
+        "--mappings/--no-mappings",
+        default=True,
+        help="Answer known songs from the local mapping store "
+        "(data/mappings.json.gz) and record new results there",
+    )(f)
+    f = click.option(
+        "--executor",
+        "executor_kind",
+        type=click.Choice(["thread", "process"]),
+        default="thread",
+        show_default=True,
+        help="Run searches in threads or in worker processes (multi-core)",
+    )(f)
+    f = click.option(
+        "--hedge-provider",
+        type=click.Choice(sorted(PROVIDERS)),
+        default=None,
+        help="Backend for hedged duplicate searches (default: --search-provider)",
+    )(f)
+    f = click.option(
+        "--hedge/--no-hedge",
+        default=False,
+        help="Duplicate searches that run past the p95 latency",
+    )(f)
+    return click.option(
+        "--search-provider",
+        type=click.Choice(sorted(PROVIDERS)),
+        default="ytdlp",
+        show_default=True,
+        help="Backend used to find a video for each song",
+    )(f)
+
+
+def _open_resolvers(mappings: bool, history: bool) -> list:
+    resolvers = []
+    if mappings:
+        from spm2ytm.core.mapping import MappingBundle
+
+        resolvers.append(MappingBundle.open())
+    if history:
+        from spm2ytm.core.history import HistoryIndex
+
+        resolvers.append(HistoryIndex.open())
+    return resolvers
 
 
 @click.group()
-def cli():
-    pass
+@click.option(
+    "--quiet",
+    "-q",
+    is_flag=True,
+    help="High-throughput mode: only warnings and errors, no progress bars",
+)
+@click.option(
+    "--trace",
+    is_flag=True,
+    help="Record stage and per-item spans to data/logs/trace-<time>.json "
+    "(Chrome trace-event format, for chrome://tracing or ui.perfetto.dev)",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Run the command under cProfile and write the report to data/logs "
+    "(covers every thread; not the worker processes of --executor process)",
+)
+@click.pass_context
+def cli(ctx, quiet, trace, profile):
+    # Heavy dependencies are imported inside the commands that use them,
+    # so startup only pays for click and whatever the command needs.
+    from dotenv import load_dotenv
+
+    from spm2ytm.logging_setup import setup_logging
+
+    # Load .env into the shell environment
+    load_dotenv()
+    if quiet:
+        os.environ["TQDM_DISABLE"] = "1"
+    setup_logging(quiet=quiet)
+
+    if trace or profile:
+        from spm2ytm import tracing
+
+    if trace:
+        tracing.start_tracing()
+        ctx.call_on_close(
+            lambda: click.echo(f"✓ Trace written to {tracing.stop_tracing()}", err=True)
+        )
+
+    if profile:
+        import cProfile
+
+        # On Python 3.12+ one profiler sees every thread of the process,
+        # including search and request pool workers started later
+        profiler = cProfile.Profile()
+
+        def write_profile():
+            profiler.disable()
+            path = tracing.write_profile(profiler)
+            click.echo(f"✓ Profile written to {path}", err=True)
+
+        # Runs after the subcommand, even if it failed
+        ctx.call_on_close(write_profile)
+        profiler.enable()
 
 
 @cli.command()
 @click.argument("playlist_url")
 @click.argument("action", required=False)
-@click.argument("youtube_playlist_name", required=False)
+@click.argument("youtube_playlist_names", nargs=-1)
 @click.option(
     "--output-path", required=False, help="Custom output directory for playlist file"
 )
@@ -31,22 +158,39 @@ def cli():
 @click.option(
     "--cookies-path", default="cookies.json", help="Path to YouTube cookies.json file"
 )
+@search_options
+@add_mode_option
+@preflight_option
+@force_option
 def playlist(
     playlist_url,
     action,
-    youtube_playlist_name,
+    youtube_playlist_names,
     output_path,
     client_id,
     client_secret,
     redirect_uri,
     cookies_path,
+    search_provider,
+    hedge,
+    hedge_provider,
+    executor_kind,
+    mappings,
+    history,
+    add_mode,
+    preflight,
+    force,
 ):
     """Extract Spotify playlist to text file, optionally create YouTube playlist.
 
     Usage:
         playlist <spotify_url>                          - Extract only
         playlist <spotify_url> ytp <youtube_playlist>   - Extract + Create YouTube playlist
+        playlist <spotify_url> ytp <name> <name> ...    - Add to several playlists
     """
+    from spm2ytm.clients.spotify_client import SpotifyClient
+    from spm2ytm.core.extract import (build_playlist_file_path,
+                                      extract_playlist_to_text)
 
     # Default output folder
     if not output_path:
@@ -55,22 +199,7 @@ def playlist(
 
     client = SpotifyClient(client_id, client_secret, redirect_uri)
 
-    # Get playlist ID and name
-    playlist_id = playlist_url.split("/")[-1].split("?")[0]
-    playlist_info = client.sp.playlist(playlist_id)
-    playlist_name = playlist_info.get("name", "")
-
-    # Sanitize playlist name: only alphanumerics and spaces
-    sanitized_name = re.sub(r"[^A-Za-z0-9 ]+", "", playlist_name).strip()
-    sanitized_name = sanitized_name.replace(" ", "_")
-
-    # Build filename
-    if sanitized_name:
-        filename = f"{playlist_id}-{sanitized_name}.txt"
-    else:
-        filename = f"{playlist_id}.txt"
-
-    file_path = os.path.join(output_path, filename)
+    file_path = build_playlist_file_path(client, playlist_url, output_path)
 
     # Extract playlist to text
     extract_playlist_to_text(client, playlist_url, file_path)
@@ -78,22 +207,34 @@ def playlist(
 
     # Check if user wants to create YouTube playlist
     if action == "ytp":
-        if not youtube_playlist_name:
+        if not youtube_playlist_names:
             click.echo("Error: YouTube playlist name required after 'ytp'", err=True)
             return
 
         click.echo(f"\n▶ Starting YouTube playlist creation...")
-        click.echo(f"  Target YouTube playlist: {youtube_playlist_name}")
+        click.echo(f"  Target YouTube playlist: {', '.join(youtube_playlist_names)}")
 
+        from spm2ytm.core.create import create_youtube_playlist_from_spotify
+        from spm2ytm.core.hedging import build_search_provider
+
+        provider = build_search_provider(search_provider, hedge, hedge_provider)
         try:
             create_youtube_playlist_from_spotify(
                 song_file_path=file_path,
-                playlist_name=youtube_playlist_name,
+                playlist_name=list(youtube_playlist_names),
                 cookies_path=cookies_path,
+                provider=provider,
+                executor_kind=executor_kind,
+                add_mode=add_mode,
+                preflight=preflight,
+                force=force,
+                resolvers=_open_resolvers(mappings, history),
             )
             click.echo(f"\n✓ Successfully created YouTube playlist!")
         except Exception as e:
             click.echo(f"\n✗ Error creating YouTube playlist: {e}", err=True)
+        finally:
+            provider.close()
 
     elif action is not None:
         click.echo(
@@ -103,7 +244,7 @@ def playlist(
 
 
 @cli.command()
-@click.argument("youtube_playlist_name")
+@click.argument("youtube_playlist_names", nargs=-1, required=True)
 @click.option(
     "--song-file",
     required=True,
@@ -113,15 +254,36 @@ def playlist(
 @click.option(
     "--cookies-path", default="cookies.json", help="Path to YouTube cookies.json file"
 )
-def ytp(youtube_playlist_name, song_file, cookies_path):
+@search_options
+@add_mode_option
+@preflight_option
+@force_option
+def ytp(
+    youtube_playlist_names,
+    song_file,
+    cookies_path,
+    search_provider,
+    hedge,
+    hedge_provider,
+    executor_kind,
+    mappings,
+    history,
+    add_mode,
+    preflight,
+    force,
+):
     """Create YouTube playlist from a custom song file (bypasses Spotify extraction).
 
     Usage:
         ytp <youtube_playlist_name> --song-file <path> --cookies-path <path>
+        ytp <name> <name> ... --song-file <path>   - Add to several playlists at once
     """
+    from spm2ytm.core.create import create_youtube_playlist_from_spotify
+    from spm2ytm.core.hedging import build_search_provider
+
     click.echo(f"▶ Creating YouTube playlist from custom song file")
     click.echo(f"  Song file: {song_file}")
-    click.echo(f"  Target YouTube playlist: {youtube_playlist_name}")
+    click.echo(f"  Target YouTube playlist: {', '.join(youtube_playlist_names)}")
     click.echo(f"  Cookies: {cookies_path}")
 
     # Verify song file exists
@@ -129,15 +291,24 @@ def ytp(youtube_playlist_name, song_file, cookies_path):
         click.echo(f"✗ Error: Song file not found at {song_file}", err=True)
         return
 
+    provider = build_search_provider(search_provider, hedge, hedge_provider)
     try:
         create_youtube_playlist_from_spotify(
             song_file_path=song_file,
-            playlist_name=youtube_playlist_name,
+            playlist_name=list(youtube_playlist_names),
             cookies_path=cookies_path,
+            provider=provider,
+            executor_kind=executor_kind,
+            add_mode=add_mode,
+            preflight=preflight,
+            force=force,
+            resolvers=_open_resolvers(mappings, history),
         )
         click.echo(f"\n✓ Successfully created YouTube playlist!")
     except Exception as e:
         click.echo(f"\n✗ Error creating YouTube playlist: {e}", err=True)
+    finally:
+        provider.close()
 
 
 @cli.command()
@@ -147,6 +318,8 @@ def ytp(youtube_playlist_name, song_file, cookies_path):
 @click.option("--redirect-uri", envvar="SPOTIFY_REDIRECT_URI", required=True)
 def liked(output_path, client_id, client_secret, redirect_uri):
     """Extract liked songs to text."""
+    from spm2ytm.clients.spotify_client import SpotifyClient
+    from spm2ytm.core.extract import extract_liked_songs_to_text
 
     # Default output folder
     if not output_path:
@@ -161,5 +334,506 @@ def liked(output_path, client_id, client_secret, redirect_uri):
     click.echo(f"Liked songs saved to {file_path}")
 
 
+@cli.command()
+@click.argument("output_path", required=False)
+@click.option("--client-id", envvar="SPOTIFY_CLIENT_ID", required=True)
+@click.option("--client-secret", envvar="SPOTIFY_CLIENT_SECRET", required=True)
+@click.option("--redirect-uri", envvar="SPOTIFY_REDIRECT_URI", required=True)
+@click.option(
+    "--concurrency",
+    default=8,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Spotify requests in flight at once, across all playlists",
+)
+@click.option(
+    "--rate",
+    default=10.0,
+    show_default=True,
+    type=click.FloatRange(min=0, min_open=True),
+    help="Maximum Spotify requests started per second",
+)
+def library(output_path, client_id, client_secret, redirect_uri, concurrency, rate):
+    """Extract every playlist in your Spotify library to text files."""
+    from spm2ytm.clients.spotify_client import SpotifyClient
+    from spm2ytm.core.extract import extract_library_to_text
+
+    # Default output folder
+    if not output_path:
+        output_path = os.path.join("data", "playlists")
+    os.makedirs(output_path, exist_ok=True)
+
+    client = SpotifyClient(
+        client_id,
+        client_secret,
+        redirect_uri,
+        max_connections=concurrency,
+        rate_limit=rate,
+    )
+    exported = extract_library_to_text(client, output_path)
+    failed = sum(1 for path, _ in exported if path is None)
+    click.echo(f"✓ {len(exported) - failed} playlists saved to {output_path}")
+    if failed:
+        click.echo(f"✗ {failed} playlists could not be fetched", err=True)
+
+
+@cli.command()
+@click.argument("song_file", type=click.Path(exists=True, dir_okay=False))
+@click.option("--output", "output_path", help="Default: <song_file>-unique.txt")
+@click.option(
+    "--clusters-out",
+    help="Duplicate clusters for review (default: <song_file>-duplicates.txt)",
+)
+@click.option(
+    "--threshold",
+    default=0.7,
+    show_default=True,
+    type=click.FloatRange(0.0, 1.0),
+    help="Word-overlap similarity needed to call two songs near duplicates",
+)
+@click.option("--exact-only", is_flag=True, help="Skip near-duplicate detection")
+@click.option(
+    "--search", is_flag=True, help="Search video IDs for the deduplicated songs"
+)
+@search_options
+def dedupe(
+    song_file,
+    output_path,
+    clusters_out,
+    threshold,
+    exact_only,
+    search,
+    search_provider,
+    hedge,
+    hedge_provider,
+    executor_kind,
+    mappings,
+    history,
+):
+    """Remove exact and near-duplicate songs from a song file."""
+    from spm2ytm.core.dedupe import dedupe_file
+
+    output, result = dedupe_file(
+        song_file,
+        output_path=output_path,
+        clusters_path=clusters_out,
+        near=not exact_only,
+        threshold=threshold,
+    )
+    click.echo(f"✓ {len(result.unique)} unique songs saved to: {output}")
+    click.echo(
+        f"  Removed {result.exact_removed} exact and {result.near_removed} near "
+        f"duplicates in {len(result.clusters)} clusters"
+    )
+
+    if search:
+        from spm2ytm.core.create import generate_video_ids_file
+        from spm2ytm.core.hedging import build_search_provider
+
+        provider = build_search_provider(search_provider, hedge, hedge_provider)
+        with closing(provider):
+            ids_file = generate_video_ids_file(
+                output,
+                provider=provider,
+                executor_kind=executor_kind,
+                resolvers=_open_resolvers(mappings, history),
+            )
+        click.echo(f"✓ Video IDs saved to: {ids_file}")
+
+
+@cli.command("bench-search")
+@click.argument("song_file", type=click.Path(exists=True))
+@click.option(
+    "--provider",
+    "-p",
+    "providers",
+    multiple=True,
+    type=click.Choice(sorted(PROVIDERS)),
+    help="Provider to benchmark (repeatable, default: all)",
+)
+@click.option("--limit", default=50, show_default=True, help="Songs to search")
+@click.option("--workers", default=4, show_default=True, help="Parallel searches")
+def bench_search(song_file, providers, limit, workers):
+    """Compare search providers on latency, hit rate and match quality."""
+    from spm2ytm.clients.search_providers import get_search_provider
+    from spm2ytm.core.benchmark import benchmark_providers, format_reports
+
+    with open(song_file, "r", encoding="utf-8") as f:
+        songs = [line.strip() for line in f if line.strip()][:limit]
+
+    names = providers or sorted(PROVIDERS)
+    click.echo(f"▶ Benchmarking {', '.join(names)} on {len(songs)} songs")
+
+    reports = benchmark_providers(
+        songs, [get_search_provider(name) for name in names], max_workers=workers
+    )
+    click.echo(format_reports(reports))
+
+
+@cli.command()
+@click.argument("song_file", type=click.Path(exists=True, dir_okay=False))
+@search_options
+def search(
+    song_file,
+    search_provider,
+    hedge,
+    hedge_provider,
+    executor_kind,
+    mappings,
+    history,
+):
+    """Search video IDs for a song file and write <song_file>-ID.txt.
+
+    Usage:
+        search <song_file>   - e.g. on one node, for a shard from 'shard'
+    """
+    from spm2ytm.core.create import generate_video_ids_file
+    from spm2ytm.core.hedging import build_search_provider
+
+    provider = build_search_provider(search_provider, hedge, hedge_provider)
+    with closing(provider):
+        ids_file = generate_video_ids_file(
+            song_file,
+            provider=provider,
+            executor_kind=executor_kind,
+            resolvers=_open_resolvers(mappings, history),
+        )
+    click.echo(f"✓ Video IDs saved to: {ids_file}")
+
+
+@cli.command()
+@click.argument("songs", nargs=-1, required=True)
+@click.option("--limit", default=3, show_default=True, help="Matches per song")
+def lookup(songs, limit):
+    """Show the closest songs resolved in earlier runs, with similarity scores."""
+    from spm2ytm.core.history import HistoryIndex
+
+    index = HistoryIndex.open()
+    click.echo(f"▶ {len(index)} songs indexed from data/playlists")
+    for song in songs:
+        click.echo(f"\n{song}")
+        matches = index.search(song, limit)
+        if not matches:
+            click.echo("  (no match)")
+        for match in matches:
+            click.echo(f"  {match.score:.3f}  {match.video_id}  {match.song}")
+
+
+@cli.command()
+@click.argument("song_file", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "-n", "--shards", required=True, type=click.IntRange(min=1), help="Shard count"
+)
+@click.option("--output-dir", help="Default: next to the song file")
+def shard(song_file, shards, output_dir):
+    """Split a song file into hash-partitioned shards to search on several hosts.
+
+    Usage:
+        shard songs.txt -n 4                   - songs.shard-01-of-04.txt (+ .idx) ...
+        search songs.shard-01-of-04.txt        - on each host
+        merge songs.shard-*-ID.txt             - songs-ID.txt, in the original order
+    """
+    from spm2ytm.core.shard import shard_song_file
+
+    paths = shard_song_file(song_file, shards, output_dir)
+    for path in paths:
+        click.echo(f"  {path}")
+    click.echo(f"✓ Split {song_file} into {len(paths)} shards")
+
+
+@cli.command()
+@click.argument(
+    "ids_files", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False)
+)
+@click.option("-o", "--output", help="Default: <song_file>-ID.txt next to the shards")
+def merge(ids_files, output):
+    """Reassemble the shards' -ID.txt files into one, in the original song order."""
+    from spm2ytm.core.shard import merge_shard_ids
+
+    try:
+        output = merge_shard_ids(list(ids_files), output)
+    except (ValueError, FileNotFoundError) as e:
+        raise click.ClickException(str(e))
+    click.echo(f"✓ Video IDs saved to: {output}")
+
+
+DEFAULT_MAPPING_STORE = os.path.join("data", "mappings.json.gz")
+
+
+@cli.group()
+def mapping():
+    """Share song → video ID mappings between machines."""
+    pass
+
+
+@mapping.command("export")
+@click.argument("output", type=click.Path(dir_okay=False))
+@click.argument("song_files", nargs=-1, type=click.Path(exists=True))
+@click.option("--store", default=DEFAULT_MAPPING_STORE, show_default=True)
+@click.option(
+    "--min-confidence",
+    default=0.0,
+    show_default=True,
+    type=click.FloatRange(0.0, 1.0),
+    help="Leave out mappings below this confidence",
+)
+def mapping_export(output, song_files, store, min_confidence):
+    """Write a bundle from the local store plus song files and their -ID.txt.
+
+    Usage:
+        mapping export bundle.json.gz [data/playlists/*.txt]
+    """
+    from spm2ytm.core.mapping import MappingBundle
+
+    bundle = MappingBundle()
+    if os.path.exists(store):
+        bundle.merge(MappingBundle.load(store))
+    for song_file in song_files:
+        if song_file.endswith("-ID.txt"):
+            continue
+        try:
+            stats = bundle.add_id_file(song_file)
+        except FileNotFoundError:
+            click.echo(f"  Skipping {song_file}: no -ID.txt file next to it")
+            continue
+        click.echo(f"  {song_file}: {stats}")
+
+    bundle.entries = {
+        key: m for key, m in bundle.entries.items() if m.confidence >= min_confidence
+    }
+    bundle.save(output)
+    click.echo(f"✓ Exported {len(bundle)} mappings to {output}")
+
+
+@mapping.command("import")
+@click.argument("bundles", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option("--store", default=DEFAULT_MAPPING_STORE, show_default=True)
+def mapping_import(bundles, store):
+    """Merge bundles into the local store used by the search stage."""
+    from spm2ytm.core.mapping import MappingBundle
+
+    local = MappingBundle.open(store)
+    for path in bundles:
+        stats = local.merge(MappingBundle.load(path))
+        click.echo(f"  {path}: {stats}")
+    local.save()
+    click.echo(f"✓ {store} now holds {len(local)} mappings")
+
+
+@mapping.command("merge")
+@click.argument("bundles", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option("-o", "--output", required=True, type=click.Path(dir_okay=False))
+def mapping_merge(bundles, output):
+    """Combine bundles; conflicts keep the higher-confidence, then newer, entry."""
+    from spm2ytm.core.mapping import MappingBundle
+
+    merged = MappingBundle()
+    for path in bundles:
+        stats = merged.merge(MappingBundle.load(path))
+        click.echo(f"  {path}: {stats}")
+    merged.save(output)
+    click.echo(f"✓ Merged {len(merged)} mappings into {output}")
+
+
+DEFAULT_JOBS_DB = os.path.join("data", "jobs.sqlite3")
+
+
+@cli.group()
+def service():
+    """Queue conversions and run them in a long-running service."""
+    pass
+
+
+@service.command("submit")
+@click.argument("playlist_url", required=False)
+@click.argument("youtube_playlist_names", nargs=-1)
+@click.option(
+    "--song-file",
+    type=click.Path(exists=True),
+    help="Skip extraction and search this song file instead",
+)
+@click.option(
+    "--output-path", required=False, help="Custom output directory for playlist file"
+)
+@click.option(
+    "--cookies-path", default="cookies.json", help="Path to YouTube cookies.json file"
+)
+@add_mode_option
+@preflight_option
+@force_option
+@click.option("--max-attempts", default=5, show_default=True, type=int)
+@click.option(
+    "--source",
+    default="",
+    help="Who the job is for; the service takes turns between sources",
+)
+@click.option("--db", "db_path", default=DEFAULT_JOBS_DB, show_default=True)
+def service_submit(
+    playlist_url,
+    youtube_playlist_names,
+    song_file,
+    output_path,
+    cookies_path,
+    add_mode,
+    preflight,
+    force,
+    max_attempts,
+    source,
+    db_path,
+):
+    """Enqueue a conversion job.
+
+    Usage:
+        service submit <spotify_url> [youtube_playlist ...]
+        service submit --song-file <path> [youtube_playlist ...]
+    """
+    from spm2ytm.core.queue import JobQueue
+
+    if song_file:
+        # With --song-file every positional argument is a YouTube playlist
+        if playlist_url:
+            youtube_playlist_names = (playlist_url, *youtube_playlist_names)
+        stage = "search"
+        payload = {"song_file": song_file}
+    elif playlist_url:
+        stage = "extract"
+        payload = {"playlist_url": playlist_url, "output_path": output_path}
+    else:
+        raise click.UsageError("Provide a Spotify playlist URL or --song-file")
+
+    payload["youtube_playlist_name"] = list(youtube_playlist_names)
+    payload["cookies_path"] = cookies_path
+    payload["add_mode"] = add_mode
+    payload["preflight"] = preflight
+    payload["force"] = force
+
+    queue = JobQueue(db_path)
+    job_id = queue.submit(stage, payload, max_attempts=max_attempts, source=source)
+    queue.close()
+    click.echo(f"✓ Queued job {job_id} (starting at '{stage}')")
+
+
+@service.command("status")
+@click.argument("job_id", required=False, type=int)
+@click.option("--status", "status_filter", help="Only list jobs with this status")
+@click.option("--limit", default=20, show_default=True, type=int)
+@click.option("--db", "db_path", default=DEFAULT_JOBS_DB, show_default=True)
+def service_status(job_id, status_filter, limit, db_path):
+    """Show queue counts, recent jobs, or a single job."""
+    from spm2ytm.core.queue import STAGES, JobQueue
+
+    queue = JobQueue(db_path)
+    try:
+        if job_id is not None:
+            job = queue.get(job_id)
+            if job is None:
+                click.echo(f"✗ Job {job_id} not found", err=True)
+                return
+            click.echo(f"Job {job.id}: {job.stage} / {job.status}")
+            click.echo(f"  Attempts: {job.attempts}/{job.max_attempts}")
+            if job.source:
+                click.echo(f"  Source: {job.source}")
+            for key, value in job.payload.items():
+                click.echo(f"  {key}: {value}")
+            if job.last_error:
+                click.echo(f"  Last error: {job.last_error}")
+            return
+
+        counts = queue.counts()
+        for stage in STAGES:
+            per_status = {
+                status: n for (s, status), n in counts.items() if s == stage
+            }
+            summary = ", ".join(f"{k}={v}" for k, v in sorted(per_status.items()))
+            click.echo(f"{stage:<8} {summary or '-'}")
+
+        click.echo("")
+        for job in queue.list_jobs(status=status_filter, limit=limit):
+            target = job.payload.get("playlist_url") or job.payload.get("song_file")
+            line = f"#{job.id:<5} {job.stage:<8} {job.status:<8} {target}"
+            if job.last_error:
+                line += f"  ({job.last_error})"
+            click.echo(line)
+    finally:
+        queue.close()
+
+
+@service.command("run")
+@click.option("--extract-workers", default=2, show_default=True, type=int)
+@click.option("--search-workers", default=2, show_default=True, type=int)
+@click.option("--add-workers", default=1, show_default=True, type=int)
+@click.option(
+    "--search-threads",
+    default=4,
+    show_default=True,
+    type=int,
+    help="Parallel searches within each search job",
+)
+@search_options
+@click.option("--drain", is_flag=True, help="Exit once the queue is empty")
+@click.option(
+    "--shutdown-timeout",
+    default=30.0,
+    show_default=True,
+    type=float,
+    help="Seconds to wait for running jobs when stopping",
+)
+@click.option("--client-id", envvar="SPOTIFY_CLIENT_ID")
+@click.option("--client-secret", envvar="SPOTIFY_CLIENT_SECRET")
+@click.option("--redirect-uri", envvar="SPOTIFY_REDIRECT_URI")
+@click.option("--db", "db_path", default=DEFAULT_JOBS_DB, show_default=True)
+def service_run(
+    extract_workers,
+    search_workers,
+    add_workers,
+    search_threads,
+    search_provider,
+    hedge,
+    hedge_provider,
+    executor_kind,
+    mappings,
+    history,
+    drain,
+    shutdown_timeout,
+    client_id,
+    client_secret,
+    redirect_uri,
+    db_path,
+):
+    """Process queued jobs until interrupted (or drained)."""
+    from spm2ytm.clients.spotify_client import SpotifyClient
+    from spm2ytm.core.queue import JobQueue
+    from spm2ytm.core.service import ConversionService
+
+    spotify_client_factory = None
+    if client_id and client_secret and redirect_uri:
+        spotify_client_factory = lambda: SpotifyClient(
+            client_id, client_secret, redirect_uri
+        )
+
+    queue = JobQueue(db_path)
+    svc = ConversionService(
+        queue,
+        concurrency={
+            "extract": extract_workers,
+            "search": search_workers,
+            "add": add_workers,
+        },
+        spotify_client_factory=spotify_client_factory,
+        search_workers=search_threads,
+        search_provider=search_provider,
+        hedge=hedge,
+        hedge_provider=hedge_provider,
+        executor_kind=executor_kind,
+        resolvers=_open_resolvers(mappings, history),
+        shutdown_timeout=shutdown_timeout,
+    )
+    click.echo(f"▶ Running conversion service on {db_path}")
+    # Workers still inside a job after the shutdown timeout keep using the
+    # queue until the process exits
+    if svc.run(drain=drain):
+        queue.close()
+
+
 if __name__ == "__main__":
     cli()
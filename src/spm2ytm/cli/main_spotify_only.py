@@ -2,19 +2,27 @@ import os
 import re
 
 import click
-from dotenv import load_dotenv
-
-from spm2ytm.clients.spotify_client import SpotifyClient
-from spm2ytm.core.extract import (extract_liked_songs_to_text,
-                                  extract_playlist_to_text)
-
-# Load .env into the shell environment
-load_dotenv()
 
 
 @click.group()
-def cli():
-    pass
+@click.option(
+    "--quiet",
+    "-q",
+    is_flag=True,
+    help="High-throughput mode: only warnings and errors, no progress bars",
+)
+def cli(quiet):
+    # Heavy dependencies are imported inside the commands that use them,
+    # so startup only pays for click and whatever the command needs.
+    from dotenv import load_dotenv
+
+    from spm2ytm.logging_setup import setup_logging
+
+    # Load .env into the shell environment
+    load_dotenv()
+    if quiet:
+        os.environ["TQDM_DISABLE"] = "1"
+    setup_logging(quiet=quiet)
 
 
 @cli.command()
@@ -25,6 +33,8 @@ def cli():
 @click.option("--redirect-uri", envvar="SPOTIFY_REDIRECT_URI", required=True)
 def playlist(playlist_url, output_path, client_id, client_secret, redirect_uri):
     """Extract any Spotify playlist to a text file."""
+    from spm2ytm.clients.spotify_client import SpotifyClient
+    from spm2ytm.core.extract import extract_playlist_to_text
 
     # Default output folder
     if not output_path:
@@ -62,6 +72,8 @@ def playlist(playlist_url, output_path, client_id, client_secret, redirect_uri):
 @click.option("--redirect-uri", envvar="SPOTIFY_REDIRECT_URI", required=True)
 def liked(output_path, client_id, client_secret, redirect_uri):
     """Extract liked songs to text."""
+    from spm2ytm.clients.spotify_client import SpotifyClient
+    from spm2ytm.core.extract import extract_liked_songs_to_text
 
     # Default output folder
     if not output_path:
@@ -0,0 +1,72 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Status codes worth retrying; 429 responses carry a Retry-After header
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# Idempotent methods only: a retried POST could apply twice
+RETRY_METHODS = frozenset(["GET", "HEAD", "PUT", "DELETE"])
+
+
+class CappedRetry(Retry):
+    """
+    Retry that waits at most `max_retry_after` seconds for a Retry-After
+    header, so a server asking for an hour does not stall a worker that long.
+    """
+
+    def __init__(self, *args, max_retry_after: float = 60.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_retry_after = max_retry_after
+
+    def new(self, **kw) -> "CappedRetry":
+        # urllib3 builds a new Retry after every attempt; keep the cap
+        retry = super().new(**kw)
+        retry.max_retry_after = self.max_retry_after
+        return retry
+
+    def get_retry_after(self, response) -> float | None:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.max_retry_after)
+
+
+def build_session(
+    max_connections: int = 10,
+    retries: int = 5,
+    backoff_factor: float = 0.5,
+    max_retry_after: float = 60.0,
+) -> requests.Session:
+    """
+    Build a keep-alive HTTP session with a connection pool and retries.
+
+    Args:
+        max_connections: Connection pool size (should cover concurrent fetches)
+        retries: Maximum retries per request (idempotent methods only)
+        backoff_factor: Exponential backoff factor between retries
+        max_retry_after: Longest Retry-After wait honoured, in seconds
+
+    Returns:
+        requests.Session (shared by the Spotify API and OAuth clients)
+    """
+    retry = CappedRetry(
+        total=retries,
+        connect=retries,
+        read=False,
+        status=retries,
+        allowed_methods=RETRY_METHODS,
+        status_forcelist=RETRY_STATUS_CODES,
+        backoff_factor=backoff_factor,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+        max_retry_after=max_retry_after,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=max_connections,
+        pool_maxsize=max_connections,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -0,0 +1,78 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable
+
+from spm2ytm import tracing
+
+
+class RequestScheduler:
+    """
+    Shared executor for API requests with global concurrency and rate limits.
+
+    Every request of a run goes through one scheduler, so the limits hold
+    however many playlists (or other jobs) are being fetched at once. The
+    rate limit is a token bucket: up to `burst` requests start back to back,
+    after which starts are spaced to `rate` per second.
+
+    Args:
+        max_concurrency: Requests in flight at once
+        rate: Average requests started per second (None: unlimited)
+        burst: Requests allowed to start without waiting after an idle
+            period (default: max_concurrency)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        rate: float | None = None,
+        burst: int | None = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.burst = burst or max_concurrency
+        self.requests = 0
+        self.waited = 0.0  # seconds workers spent held back by the rate limit
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="request"
+        )
+
+    def _acquire(self):
+        with self._lock:
+            self.requests += 1
+            if not self.rate:
+                return
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            # Reserve a token even if it is not there yet; the debt sets how
+            # long this request waits behind the ones already reserved
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.waited += wait
+        if wait:
+            with tracing.span("rate limit", "wait", seconds=round(wait, 3)):
+                time.sleep(wait)
+
+    def _run(self, fn: Callable, args: tuple):
+        self._acquire()
+        with tracing.span("request", "http"):
+            return fn(*args)
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """Schedule fn(*args); it starts once a worker and a rate token are free."""
+        executor = tracing.trace_queue(self._executor, "queued request")
+        return executor.submit(self._run, fn, args)
+
+    def map(self, fn: Callable, iterable: Iterable) -> list:
+        """fn over every item through the scheduler, results in input order."""
+        futures = [self.submit(fn, item) for item in iterable]
+        return [future.result() for future in futures]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,290 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+
+@dataclass
+class SearchHit:
+    """Top search result for a query."""
+
+    video_id: str
+    title: str = ""
+    channel: str = ""
+    duration: int | None = None  # seconds
+
+
+class SearchProvider(ABC):
+    """
+    Interface for song → video search backends.
+
+    Implementations must be safe to call from several worker threads.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def search(self, query: str) -> SearchHit | None:
+        """Return the best matching video for `query`, or None if nothing matched."""
+
+    def summary(self) -> str | None:
+        """Optional one-line report logged at the end of a search run."""
+        return None
+
+    def close(self):
+        """Release threads or sessions held by the provider; a no-op by default."""
+
+
+class YtDlpSearchProvider(SearchProvider):
+    """
+    Searches YouTube through yt-dlp's 'ytsearch1:' extractor.
+
+    Each thread keeps one YoutubeDL primed with the shared search bootstrap
+    (client config, visitor data and cookies), so per-session setup happens
+    once per run rather than once per query. When a search fails, the
+    bootstrap is refreshed and the search retried once.
+
+    Args:
+        bootstrap: Bootstrap cache (default: the process-wide one, persisted
+            under data/cache)
+    """
+
+    name = "ytdlp"
+
+    def __init__(self, bootstrap=None):
+        from spm2ytm.clients.yt_bootstrap import default_bootstrap_cache
+
+        self.bootstrap = bootstrap or default_bootstrap_cache()
+        self._local = threading.local()
+
+    def __getstate__(self):
+        return {"bootstrap": self.bootstrap}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def _ydl(self, bootstrap):
+        local = self._local
+        if getattr(local, "ydl", None) is None or local.bootstrap is not bootstrap:
+            from spm2ytm.clients.yt_client import new_ytdlp
+
+            if getattr(local, "ydl", None) is not None:
+                local.ydl.close()
+            local.ydl = new_ytdlp(bootstrap)
+            local.bootstrap = bootstrap
+        return local.ydl
+
+    def search(self, query: str) -> SearchHit | None:
+        from spm2ytm.clients.yt_client import search_entry_ytdlp
+
+        bootstrap = self.bootstrap.get()
+        try:
+            entry = search_entry_ytdlp(query, self._ydl(bootstrap))
+        except ValueError:
+            raise
+        except Exception:
+            self.bootstrap.invalidate(bootstrap)
+            fresh = self.bootstrap.get()
+            if fresh is bootstrap:
+                raise
+            entry = search_entry_ytdlp(query, self._ydl(fresh))
+
+        if not entry or not entry.get("id"):
+            return None
+
+        duration = entry.get("duration")
+        return SearchHit(
+            video_id=entry["id"],
+            title=entry.get("title") or "",
+            channel=entry.get("channel") or entry.get("uploader") or "",
+            duration=int(duration) if duration else None,
+        )
+
+    def summary(self) -> str | None:
+        return self.bootstrap.summary()
+
+
+class YTMusicSearchProvider(SearchProvider):
+    """
+    Searches YouTube Music's song catalog through ytmusicapi.
+
+    Unauthenticated; one YTMusic instance (and HTTP session) per thread.
+    """
+
+    name = "ytmusic"
+
+    def __init__(self, filter: str = "songs"):
+        self.filter = filter
+        self._local = threading.local()
+
+    def __getstate__(self):
+        # Clients are per thread (and per process); never pickle them
+        return {"filter": self.filter}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def _client(self):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            from ytmusicapi import YTMusic
+
+            client = self._local.client = YTMusic()
+        return client
+
+    def search(self, query: str) -> SearchHit | None:
+        if not query.strip():
+            raise ValueError("Query must not be empty.")
+
+        results = self._client().search(query, filter=self.filter, limit=1)
+        for result in results:
+            if not result.get("videoId"):
+                continue
+            artists = result.get("artists") or []
+            return SearchHit(
+                video_id=result["videoId"],
+                title=result.get("title") or "",
+                channel=artists[0].get("name", "") if artists else "",
+                duration=result.get("duration_seconds"),
+            )
+        return None
+
+
+class FastSearchProvider(SearchProvider):
+    """
+    Fetches the YouTube results page directly and scans it for the first
+    video renderer, skipping yt-dlp's extractor machinery. Falls back to
+    `fallback` (yt-dlp) when the page shape is not recognized, e.g. on
+    consent walls or layout changes.
+    """
+
+    name = "fast"
+
+    def __init__(
+        self,
+        fallback: SearchProvider | None = None,
+        timeout: float = 15.0,
+        bootstrap=None,
+    ):
+        from spm2ytm.clients.yt_bootstrap import default_bootstrap_cache
+
+        self.bootstrap = bootstrap or default_bootstrap_cache()
+        self.fallback = fallback or YtDlpSearchProvider(self.bootstrap)
+        self.timeout = timeout
+        self.fallbacks = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return {
+            "fallback": self.fallback,
+            "timeout": self.timeout,
+            "bootstrap": self.bootstrap,
+        }
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def fetch(self, query: str) -> str:
+        from spm2ytm.clients.yt_fast_search import (fetch_search_page,
+                                                    new_search_session)
+
+        # Sessions carry the bootstrap's cookies; replace them when it changes
+        bootstrap = self.bootstrap.get()
+        local = self._local
+        if getattr(local, "session", None) is None or local.bootstrap is not bootstrap:
+            local.session = new_search_session(bootstrap)
+            local.bootstrap = bootstrap
+        return fetch_search_page(local.session, query, self.timeout)
+
+    def search(self, query: str) -> SearchHit | None:
+        from spm2ytm.clients.yt_fast_search import (has_results_layout,
+                                                    parse_video_renderers)
+
+        if not query.strip():
+            raise ValueError("Query must not be empty.")
+
+        page = self.fetch(query)
+        hits = parse_video_renderers(page, limit=1)
+        if hits:
+            return hits[0]
+        if has_results_layout(page):
+            return None
+
+        # Consent walls and odd layouts often mean the session went stale
+        self.bootstrap.invalidate(getattr(self._local, "bootstrap", None))
+        with self._lock:
+            self.fallbacks += 1
+        return self.fallback.search(query)
+
+    def summary(self) -> str | None:
+        lines = []
+        if self.fallbacks:
+            lines.append(
+                f"Fast search fell back to {self.fallback.name} "
+                f"{self.fallbacks} time(s)"
+            )
+        bootstrap = self.bootstrap.summary()
+        if bootstrap:
+            lines.append(bootstrap)
+        return "\n".join(lines) or None
+
+
+class FakeSearchProvider(SearchProvider):
+    """
+    In-memory provider for tests and benchmarks.
+
+    Args:
+        results: Mapping of query -> SearchHit, video ID string, None
+            (not found) or an exception instance to raise
+        latency: Seconds to sleep per search (or a callable query -> seconds)
+    """
+
+    name = "fake"
+
+    def __init__(self, results: dict | None = None, latency=0.0):
+        self.results = results or {}
+        self.latency = latency
+        self.calls: list[str] = []
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def search(self, query: str) -> SearchHit | None:
+        with self._lock:
+            self.calls.append(query)
+
+        delay = self.latency(query) if callable(self.latency) else self.latency
+        if delay:
+            time.sleep(delay)
+
+        result = self.results.get(query)
+        if isinstance(result, BaseException):
+            raise result
+        if isinstance(result, str):
+            return SearchHit(video_id=result, title=query)
+        return result
+
+
+PROVIDERS = {
+    YtDlpSearchProvider.name: YtDlpSearchProvider,
+    YTMusicSearchProvider.name: YTMusicSearchProvider,
+    FastSearchProvider.name: FastSearchProvider,
+}
+
+
+def get_search_provider(name: str) -> SearchProvider:
+    """Instantiate a search provider by name ('ytdlp', 'ytmusic' or 'fast')."""
+    try:
+        return PROVIDERS[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown search provider '{name}'. Expected one of {sorted(PROVIDERS)}"
+        ) from None
@@ -1,21 +1,91 @@
 import logging
 import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
 
 import spotipy
 from spotipy.oauth2 import SpotifyOAuth
 
-logging.basicConfig(
-    level=logging.INFO,  # Set log level
-    format="%(asctime)s - %(levelname)s - %(message)s",  # Log format
-    handlers=[logging.StreamHandler()],  # Print logs to terminal
-)
+from spm2ytm.clients.http_session import build_session
+from spm2ytm.clients.request_scheduler import RequestScheduler
+from spm2ytm.errors.custom_errors import SpotifyAuthError
+
 logger = logging.getLogger(__name__)
 
 
+class _TokenManager:
+    """
+    Thread-safe spotipy auth manager.
+
+    Refreshes the access token with the cached refresh token whenever it
+    expires, so long runs never fall back to the interactive prompt.
+    """
+
+    def __init__(self, oauth: SpotifyOAuth, token_info: dict):
+        self.oauth = oauth
+        self._token_info = token_info
+        self._lock = threading.Lock()
+
+    def get_access_token(self, as_dict: bool = False):
+        with self._lock:
+            if self.oauth.is_token_expired(self._token_info):
+                logger.info("Spotify access token expired, refreshing...")
+                # Spotify may rotate the refresh token; spotipy caches the new one
+                self._token_info = self.oauth.refresh_access_token(
+                    self._token_info["refresh_token"]
+                )
+            token_info = self._token_info
+
+        return token_info if as_dict else token_info["access_token"]
+
+
+@dataclass
+class PlaylistTracks:
+    """One playlist of a library fetch."""
+
+    playlist_id: str
+    name: str
+    tracks: list[dict] = field(default_factory=list)
+    pages: int = 0
+    seconds: float = 0.0  # first page request to last page received
+    error: str | None = None
+
+
 class SpotifyClient:
-    def __init__(self, client_id: str, client_secret: str, redirect_uri: str):
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        redirect_uri: str,
+        max_connections: int = 8,
+        retries: int = 5,
+        backoff_factor: float = 0.5,
+        interactive: bool | None = None,
+        rate_limit: float | None = None,
+    ):
+        """
+        Args:
+            client_id: Spotify app client ID
+            client_secret: Spotify app client secret
+            redirect_uri: Redirect URI registered for the app
+            max_connections: Keep-alive pool size, also the number of pages
+                fetched concurrently across all requests of the client
+            retries: Retries per request (429 responses honor Retry-After)
+            backoff_factor: Exponential backoff factor between retries
+            interactive: Allow prompting for authorization when no refresh
+                token is cached (default: only when stdin is a terminal)
+            rate_limit: Maximum API requests started per second across the
+                client (default: unlimited)
+        """
         logger.info("Initializing Spotify client...")
 
+        self.max_connections = max_connections
+        self.interactive = sys.stdin.isatty() if interactive is None else interactive
+        self.session = build_session(max_connections, retries, backoff_factor)
+        self.scheduler = RequestScheduler(max_connections, rate_limit)
+
         # Use a cache file in the user's home directory
         cache_path = os.path.join(os.path.expanduser("~"), ".cache_spotify")
 
@@ -27,21 +97,34 @@ class SpotifyClient:
             cache_path=cache_path,
             show_dialog=True,
             open_browser=False,  # disable auto browser
+            requests_session=self.session,
         )
 
-        # Get token (either cached or manual)
-        token = self._get_token()
-        self.sp = spotipy.Spotify(auth=token)
+        # Get token (cached, refreshed or manual)
+        self.auth = _TokenManager(self.oauth, self._get_token())
+        self.sp = spotipy.Spotify(
+            auth_manager=self.auth, requests_session=self.session
+        )
 
         logger.info("Spotify client initialized.")
 
-    def _get_token(self) -> str:
-        """Retrieve Spotify token, prompt manually if necessary."""
+    def _get_token(self) -> dict:
+        """Retrieve Spotify token info, refreshing or prompting if necessary."""
         token_info = self.oauth.get_cached_token()
 
         # If cached token exists and is valid, use it
         if token_info and not self.oauth.is_token_expired(token_info):
-            return token_info["access_token"]
+            return token_info
+
+        # Expired, but we can refresh without the user
+        if token_info and token_info.get("refresh_token"):
+            logger.info("Cached Spotify token expired, refreshing...")
+            return self.oauth.refresh_access_token(token_info["refresh_token"])
+
+        if not self.interactive:
+            raise SpotifyAuthError(
+                "No cached Spotify refresh token. Run once interactively to authorize."
+            )
 
         # Otherwise, need user to authorize manually
         auth_url = self.oauth.get_authorize_url()
@@ -54,30 +137,47 @@ class SpotifyClient:
 
         # Extract code and fetch access token
         code = self.oauth.parse_response_code(response)
-        token_info = self.oauth.get_access_token(code, as_dict=True)
+        token_info = self.oauth.get_access_token(code, as_dict=True, check_cache=False)
+
+        return token_info
+
+    def _fetch_all_pages(self, fetch_page, limit: int) -> list[dict]:
+        """
+        Fetch every page of a paged endpoint, concurrently after the first.
+
+        Args:
+            fetch_page: Callable (offset, limit) -> Spotify paging object
+            limit: Page size
+
+        Returns:
+            All items in order
+        """
+        first = self.scheduler.submit(fetch_page, 0, limit).result()
+        total = first.get("total") or 0
+        offsets = range(limit, total, limit)
+
+        pages = [first]
+        pages.extend(self.scheduler.map(lambda o: fetch_page(o, limit), offsets))
+        return [item for page in pages for item in page["items"]]
 
-        return token_info["access_token"]
+    @staticmethod
+    def _parse_track(track: dict) -> dict:
+        return {
+            "title": track["name"],
+            "artist": (track["artists"][0]["name"] if track["artists"] else ""),
+        }
 
     def get_liked_songs(self) -> list[dict]:
         """Fetch all liked songs."""
         logger.info("Fetching liked songs...")
 
-        tracks = []
-        results = self.sp.current_user_saved_tracks()
-
-        while results:
-            for item in results["items"]:
-                track = item["track"]
-                tracks.append(
-                    {
-                        "title": track["name"],
-                        "artist": (
-                            track["artists"][0]["name"] if track["artists"] else ""
-                        ),
-                    }
-                )
-
-            results = self.sp.next(results) if results.get("next") else None
+        items = self._fetch_all_pages(
+            lambda offset, limit: self.sp.current_user_saved_tracks(
+                limit=limit, offset=offset
+            ),
+            limit=50,
+        )
+        tracks = [self._parse_track(item["track"]) for item in items]
 
         logger.info(f"Fetched {len(tracks)} liked songs.")
         return tracks
@@ -87,23 +187,109 @@ class SpotifyClient:
         logger.info(f"Fetching Spotify playlist: {playlist_url}")
 
         playlist_id = playlist_url.split("/")[-1].split("?")[0]
-        results = self.sp.playlist_items(playlist_id)
-        tracks = []
-
-        while results:
-            for item in results["items"]:
-                track = item["track"]
-                if track:
-                    tracks.append(
-                        {
-                            "title": track["name"],
-                            "artist": (
-                                track["artists"][0]["name"] if track["artists"] else ""
-                            ),
-                        }
-                    )
-
-            results = self.sp.next(results) if results.get("next") else None
+        items = self._fetch_all_pages(
+            lambda offset, limit: self.sp.playlist_items(
+                playlist_id, limit=limit, offset=offset
+            ),
+            limit=100,
+        )
+        tracks = [self._parse_track(item["track"]) for item in items if item["track"]]
 
         logger.info(f"Fetched {len(tracks)} tracks from playlist.")
         return tracks
+
+    def get_user_playlists(self) -> list[dict]:
+        """
+        List the user's playlists (owned and followed).
+
+        Returns:
+            Dicts with 'id', 'name' and 'total' (track count) per playlist
+        """
+        logger.info("Listing Spotify playlists...")
+
+        items = self._fetch_all_pages(
+            lambda offset, limit: self.sp.current_user_playlists(
+                limit=limit, offset=offset
+            ),
+            limit=50,
+        )
+        playlists = [
+            {
+                "id": item["id"],
+                "name": item.get("name") or "",
+                "total": (item.get("tracks") or {}).get("total") or 0,
+            }
+            for item in items
+            if item
+        ]
+
+        logger.info(f"Found {len(playlists)} playlists.")
+        return playlists
+
+    def get_playlists_tracks(
+        self, playlists: list[dict], page_size: int = 100
+    ) -> list[PlaylistTracks]:
+        """
+        Fetch the tracks of many playlists at once.
+
+        Every page of every playlist is queued on the client's scheduler up
+        front, using the track counts from get_user_playlists, so the
+        concurrency and rate limits apply to the whole library rather than
+        to one playlist at a time. A playlist that fails (e.g. one the API
+        no longer serves) is reported and does not stop the others.
+
+        Args:
+            playlists: Dicts with 'id', 'name' and 'total'
+            page_size: Tracks per request (Spotify allows up to 100)
+
+        Returns:
+            One PlaylistTracks per playlist, in input order
+        """
+
+        def fetch_page(playlist_id: str, offset: int):
+            start = time.perf_counter()
+            page = self.sp.playlist_items(playlist_id, limit=page_size, offset=offset)
+            return start, time.perf_counter(), page
+
+        queued = [
+            (
+                playlist,
+                [
+                    self.scheduler.submit(fetch_page, playlist["id"], offset)
+                    for offset in range(0, playlist["total"], page_size)
+                ],
+            )
+            for playlist in playlists
+        ]
+
+        results = []
+        for playlist, futures in queued:
+            result = PlaylistTracks(playlist["id"], playlist["name"])
+            try:
+                pages = [future.result() for future in futures]
+                # The playlist may have grown since it was listed
+                total = (pages[-1][2].get("total") or 0) if pages else 0
+                extra = range(len(pages) * page_size, total, page_size)
+                pages.extend(
+                    self.scheduler.map(lambda o: fetch_page(playlist["id"], o), extra)
+                )
+            except Exception as e:
+                for future in futures:
+                    future.cancel()
+                result.error = str(e)
+                results.append(result)
+                continue
+
+            result.pages = len(pages)
+            if pages:
+                result.seconds = max(end for _, end, _ in pages) - min(
+                    start for start, _, _ in pages
+                )
+            result.tracks = [
+                self._parse_track(item["track"])
+                for _, _, page in pages
+                for item in page["items"]
+                if item["track"]
+            ]
+            results.append(result)
+        return results
@@ -0,0 +1,208 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+BOOTSTRAP_URL = "https://www.youtube.com/"
+DEFAULT_BOOTSTRAP_CACHE = os.path.join("data", "cache", "yt_bootstrap.json")
+DEFAULT_TTL = 6 * 3600  # visitor data stays usable for days; refresh well before
+MIN_REFRESH_INTERVAL = 60.0  # never refetch more often than this
+
+API_KEY_RE = re.compile(r'"INNERTUBE_API_KEY":"([^"]+)"')
+CLIENT_VERSION_RE = re.compile(r'"INNERTUBE_CLIENT_VERSION":"([^"]+)"')
+VISITOR_DATA_RE = re.compile(r'"VISITOR_DATA":"([^"]+)"')
+
+
+@dataclass
+class Bootstrap:
+    """Per-session state YouTube hands out on the first page load."""
+
+    api_key: str
+    client_version: str
+    visitor_data: str
+    cookies: dict[str, str] = field(default_factory=dict)
+    fetched_at: float = 0.0
+    expires_at: float = 0.0
+
+    def expired(self, now: float | None = None) -> bool:
+        return (now if now is not None else time.time()) >= self.expires_at
+
+
+def parse_bootstrap(
+    page: str, cookies: dict[str, str], ttl: float = DEFAULT_TTL
+) -> Bootstrap:
+    """
+    Pull the innertube client config out of a YouTube page's ytcfg.
+
+    Raises:
+        ValueError: If the page carries no client config (e.g. a consent wall)
+    """
+    api_key = API_KEY_RE.search(page)
+    client_version = CLIENT_VERSION_RE.search(page)
+    visitor_data = VISITOR_DATA_RE.search(page)
+    if not (api_key and client_version and visitor_data):
+        raise ValueError("YouTube page has no client config")
+
+    now = time.time()
+    return Bootstrap(
+        api_key=api_key.group(1),
+        client_version=client_version.group(1),
+        visitor_data=visitor_data.group(1),
+        cookies=cookies,
+        fetched_at=now,
+        expires_at=now + ttl,
+    )
+
+
+def fetch_bootstrap(ttl: float = DEFAULT_TTL, timeout: float = 15.0) -> Bootstrap:
+    """Load the YouTube home page once and capture its client config and cookies."""
+    from spm2ytm.clients.yt_fast_search import new_search_session
+
+    session = new_search_session()
+    response = session.get(BOOTSTRAP_URL, timeout=timeout)
+    response.raise_for_status()
+    cookies = {
+        cookie.name: cookie.value
+        for cookie in session.cookies
+        if cookie.domain.endswith("youtube.com") and cookie.value is not None
+    }
+    return parse_bootstrap(response.text, cookies, ttl)
+
+
+class BootstrapCache:
+    """
+    Search session bootstrap shared by every worker thread, persisted to disk
+    so worker processes and later runs reuse it until it expires.
+
+    `fetches` counts bootstraps fetched from YouTube; `reuses` counts the
+    times a cached one was handed out instead.
+
+    Args:
+        path: JSON file holding the bootstrap (None keeps it in memory only)
+        ttl: Seconds a fetched bootstrap is used before fetching a new one
+        fetcher: Callable ttl -> Bootstrap (default: fetch_bootstrap)
+        min_refresh_interval: Minimum seconds between fetches, so failing
+            requests or an unreachable YouTube cannot cause a fetch storm
+    """
+
+    def __init__(
+        self,
+        path: str | None = DEFAULT_BOOTSTRAP_CACHE,
+        ttl: float = DEFAULT_TTL,
+        fetcher: Callable[[float], Bootstrap] = fetch_bootstrap,
+        min_refresh_interval: float = MIN_REFRESH_INTERVAL,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.fetcher = fetcher
+        self.min_refresh_interval = min_refresh_interval
+        self.fetches = 0
+        self.reuses = 0
+        self._state: Bootstrap | None = None
+        self._last_attempt = float("-inf")
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Worker processes start with their own counters and read the file
+        return {
+            "path": self.path,
+            "ttl": self.ttl,
+            "fetcher": self.fetcher,
+            "min_refresh_interval": self.min_refresh_interval,
+        }
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def get(self) -> Bootstrap | None:
+        """
+        Return a usable bootstrap, fetching one only if none is cached.
+
+        Returns:
+            The bootstrap, or None if fetching failed recently (callers then
+            run without one)
+        """
+        with self._lock:
+            if self._state is None or self._state.expired():
+                self._state = self._load()
+            if self._state is not None:
+                self.reuses += 1
+                return self._state
+            return self._fetch()
+
+    def invalidate(self, stale: Bootstrap | None):
+        """
+        Drop `stale` after requests made with it started failing.
+
+        Only the bootstrap that failed is dropped, so concurrent failures
+        from many workers cause a single refetch.
+        """
+        with self._lock:
+            if stale is None or stale is not self._state:
+                return
+            if time.monotonic() - self._last_attempt < self.min_refresh_interval:
+                return
+            logger.info("Search bootstrap rejected, fetching a new one")
+            self._state = None
+            if self.path and os.path.exists(self.path):
+                os.remove(self.path)
+
+    def summary(self) -> str | None:
+        if not self.fetches and not self.reuses:
+            return None
+        return f"Search bootstrap: {self.fetches} fetched, {self.reuses} reused"
+
+    def _fetch(self) -> Bootstrap | None:
+        now = time.monotonic()
+        if now - self._last_attempt < self.min_refresh_interval:
+            return None
+        self._last_attempt = now
+
+        try:
+            state = self.fetcher(self.ttl)
+        except Exception as e:
+            logger.warning(f"Could not fetch search bootstrap, searching without: {e}")
+            return None
+
+        self.fetches += 1
+        self._state = state
+        self._save(state)
+        return state
+
+    def _load(self) -> Bootstrap | None:
+        if not self.path or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = Bootstrap(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+        return None if state.expired() else state
+
+    def _save(self, state: Bootstrap):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(state), f)
+        os.replace(tmp_path, self.path)
+
+
+_default_cache: BootstrapCache | None = None
+_default_lock = threading.Lock()
+
+
+def default_bootstrap_cache() -> BootstrapCache:
+    """Process-wide cache shared by all providers (and their fallbacks)."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = BootstrapCache()
+        return _default_cache
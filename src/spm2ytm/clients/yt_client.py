@@ -1,24 +1,72 @@
-import re
+import unicodedata
 
 from yt_dlp import YoutubeDL
 
+from spm2ytm.clients.yt_bootstrap import Bootstrap
 
-def search_video_ytdlp(query: str) -> str | None:
+
+def ytdlp_options(bootstrap: Bootstrap | None = None) -> dict:
     """
-    Searches YouTube using yt-dlp and returns the first video's ID.
+    yt-dlp options for flat searches.
+
+    With a bootstrap, yt-dlp skips downloading the YouTube home page for its
+    client config on every search and uses the cached API key and visitor
+    data instead.
+    """
+    opts = {
+        "quiet": True,
+        "skip_download": True,
+        "extract_flat": True,  # faster, metadata only
+    }
+    if bootstrap is not None:
+        opts["extractor_args"] = {
+            "youtubetab": {"skip": ["webpage"]},
+            "youtube": {
+                "innertube_key": [bootstrap.api_key],
+                "visitor_data": [bootstrap.visitor_data],
+            },
+        }
+    return opts
+
+
+def new_ytdlp(bootstrap: Bootstrap | None = None) -> YoutubeDL:
+    """YoutubeDL for searching, carrying the bootstrap's cookies if given."""
+    ydl = YoutubeDL(ytdlp_options(bootstrap))
+    if bootstrap is not None:
+        from requests.cookies import create_cookie
+
+        for name, value in bootstrap.cookies.items():
+            ydl.cookiejar.set_cookie(create_cookie(name, value, domain=".youtube.com"))
+    return ydl
+
+
+def _is_query_char(char: str) -> bool:
+    return char.isalnum() or char in " _" or unicodedata.category(char)[0] == "M"
+
+
+def search_entry_ytdlp(query: str, ydl: YoutubeDL | None = None) -> dict | None:
+    """
+    Searches YouTube using yt-dlp and returns the first result's metadata.
 
     Rules:
-    - Query may contain: letters, numbers, spaces, underscores.
+    - Query may contain: letters, numbers and their combining marks in any
+      script (see spm2ytm.normalize.display_form), spaces, underscores.
     - Uses yt-dlp's 'ytsearch1:' to fetch only the top result.
 
+    Args:
+        query: Search query
+        ydl: YoutubeDL to reuse (see new_ytdlp); a throwaway one is created
+            if not given
+
     Returns:
-        video_id (str) if found, otherwise None.
+        Flat entry dict (id, title, channel, duration, ...) if found,
+        otherwise None.
     """
 
     # ------------------------
     # Validate query
     # ------------------------
-    if not re.fullmatch(r"[A-Za-z0-9_ ]+", query):
+    if not query.strip() or not all(map(_is_query_char, query)):
         raise ValueError(
             "Query may only contain letters, numbers, spaces, and underscores."
         )
@@ -26,16 +74,13 @@ def search_video_ytdlp(query: str) -> str | None:
     # ------------------------
     # yt-dlp search
     # ------------------------
-    ydl_opts = {
-        "quiet": True,
-        "skip_download": True,
-        "extract_flat": True,  # faster, metadata only
-    }
-
     search_term = f"ytsearch1:{query}"
 
-    with YoutubeDL(ydl_opts) as ydl:
+    if ydl is not None:
         info = ydl.extract_info(search_term, download=False)
+    else:
+        with YoutubeDL(ytdlp_options()) as ydl:
+            info = ydl.extract_info(search_term, download=False)
 
     # ------------------------
     # Process response
@@ -44,7 +89,19 @@ def search_video_ytdlp(query: str) -> str | None:
     if not entries:
         return None
 
-    first = entries[0]
+    return entries[0]
+
+
+def search_video_ytdlp(query: str) -> str | None:
+    """
+    Searches YouTube using yt-dlp and returns the first video's ID.
+
+    Returns:
+        video_id (str) if found, otherwise None.
+    """
+    first = search_entry_ytdlp(query)
+    if not first:
+        return None
 
     # id is guaranteed in extract_flat mode
     video_id = first.get("id")
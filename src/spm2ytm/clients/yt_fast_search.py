@@ -0,0 +1,121 @@
+import json
+import re
+from urllib.parse import quote_plus
+
+from spm2ytm.clients.search_providers import SearchHit
+
+SEARCH_URL = "https://www.youtube.com/results?search_query={query}"
+
+RENDERER_MARKER = '"videoRenderer":{'
+# Renderers are a few KB; cap the slice scanned per renderer
+MAX_RENDERER_CHARS = 20000
+
+# A JSON string body: anything but quote/backslash, or an escape sequence
+_JSON_STR = r'((?:[^"\\]|\\.)*)'
+VIDEO_ID_RE = re.compile(r'"videoId":"([A-Za-z0-9_-]{11})"')
+TITLE_RE = re.compile(r'"title":\{"runs":\[\{"text":"' + _JSON_STR + '"')
+OWNER_RE = re.compile(r'"ownerText":\{"runs":\[\{"text":"' + _JSON_STR + '"')
+# lengthText nests an accessibility label before its simpleText
+LENGTH_RE = re.compile(r'"lengthText":\{.{0,400}?"simpleText":"([0-9:]+)"', re.S)
+
+
+def _unescape(raw: str) -> str:
+    try:
+        return json.loads(f'"{raw}"')
+    except ValueError:
+        return raw
+
+
+def _parse_duration(text: str) -> int | None:
+    """'1:02:03' / '3:45' -> seconds."""
+    try:
+        seconds = 0
+        for part in text.split(":"):
+            seconds = seconds * 60 + int(part)
+        return seconds
+    except ValueError:
+        return None
+
+
+def parse_video_renderers(page: str, limit: int = 3) -> list[SearchHit]:
+    """
+    Pull the first `limit` video results out of a YouTube search response.
+
+    Works on both the HTML results page (ytInitialData) and the innertube
+    JSON response. Instead of parsing the whole document, it jumps from
+    one '"videoRenderer":{' marker to the next and runs small regexes over
+    a bounded slice, stopping as soon as `limit` results are found.
+
+    Returns:
+        SearchHits in page order (empty if the page shape is not recognized)
+    """
+    hits = []
+    pos = page.find(RENDERER_MARKER)
+    while pos != -1 and len(hits) < limit:
+        start = pos + len(RENDERER_MARKER)
+        next_pos = page.find(RENDERER_MARKER, start)
+        end = next_pos if next_pos != -1 else len(page)
+        chunk = page[start : min(end, start + MAX_RENDERER_CHARS)]
+
+        video_id = VIDEO_ID_RE.search(chunk)
+        if video_id:
+            title = TITLE_RE.search(chunk)
+            owner = OWNER_RE.search(chunk)
+            length = LENGTH_RE.search(chunk)
+            hits.append(
+                SearchHit(
+                    video_id=video_id.group(1),
+                    title=_unescape(title.group(1)) if title else "",
+                    channel=_unescape(owner.group(1)) if owner else "",
+                    duration=_parse_duration(length.group(1)) if length else None,
+                )
+            )
+        pos = next_pos
+    return hits
+
+
+def has_results_layout(page: str) -> bool:
+    """True if the page looks like a real results page (even with zero hits)."""
+    return '"estimatedResults"' in page
+
+
+def new_search_session(bootstrap=None):
+    """
+    requests.Session with browser-like headers and the consent cookie set.
+
+    Args:
+        bootstrap: Optional Bootstrap whose cookies and client version the
+            session reuses, so YouTube treats all requests as one visitor
+    """
+    import requests
+
+    session = requests.Session()
+    session.headers.update(
+        {
+            "User-Agent": (
+                "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+                "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+            ),
+            "Accept-Language": "en-US,en;q=0.9",
+        }
+    )
+    # Skip the EU consent interstitial
+    session.cookies.set("SOCS", "CAI", domain=".youtube.com")
+    if bootstrap is not None:
+        for name, value in bootstrap.cookies.items():
+            session.cookies.set(name, value, domain=".youtube.com")
+        session.headers.update(
+            {
+                "X-YouTube-Client-Name": "1",
+                "X-YouTube-Client-Version": bootstrap.client_version,
+                "X-Goog-Visitor-Id": bootstrap.visitor_data,
+            }
+        )
+    return session
+
+
+def fetch_search_page(session, query: str, timeout: float = 15.0) -> str:
+    url = SEARCH_URL.format(query=quote_plus(query))
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.text
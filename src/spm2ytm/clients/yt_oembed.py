@@ -0,0 +1,63 @@
+import re
+from dataclasses import dataclass
+
+OEMBED_URL = "https://www.youtube.com/oembed"
+WATCH_URL = "https://www.youtube.com/watch?v={video_id}"
+VIDEO_ID_RE = re.compile(r"^[A-Za-z0-9_-]{11}$")
+
+# Probe outcomes
+VALID = "valid"
+DEAD = "dead"
+UNKNOWN = "unknown"  # could not tell (throttled, server error, network)
+
+
+@dataclass
+class ProbeResult:
+    video_id: str
+    status: str
+    reason: str = ""
+    title: str = ""
+
+
+def probe_video(
+    session, video_id: str, base_url: str = OEMBED_URL, timeout: float = 10.0
+) -> ProbeResult:
+    """
+    Check that a video exists and is public with one oEmbed request.
+
+    oEmbed answers 404 for removed and private videos and 400 for malformed
+    IDs; 401/403 only mean embedding is disabled, so the video is still
+    addable. It does not see region blocks.
+
+    Args:
+        session: requests.Session (may carry retries for 429/5xx)
+        video_id: YouTube video ID
+        base_url: oEmbed endpoint (overridable for tests)
+        timeout: Request timeout in seconds
+    """
+    if not VIDEO_ID_RE.match(video_id):
+        return ProbeResult(video_id, DEAD, "malformed video ID")
+
+    try:
+        response = session.get(
+            base_url,
+            params={"url": WATCH_URL.format(video_id=video_id), "format": "json"},
+            timeout=timeout,
+        )
+    except Exception as e:
+        return ProbeResult(video_id, UNKNOWN, f"request failed: {e}")
+
+    status = response.status_code
+    if status == 200:
+        try:
+            title = response.json().get("title", "")
+        except ValueError:
+            title = ""
+        return ProbeResult(video_id, VALID, title=title)
+    if status in (401, 403):
+        return ProbeResult(video_id, VALID, "embedding disabled")
+    if status == 404:
+        return ProbeResult(video_id, DEAD, "unavailable or private")
+    if status == 400:
+        return ProbeResult(video_id, DEAD, "rejected as invalid")
+    return ProbeResult(video_id, UNKNOWN, f"HTTP {status}")
@@ -0,0 +1,277 @@
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass
+
+from spm2ytm import tracing
+from spm2ytm.errors.custom_errors import PlaylistEditError
+from spm2ytm.logging_setup import PER_ITEM
+
+logger = logging.getLogger(__name__)
+
+YOUTUBE_ORIGIN = "https://www.youtube.com"
+
+
+def sapisid_hash(
+    sapisid: str, origin: str = YOUTUBE_ORIGIN, now: int | None = None
+) -> str:
+    """Authorization header value YouTube's web client sends with cookies."""
+    timestamp = int(time.time()) if now is None else now
+    digest = hashlib.sha1(f"{timestamp} {sapisid} {origin}".encode()).hexdigest()
+    return f"SAPISIDHASH {timestamp}_{digest}"
+
+
+@dataclass(frozen=True)
+class PlaylistItem:
+    video_id: str
+    set_video_id: str  # identifies this entry; a video may appear twice
+
+
+def _walk(node):
+    """Yield every dict nested anywhere in a JSON document, in document order."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            yield node
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+
+def _text(node) -> str:
+    if not isinstance(node, dict):
+        return ""
+    if "simpleText" in node:
+        return node["simpleText"]
+    return "".join(run.get("text", "") for run in node.get("runs", []))
+
+
+class PlaylistEditor:
+    """
+    Edits playlists through YouTube's internal (innertube) endpoints, reusing
+    the logged-in browser session instead of clicking through the UI.
+
+    Args:
+        request: Object with Playwright's APIRequestContext.post() interface,
+            e.g. `context.request`, which sends the context's cookies
+        api_key: INNERTUBE_API_KEY from the page's ytcfg
+        client_context: INNERTUBE_CONTEXT from the page's ytcfg
+        sapisid: Value of the SAPISID cookie
+        base_url: Origin to send requests to
+        batch_size: Video IDs per edit request
+    """
+
+    def __init__(
+        self,
+        request,
+        api_key: str,
+        client_context: dict,
+        sapisid: str,
+        base_url: str = YOUTUBE_ORIGIN,
+        batch_size: int = 50,
+    ):
+        self.request = request
+        self.api_key = api_key
+        self.client_context = client_context
+        self.sapisid = sapisid
+        self.base_url = base_url.rstrip("/")
+        self.batch_size = batch_size
+
+    @classmethod
+    def from_page(cls, page, context, **kwargs) -> "PlaylistEditor":
+        """Build an editor from a logged-in Playwright page on youtube.com."""
+        config = page.evaluate(
+            "() => ({key: ytcfg.get('INNERTUBE_API_KEY'),"
+            " context: ytcfg.get('INNERTUBE_CONTEXT')})"
+        )
+        sapisid = next(
+            (
+                c["value"]
+                for c in context.cookies(YOUTUBE_ORIGIN)
+                if c["name"] in ("SAPISID", "__Secure-3PAPISID")
+            ),
+            None,
+        )
+        if not config.get("key") or not sapisid:
+            raise PlaylistEditError("Missing innertube config or SAPISID cookie")
+        return cls(
+            context.request, config["key"], config["context"], sapisid, **kwargs
+        )
+
+    def _post(self, endpoint: str, body: dict) -> dict:
+        url = (
+            f"{self.base_url}/youtubei/v1/{endpoint}"
+            f"?key={self.api_key}&prettyPrint=false"
+        )
+        origin = YOUTUBE_ORIGIN
+        headers = {
+            "Authorization": sapisid_hash(self.sapisid, origin),
+            "Content-Type": "application/json",
+            "Origin": origin,
+            "X-Origin": origin,
+            "X-Goog-AuthUser": "0",
+        }
+        payload = {"context": self.client_context, **body}
+        try:
+            with tracing.span(endpoint, "http"):
+                response = self.request.post(
+                    url, headers=headers, data=json.dumps(payload)
+                )
+        except Exception as e:
+            # Playwright raises its own Error/TimeoutError for transport failures
+            raise PlaylistEditError(f"{endpoint} request failed: {e}") from e
+        if not response.ok:
+            raise PlaylistEditError(
+                f"{endpoint} failed with HTTP {response.status}", response.status
+            )
+        try:
+            return response.json()
+        except ValueError as e:
+            raise PlaylistEditError(f"{endpoint} returned a non-JSON body") from e
+
+    def find_playlist_ids(
+        self, playlist_names: list[str], video_id: str
+    ) -> dict[str, str]:
+        """
+        Look up several of the account's playlists by title in one request,
+        using the same data that fills the "Save" dialog for `video_id`.
+
+        Returns:
+            Mapping of title -> playlist ID for the titles that were found
+        """
+        data = self._post("playlist/get_add_to_playlist", {"videoIds": [video_id]})
+        wanted = set(playlist_names)
+        found = {}
+        for node in _walk(data):
+            option = node.get("playlistAddToOptionRenderer")
+            if not option:
+                continue
+            title = _text(option.get("title"))
+            if title in wanted and title not in found:
+                found[title] = option.get("playlistId")
+        return found
+
+    def find_playlist_id(self, playlist_name: str, video_id: str) -> str | None:
+        """Look up one of the account's playlists by title."""
+        return self.find_playlist_ids([playlist_name], video_id).get(playlist_name)
+
+    def get_playlist_items(self, playlist_id: str) -> list[PlaylistItem]:
+        """
+        Read a playlist's entries in order, following continuation pages
+        (about 100 entries per request).
+        """
+        items = []
+        data = self._post("browse", {"browseId": f"VL{playlist_id}"})
+        while True:
+            token = None
+            for node in _walk(data):
+                video = node.get("playlistVideoRenderer")
+                if video and video.get("setVideoId"):
+                    items.append(PlaylistItem(video["videoId"], video["setVideoId"]))
+                more = node.get("continuationItemRenderer")
+                if more:
+                    endpoint = more.get("continuationEndpoint", {})
+                    token = endpoint.get("continuationCommand", {}).get("token")
+            if token is None:
+                return items
+            data = self._post("browse", {"continuation": token})
+
+    def edit(self, playlist_id: str, actions: list[dict]) -> dict:
+        """Send one edit_playlist request; raises PlaylistEditError on failure."""
+        data = self._post(
+            "browse/edit_playlist", {"playlistId": playlist_id, "actions": actions}
+        )
+        if data.get("status") != "STATUS_SUCCEEDED":
+            raise PlaylistEditError(f"edit_playlist returned {data.get('status')}")
+        return data
+
+    def apply(self, playlist_id: str, actions: list[dict]) -> list[dict]:
+        """
+        Send actions in order, `batch_size` per request.
+
+        Returns:
+            The per-action results YouTube reports (playlistEditResults)
+        """
+        results = []
+        for start in range(0, len(actions), self.batch_size):
+            data = self.edit(playlist_id, actions[start : start + self.batch_size])
+            results.extend(data.get("playlistEditResults", []))
+        return results
+
+    def append_videos(
+        self, playlist_id: str, video_ids: list[str]
+    ) -> list[str | None]:
+        """
+        Add videos to the end of a playlist, in order.
+
+        Returns:
+            The new entries' setVideoIds (None where YouTube did not say)
+        """
+        results = self.apply(playlist_id, [_add_action(v) for v in video_ids])
+        set_ids = [
+            result.get("playlistEditVideoAddedResultData", {}).get("setVideoId")
+            for result in results
+        ]
+        return set_ids if len(set_ids) == len(video_ids) else [None] * len(video_ids)
+
+    def remove_items(self, playlist_id: str, items: list[PlaylistItem]):
+        self.apply(playlist_id, [_remove_action(item) for item in items])
+
+    def move_items(self, playlist_id: str, moves: list[tuple[str, str | None]]):
+        """Apply (setVideoId, predecessor setVideoId or None for the top) moves."""
+        self.apply(playlist_id, [_move_action(s, p) for s, p in moves])
+
+    def add_videos(
+        self, playlist_id: str, video_ids: list[str]
+    ) -> tuple[list[str], list[str]]:
+        """
+        Add videos in batches of `batch_size` per request. A rejected batch is
+        retried one video at a time so a single bad ID does not sink the rest.
+
+        Returns:
+            (added video IDs, failed video IDs)
+        """
+        added, failed = [], []
+        for start in range(0, len(video_ids), self.batch_size):
+            batch = video_ids[start : start + self.batch_size]
+            try:
+                self.edit(playlist_id, [_add_action(v) for v in batch])
+                added.extend(batch)
+                continue
+            except PlaylistEditError as e:
+                logger.warning(
+                    f"  ✗ Batch of {len(batch)} rejected ({e}), retrying one by one"
+                )
+
+            for video_id in batch:
+                try:
+                    self.edit(playlist_id, [_add_action(video_id)])
+                    added.append(video_id)
+                except PlaylistEditError as e:
+                    logger.error(
+                        f"  ✗ Failed to add video {video_id}: {e}", extra=PER_ITEM
+                    )
+                    failed.append(video_id)
+        return added, failed
+
+
+def _add_action(video_id: str) -> dict:
+    return {"action": "ACTION_ADD_VIDEO", "addedVideoId": video_id}
+
+
+def _remove_action(item: PlaylistItem) -> dict:
+    return {
+        "action": "ACTION_REMOVE_VIDEO",
+        "setVideoId": item.set_video_id,
+        "removedVideoId": item.video_id,
+    }
+
+
+def _move_action(set_video_id: str, predecessor: str | None) -> dict:
+    """Move an entry after `predecessor`, or to the top if it is None."""
+    action = {"action": "ACTION_MOVE_VIDEO_AFTER", "setVideoId": set_video_id}
+    if predecessor is not None:
+        action["movedSetVideoIdPredecessor"] = predecessor
+    return action
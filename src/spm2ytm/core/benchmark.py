@@ -0,0 +1,121 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from spm2ytm.clients.search_providers import SearchHit, SearchProvider
+from spm2ytm.normalize import search_key
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of `values` (0 if empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def match_score(query: str, hit: SearchHit | None) -> float:
+    """
+    Fraction of the query's words that appear in the hit's title or channel.
+
+    A cheap proxy for match quality: 1.0 means every word of
+    "<title> <artist>" was found in the result.
+    """
+    if hit is None:
+        return 0.0
+    query_tokens = set(search_key(query).split())
+    if not query_tokens:
+        return 0.0
+    hit_tokens = set(search_key(f"{hit.title} {hit.channel}").split())
+    return len(query_tokens & hit_tokens) / len(query_tokens)
+
+
+@dataclass
+class ProviderReport:
+    name: str
+    queries: int = 0
+    hits: int = 0
+    errors: int = 0
+    latencies: list[float] = field(default_factory=list)
+    match_scores: list[float] = field(default_factory=list)
+    video_ids: list[str] = field(default_factory=list)
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.queries if self.queries else 0.0
+
+    @property
+    def match_quality(self) -> float:
+        """Mean match score over the queries that returned a hit."""
+        return statistics.fmean(self.match_scores) if self.match_scores else 0.0
+
+    def latency(self, pct: float) -> float:
+        return percentile(self.latencies, pct)
+
+
+def _timed_search(provider: SearchProvider, query: str):
+    start = time.perf_counter()
+    try:
+        hit = provider.search(query)
+        error = None
+    except Exception as e:
+        hit, error = None, e
+    return time.perf_counter() - start, hit, error
+
+
+def benchmark_providers(
+    songs: list[str], providers: list[SearchProvider], max_workers: int = 4
+) -> list[ProviderReport]:
+    """
+    Run every song through each provider and collect latency, hit rate and
+    match quality. Providers are benchmarked one after another so they do
+    not compete for bandwidth.
+    """
+    reports = []
+    for provider in providers:
+        report = ProviderReport(provider.name, queries=len(songs))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(lambda q: _timed_search(provider, q), songs)
+            for song, (elapsed, hit, error) in zip(songs, results):
+                report.latencies.append(elapsed)
+                if error is not None:
+                    report.errors += 1
+                    report.video_ids.append("")
+                elif hit is not None:
+                    report.hits += 1
+                    report.match_scores.append(match_score(song, hit))
+                    report.video_ids.append(hit.video_id)
+                else:
+                    report.video_ids.append("")
+        reports.append(report)
+    return reports
+
+
+def format_reports(reports: list[ProviderReport]) -> str:
+    """Render benchmark reports as a plain-text table."""
+    lines = [
+        f"{'provider':<10} {'hit rate':>8} {'errors':>6} {'quality':>7}"
+        f" {'p50 ms':>8} {'p95 ms':>8} {'mean ms':>8}",
+    ]
+    for r in reports:
+        mean = statistics.fmean(r.latencies) if r.latencies else 0.0
+        lines.append(
+            f"{r.name:<10} {r.hit_rate:>8.1%} {r.errors:>6} {r.match_quality:>7.2f}"
+            f" {r.latency(50) * 1000:>8.0f} {r.latency(95) * 1000:>8.0f}"
+            f" {mean * 1000:>8.0f}"
+        )
+
+    # Pairwise agreement on the chosen video
+    for i, a in enumerate(reports):
+        for b in reports[i + 1 :]:
+            both = [
+                (x, y) for x, y in zip(a.video_ids, b.video_ids) if x and y
+            ]
+            if both:
+                same = sum(1 for x, y in both if x == y)
+                lines.append(
+                    f"{a.name} vs {b.name}: same video for {same}/{len(both)} songs"
+                )
+    return "\n".join(lines)
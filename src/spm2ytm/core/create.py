@@ -1,55 +1,273 @@
+import dataclasses
+import functools
 import json
 import logging
+import multiprocessing
+import pickle
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import (Executor, ProcessPoolExecutor,
+                                ThreadPoolExecutor)
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
 
-from playwright.sync_api import sync_playwright
 from tqdm import tqdm
 
-from spm2ytm.clients.yt_client import search_video_ytdlp
+from spm2ytm import tracing
+from spm2ytm.clients.search_providers import (SearchProvider,
+                                              YtDlpSearchProvider)
+from spm2ytm.clients.yt_playlist_editor import PlaylistEditor
+from spm2ytm.core.benchmark import match_score
+from spm2ytm.core.mirror import mirror_playlist
+from spm2ytm.core.pipeline import bounded_ordered_map, iter_songs
+from spm2ytm.core.preflight import preflight_ids_file
+from spm2ytm.core.resolvers import Resolver, resolve
+from spm2ytm.core.retry import CircuitBreaker, RetryPolicy
+from spm2ytm.errors.custom_errors import PlaylistEditError
+from spm2ytm.logging_setup import PER_ITEM
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler()],
-)
 logger = logging.getLogger(__name__)
 
 
-def _search_single_song(index: int, song: str) -> tuple[int, str]:
+# Search outcomes
+FOUND = "found"
+RESOLVED = "resolved"  # answered by a resolver, no search made
+NOT_FOUND = "not_found"
+ERRORED = "errored"
+
+# (index, video_id, outcome, confidence)
+SearchResult = tuple[int, str, str, float]
+
+
+def _search_single_song(
+    index: int,
+    song: str,
+    policy: RetryPolicy | None = None,
+    provider: SearchProvider | None = None,
+) -> SearchResult:
     """
     Worker function to search for a single song.
 
     Args:
         index: Original position of the song in the list
         song: Song name to search for
+        policy: Retry policy for transient errors (default: no retries)
+        provider: Search backend (default: yt-dlp)
 
     Returns:
-        Tuple of (index, video_id) - video_id is empty string if not found
+        Tuple of (index, video_id, outcome, confidence) - video_id is empty
+        string unless outcome is FOUND; outcome is NOT_FOUND or ERRORED
+        otherwise. confidence is the hit's match score against the query.
     """
+    provider = provider or YtDlpSearchProvider()
     try:
-        video_id = search_video_ytdlp(song)
-        if video_id:
-            return (index, video_id)
-        else:
-            logger.warning(f"  ✗ No video found for: {song}")
-            return (index, "")
+        with tracing.span("search", "item", song=song, provider=provider.name):
+            if policy:
+                hit = policy.call(provider.search, song)
+            else:
+                hit = provider.search(song)
     except Exception as e:
-        logger.error(f"  ✗ Error searching for '{song}': {e}")
-        return (index, "")
+        logger.error(f"  ✗ Error searching for '{song}': {e}", extra=PER_ITEM)
+        return (index, "", ERRORED, 0.0)
+
+    if hit and hit.video_id:
+        return (index, hit.video_id, FOUND, match_score(song, hit))
+
+    logger.warning(f"  ✗ No video found for: {song}", extra=PER_ITEM)
+    return (index, "", NOT_FOUND, 0.0)
+
+
+def _search_item(
+    item: tuple[int, str], policy: RetryPolicy, provider: SearchProvider
+) -> SearchResult:
+    return _search_single_song(item[0], item[1], policy, provider)
+
+
+# Per-process search state for the process-pool mode
+_process_provider: SearchProvider | None = None
+_process_policy: RetryPolicy | None = None
+
+
+def _process_init_args(
+    provider: SearchProvider, policy: RetryPolicy
+) -> tuple[SearchProvider, RetryPolicy, dict | None]:
+    """
+    Initializer arguments carrying `policy` to worker processes.
+
+    Circuit breakers cannot be shared across processes, so the breaker is
+    sent as its settings and every worker builds its own.
+    """
+    breaker = policy.breaker
+    settings = None
+    if breaker is not None:
+        settings = {
+            "window": breaker.window,
+            "threshold": breaker.threshold,
+            "min_calls": breaker.min_calls,
+            "cooldown": breaker.cooldown,
+        }
+    return provider, dataclasses.replace(policy, breaker=None), settings
+
+
+def _init_search_process(
+    provider: SearchProvider, policy: RetryPolicy, breaker_settings: dict | None
+):
+    """Process-pool initializer: keep one long-lived provider per worker process."""
+    global _process_provider, _process_policy
+    _process_provider = provider
+    breaker = CircuitBreaker(**breaker_settings) if breaker_settings else None
+    _process_policy = dataclasses.replace(policy, breaker=breaker)
+
+
+def _search_in_process(item: tuple[int, str]) -> SearchResult:
+    return _search_single_song(item[0], item[1], _process_policy, _process_provider)
 
 
-def generate_video_ids_file(song_file_path: str, max_workers: int = 4) -> str:
+def _make_search_executor(
+    executor_kind: str,
+    max_workers: int,
+    policy: RetryPolicy,
+    provider: SearchProvider,
+) -> tuple[Executor, Callable[[tuple[int, str]], SearchResult]]:
+    """
+    Create the executor for a search pass and the function to submit to it.
+
+    Threads share `policy` and `provider`; worker processes each receive a
+    pickled copy of both once (with a circuit breaker of their own), and
+    only (index, song) tuples and (index, video_id, outcome) results cross
+    the process boundary.
+    """
+    if executor_kind == "thread":
+        search = functools.partial(_search_item, policy=policy, provider=provider)
+        return ThreadPoolExecutor(max_workers=max_workers), search
+    if executor_kind == "process":
+        init_args = _process_init_args(provider, policy)
+        try:
+            pickle.dumps(provider)
+        except Exception as e:
+            raise ValueError(
+                f"Provider '{provider.name}' cannot be sent to worker processes: {e}"
+            ) from e
+        try:
+            pickle.dumps(init_args[1])
+        except Exception as e:
+            raise ValueError(
+                f"Retry policy cannot be sent to worker processes: {e}"
+            ) from e
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            # Fresh interpreters: forking a process that runs threads can deadlock
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_search_process,
+            initargs=init_args,
+        )
+        return executor, _search_in_process
+    raise ValueError(f"Unknown executor '{executor_kind}'. Use 'thread' or 'process'")
+
+
+def _search_pass(
+    executor: Executor,
+    search: Callable[[tuple[int, str]], SearchResult],
+    songs: Iterable[tuple[int, str]],
+    window: int,
+    pbar: tqdm,
+    resolvers: list[Resolver] | None = None,
+) -> Iterator[tuple[int, str, str]]:
+    """
+    Search (index, song) pairs with a bounded in-flight window.
+
+    Songs a resolver already knows are answered in this thread without a
+    search; fresh hits are fed back to every resolver.
+
+    Yields:
+        (index, video_id, outcome) in input order
+    """
+    resolvers = resolvers or []
+
+    def shortcut(item: tuple[int, str]) -> SearchResult | None:
+        with tracing.span("resolve", "item", song=item[1]):
+            answer = resolve(resolvers, item[1])
+        return (item[0], answer[0], RESOLVED, 1.0) if answer else None
+
+    results = bounded_ordered_map(
+        tracing.trace_queue(executor, "queued search"),
+        search,
+        songs,
+        window,
+        shortcut if resolvers else None,
+    )
+    for (index, song), future in results:
+        try:
+            idx, video_id, outcome, confidence = future.result()
+            if video_id:
+                logger.debug(f"  ✓ [{idx+1}] {song} → {video_id}", extra=PER_ITEM)
+        except Exception as e:
+            logger.error(f"  ✗ Unexpected error for '{song}': {e}", extra=PER_ITEM)
+            idx, video_id, outcome = index, "", ERRORED
+
+        if outcome == FOUND:
+            for resolver in resolvers:
+                resolver.update(song, video_id, confidence)
+
+        pbar.update(1)
+        yield idx, video_id, outcome
+
+
+def _patch_lines(path: Path, replacements: dict[int, str]):
+    """Rewrite the given line numbers of a file, streaming it through a temp file."""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(path, "r", encoding="utf-8") as src, open(
+        tmp_path, "w", encoding="utf-8"
+    ) as dst:
+        for i, line in enumerate(src):
+            if i in replacements:
+                newline = "\n" if line.endswith("\n") else ""
+                line = replacements[i] + newline
+            dst.write(line)
+    tmp_path.replace(path)
+
+
+def generate_video_ids_file(
+    song_file_path: str,
+    max_workers: int = 4,
+    policy: RetryPolicy | None = None,
+    retry_workers: int = 1,
+    provider: SearchProvider | None = None,
+    window: int | None = None,
+    executor_kind: str = "thread",
+    resolvers: list[Resolver] | None = None,
+) -> str:
     """
     Reads a text file with song names (one per line),
-    searches YouTube for each song using yt-dlp in parallel,
+    searches YouTube for each song in parallel (yt-dlp by default),
     and saves the video IDs to a new file with suffix '-ID.txt'.
 
+    Songs are read lazily and at most `window` searches are in flight at a
+    time; results are written in order as soon as they are contiguous, so
+    memory stays proportional to the concurrency rather than the file size.
+
+    Transient errors are retried per song according to `policy`, with a
+    shared circuit breaker pausing all workers when errors spike. Songs
+    that still errored get one final pass at `retry_workers` concurrency.
+
     Args:
         song_file_path: Path to the text file containing song names
         max_workers: Number of parallel threads for yt-dlp searches (default: 4)
+        policy: Retry policy for searches (default: RetryPolicy with a
+            CircuitBreaker). Worker processes get a copy, each with its own
+            breaker of the same settings; it must be picklable.
+        retry_workers: Number of threads for the final pass over errored songs
+            (default: 1, 0 disables the pass)
+        provider: Search backend (default: YtDlpSearchProvider). A provider
+            passed in is left open for the caller to close
+        window: Maximum searches in flight or awaiting in-order output
+            (default: 4 * max_workers)
+        executor_kind: 'thread' (default) or 'process'. Process mode runs
+            searches in worker processes, each holding its own provider, to
+            avoid GIL contention in yt-dlp's parsing. The provider must be
+            picklable.
+        resolvers: Consulted in order before searching each song (e.g. a
+            MappingBundle); the first answer is used and no search is made.
+            Fresh search results are recorded back into them.
 
     Returns:
         Path to the generated video IDs file
@@ -60,54 +278,96 @@ def generate_video_ids_file(song_file_path: str, max_workers: int = 4) -> str:
     if not song_path.exists():
         raise FileNotFoundError(f"Song file not found: {song_file_path}")
 
-    # Read all songs
-    with open(song_path, "r", encoding="utf-8") as f:
-        songs = [line.strip() for line in f if line.strip()]
+    # Count songs without holding them in memory
+    total = sum(1 for _ in iter_songs(song_path))
+
+    logger.info(f"Found {total} songs to process")
+    owned = provider is None  # built here, so closed here too
+    if provider is None:
+        provider = YtDlpSearchProvider()
+    logger.info(
+        f"Using {max_workers} parallel {executor_kind} workers "
+        f"for {provider.name} searches"
+    )
 
-    logger.info(f"Found {len(songs)} songs to process")
-    logger.info(f"Using {max_workers} parallel workers for yt-dlp searches")
+    if policy is None:
+        policy = RetryPolicy(breaker=CircuitBreaker())
+    if window is None:
+        window = 4 * max_workers
 
     # Generate output file path
     output_path = song_path.parent / f"{song_path.stem}-ID.txt"
 
-    # Dictionary to store results with preserved order
-    results = {}
+    resolvers = resolvers or []
+    counts = {FOUND: 0, RESOLVED: 0, NOT_FOUND: 0, ERRORED: 0}
+    errored: list[int] = []
 
-    # Use ThreadPoolExecutor for parallel searches
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks
-        future_to_song = {
-            executor.submit(_search_single_song, i, song): (i, song)
-            for i, song in enumerate(songs)
-        }
-
-        # Process completed tasks with progress bar
-        with tqdm(total=len(songs), desc="Searching videos", unit="song") as pbar:
-            for future in as_completed(future_to_song):
-                index, song = future_to_song[future]
-                try:
-                    idx, video_id = future.result()
-                    results[idx] = video_id
+    try:
+        executor, search = _make_search_executor(
+            executor_kind, max_workers, policy, provider
+        )
+
+        # Stream results to the output file in order
+        with tracing.span("search pass", songs=total), executor, open(
+            output_path, "w", encoding="utf-8"
+        ) as out, tqdm(total=total, desc="Searching videos", unit="song") as pbar:
+            songs = enumerate(iter_songs(song_path))
+            for idx, video_id, outcome in _search_pass(
+                executor, search, songs, window, pbar, resolvers
+            ):
+                out.write(("\n" if idx else "") + video_id)
+                counts[outcome] += 1
+                if outcome == ERRORED:
+                    errored.append(idx)
+
+        # Final pass: retry errored songs at reduced concurrency
+        if errored and retry_workers > 0:
+            logger.info(
+                f"Retrying {len(errored)} errored searches "
+                f"with {retry_workers} worker(s)"
+            )
+            wanted = set(errored)
+            retry_songs = [
+                (i, song) for i, song in enumerate(iter_songs(song_path)) if i in wanted
+            ]
+
+            recovered = {}
+            executor, search = _make_search_executor(
+                executor_kind, retry_workers, policy, provider
+            )
+            with tracing.span("retry pass", songs=len(retry_songs)), executor, tqdm(
+                total=len(retry_songs), desc="Retrying failed searches", unit="song"
+            ) as pbar:
+                for idx, video_id, outcome in _search_pass(
+                    executor, search, retry_songs, 4 * retry_workers, pbar, resolvers
+                ):
+                    if outcome != ERRORED:
+                        counts[ERRORED] -= 1
+                        counts[outcome] += 1
                     if video_id:
-                        logger.debug(f"  ✓ [{idx+1}/{len(songs)}] {song} → {video_id}")
-                except Exception as e:
-                    logger.error(f"  ✗ Unexpected error for '{song}': {e}")
-                    results[index] = ""
-
-                pbar.update(1)
-
-    # Reconstruct video_ids list in original order
-    video_ids = [results.get(i, "") for i in range(len(songs))]
-
-    # Log summary
-    found = sum(1 for vid in video_ids if vid)
-    logger.info(f"Search complete: {found}/{len(songs)} videos found")
-
-    # Save video IDs to file
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(video_ids))
-
-    logger.info(f"Saved {len(video_ids)} video IDs to: {output_path}")
+                        recovered[idx] = video_id
+
+            if recovered:
+                _patch_lines(output_path, recovered)
+
+        # Log summary
+        found = counts[FOUND] + counts[RESOLVED]
+        logger.info(
+            f"Search complete: {found}/{total} videos found, "
+            f"{counts[NOT_FOUND]} not found, {counts[ERRORED]} errored"
+        )
+        if counts[RESOLVED]:
+            logger.info(f"  {counts[RESOLVED]} answered by resolvers without a search")
+        provider_summary = provider.summary()
+        if provider_summary:
+            logger.info(provider_summary)
+    finally:
+        if owned:
+            provider.close()
+    for resolver in resolvers:
+        resolver.flush()
+
+    logger.info(f"Saved {total} video IDs to: {output_path}")
 
     return str(output_path)
 
@@ -151,35 +411,328 @@ def load_cookies(context, cookies_path: Path):
     logger.info("Cookies loaded successfully")
 
 
+def _pause(seconds: float):
+    """Fixed wait for the page to settle; shows up as a span when tracing."""
+    with tracing.span("sleep", "sleep", seconds=seconds):
+        time.sleep(seconds)
+
+
+SELECTED_SUFFIX = ", Selected"
+NOT_SELECTED_SUFFIX = ", Not selected"
+
+
+def _playlist_names(playlist_name: str | Iterable[str]) -> list[str]:
+    """Accept one playlist name or several; drop duplicates, keep order."""
+    names = [playlist_name] if isinstance(playlist_name, str) else playlist_name
+    return list(dict.fromkeys(names))
+
+
+def _is_ticked(aria_label: str | None) -> bool | None:
+    """
+    Read a Save dialog row's checkbox state from its aria-label, which looks
+    like '<title>, <privacy>, Selected' or '..., Not selected'. Returns None
+    when the label carries no state.
+    """
+    label = (aria_label or "").strip()
+    if label.endswith(NOT_SELECTED_SUFFIX):
+        return False
+    if label.endswith(SELECTED_SUFFIX):
+        return True
+    return None
+
+
+def _row_state(item) -> bool | None:
+    """A Save dialog row's state from its aria-label, else aria-checked/pressed."""
+    state = _is_ticked(item.get_attribute("aria-label"))
+    if state is not None:
+        return state
+    for attribute in ("aria-checked", "aria-pressed"):
+        value = item.get_attribute(attribute)
+        if value in ("true", "false"):
+            return value == "true"
+    return None
+
+
+def _tick_playlists(page, playlist_names: list[str]) -> list[str]:
+    """
+    Tick every target playlist in the open Save dialog, leaving playlists
+    that already contain the video untouched (clicking them would remove it).
+    A row whose state cannot be read is not clicked for the same reason.
+
+    Returns:
+        Names of the playlists that were newly ticked
+
+    Raises:
+        PlaylistEditError: If any row's state could not be read, or a row
+            did not read as selected after clicking it; the other targets
+            are still ticked first
+    """
+    ticked = []
+    failed = []
+    for name in playlist_names:
+        quoted = name.replace("\\", "\\\\").replace("'", "\\'")
+        item = page.locator(f"yt-list-item-view-model[aria-label^='{quoted},']").first
+        item.wait_for(state="visible", timeout=5000)
+        state = _row_state(item)
+        if state is None:
+            logger.warning(
+                f"  ✗ Could not tell whether {name} holds the video, "
+                "leaving it unchanged",
+                extra=PER_ITEM,
+            )
+            failed.append(name)
+            continue
+        if state:
+            logger.debug(f"  → Already in playlist: {name}", extra=PER_ITEM)
+            continue
+        item.click()
+        _pause(0.5)
+        if _row_state(item) is not True:
+            logger.warning(f"  ✗ {name} did not read as selected", extra=PER_ITEM)
+            failed.append(name)
+            continue
+        ticked.append(name)
+        logger.info(f"  ✓ Added to playlist: {name}", extra=PER_ITEM)
+    if failed:
+        raise PlaylistEditError(f"Could not tick {', '.join(failed)}")
+    return ticked
+
+
+def _add_videos_by_clicking(
+    page, video_ids: list[str], playlist_names: list[str]
+) -> tuple[int, int]:
+    """
+    Add videos through the watch page UI: 3-dot menu → Save → playlists.
+
+    All target playlists are ticked during the same dialog visit, so each
+    video costs one page load however many targets there are.
+
+    Returns:
+        (successful, failed) video counts; a video fails if any target
+        could not be ticked
+    """
+    successful = 0
+    failed = 0
+
+    # Use tqdm for progress bar during playlist addition
+    with tqdm(total=len(video_ids), desc="Adding to playlist", unit="video") as pbar:
+        for i, video_id in enumerate(video_ids, 1):
+            logger.info(
+                f"[{i}/{len(video_ids)}] Processing video ID: {video_id}",
+                extra=PER_ITEM,
+            )
+
+            try:
+                with tracing.span("add video", "item", video_id=video_id):
+                    _click_through_save_dialog(page, video_id, playlist_names)
+                successful += 1
+
+            except Exception as e:
+                logger.error(
+                    f"  ✗ Failed to add video {video_id}: {e}", extra=PER_ITEM
+                )
+                page.screenshot(path=f"debug_error_{video_id}.png")
+                failed += 1
+                # Continue with next video
+
+            pbar.update(1)
+
+    return successful, failed
+
+
+def _click_through_save_dialog(page, video_id: str, playlist_names: list[str]):
+    """Watch page → 3-dot menu → Save → tick every target → close."""
+    # Navigate to video
+    with tracing.span("goto", "browser", video_id=video_id):
+        page.goto(f"https://www.youtube.com/watch?v={video_id}")
+        page.wait_for_load_state("networkidle")
+    _pause(2)
+
+    # Click 3-dot menu
+    three_dot_menu = page.locator(
+        "button.yt-spec-button-shape-next[aria-label='More actions']"
+    ).first
+    three_dot_menu.wait_for(state="visible", timeout=10000)
+    three_dot_menu.click()
+    logger.debug(f"  → Clicked 3-dot menu", extra=PER_ITEM)
+    _pause(1)
+
+    # Click "Save" option
+    save_option = page.locator(
+        "ytd-menu-service-item-renderer:has-text('Save')"
+    ).first
+    save_option.wait_for(state="visible", timeout=5000)
+    save_option.click()
+    logger.debug(f"  → Clicked Save option", extra=PER_ITEM)
+    _pause(2)
+
+    # Tick every target playlist
+    _tick_playlists(page, playlist_names)
+    _pause(1)
+
+    # Close dialog
+    page.keyboard.press("Escape")
+    _pause(1)
+
+
+def _add_videos_directly(
+    page, context, video_ids: list[str], playlist_names: list[str]
+) -> tuple[int, list[str]]:
+    """
+    Add videos with batched playlist-edit requests sent from the logged-in
+    browser context, without rendering any watch pages.
+
+    Each playlist is read first and videos it already holds are skipped, so
+    re-running a conversion does not add them twice (a video listed twice
+    in the file is also added once, as in click mode).
+
+    Returns:
+        (number of videos added to every target, video IDs that still need
+        the click-through fallback for at least one target)
+    """
+    try:
+        editor = PlaylistEditor.from_page(page, context)
+        playlist_ids = editor.find_playlist_ids(playlist_names, video_ids[0])
+    except Exception as e:
+        # Includes Playwright errors from reading the page's config
+        logger.warning(f"Direct mode unavailable ({e}), falling back to clicks")
+        return 0, video_ids
+
+    missing = [name for name in playlist_names if name not in playlist_ids]
+    if missing:
+        logger.warning(
+            f"Playlist(s) {', '.join(missing)} not found via API, "
+            "falling back to clicks"
+        )
+        return 0, video_ids
+
+    # The click fallback skips playlists that already hold a video, so a
+    # video that failed for any target can be retried against all of them
+    failed_any: set[str] = set()
+    for name in playlist_names:
+        try:
+            present = {
+                item.video_id
+                for item in editor.get_playlist_items(playlist_ids[name])
+            }
+            new_ids = [v for v in dict.fromkeys(video_ids) if v not in present]
+            added, failed = editor.add_videos(playlist_ids[name], new_ids)
+        except Exception as e:
+            logger.warning(f"  ✗ Direct adds to {name} failed ({e}), using clicks")
+            failed_any.update(video_ids)
+            continue
+        failed_any.update(failed)
+        logger.info(
+            f"  ✓ Added {len(added)} videos directly to: {name} "
+            f"({len(video_ids) - len(new_ids)} already there)"
+        )
+
+    remaining = [v for v in video_ids if v in failed_any]
+    return len(video_ids) - len(remaining), remaining
+
+
+def _mirror_videos(page, context, video_ids: list[str], playlist_names: list[str]):
+    """
+    Make each target playlist list exactly `video_ids`, in order, editing
+    only the entries that differ (see mirror_playlist). Empty IDs keep
+    their positions' current entries.
+    """
+    probe_id = next((video_id for video_id in video_ids if video_id), None)
+    if probe_id is None:
+        raise PlaylistEditError("No video IDs to mirror")
+    editor = PlaylistEditor.from_page(page, context)
+    playlist_ids = editor.find_playlist_ids(playlist_names, probe_id)
+    missing = [name for name in playlist_names if name not in playlist_ids]
+    if missing:
+        raise PlaylistEditError(f"Playlist(s) {', '.join(missing)} not found")
+
+    for name in playlist_names:
+        plan = mirror_playlist(editor, playlist_ids[name], video_ids)
+        logger.info(f"  ✓ Mirrored {name} with {plan.edits} edit(s)")
+
+
 def add_videos_to_playlist(
-    video_ids_file: str, playlist_name: str, cookies_path: str = "cookies.json"
+    video_ids_file: str,
+    playlist_name: str | Iterable[str],
+    cookies_path: str = "cookies.json",
+    mode: str = "direct",
+    preflight: bool = True,
+    force: bool = False,
 ):
     """
-    Uses Playwright to add videos to a YouTube playlist.
+    Uses Playwright to add videos to one or more YouTube playlists.
 
     Args:
         video_ids_file: Path to text file containing video IDs (one per line)
-        playlist_name: Name of the pre-existing YouTube playlist
+        playlist_name: Name of the pre-existing YouTube playlist, or several
+            names to add every video to all of them in one pass
         cookies_path: Path to cookies.json file for authentication
+        mode: 'direct' sends batched playlist-edit requests with the browser's
+            session and clicks through only the videos it could not add;
+            'click' uses the watch page UI for every video; 'mirror' makes
+            the playlist match the file exactly, removing, adding and
+            reordering only the entries that differ
+        preflight: Probe every ID concurrently first and send only live
+            videos to the browser; skipped IDs are listed in
+            '<name>-preflight.txt'
+        force: Mirror even when some lines have no usable video ID. Those
+            positions keep whatever entry is there, and no entry is removed.
+            Without it, mirror mode refuses such a file.
     """
-    logger.info(f"Starting playlist creation for: {playlist_name}")
+    if mode not in ("direct", "click", "mirror"):
+        raise ValueError(
+            f"Unknown add mode '{mode}'. Use 'direct', 'click' or 'mirror'"
+        )
+
+    playlist_names = _playlist_names(playlist_name)
+    if not playlist_names:
+        raise ValueError("At least one playlist name is required")
+
+    logger.info(f"Starting playlist creation for: {', '.join(playlist_names)}")
 
     # Read video IDs
     video_ids_path = Path(video_ids_file)
     if not video_ids_path.exists():
         raise FileNotFoundError(f"Video IDs file not found: {video_ids_file}")
 
-    with open(video_ids_path, "r", encoding="utf-8") as f:
-        video_ids = [line.strip() for line in f if line.strip()]
-
-    logger.info(f"Found {len(video_ids)} video IDs to add to playlist")
+    # Mirror mode needs every line: an empty one still holds a position
+    keep_positions = mode == "mirror"
+    if preflight:
+        with tracing.span("preflight"):
+            video_ids = preflight_ids_file(
+                video_ids_file, keep_positions=keep_positions
+            )
+    else:
+        with open(video_ids_path, "r", encoding="utf-8") as f:
+            video_ids = [line.strip() for line in f.read().splitlines()]
+        if not keep_positions:
+            video_ids = [video_id for video_id in video_ids if video_id]
+
+    if keep_positions:
+        unresolved = video_ids.count("")
+        if unresolved and not force:
+            raise PlaylistEditError(
+                f"{unresolved} song(s) have no usable video ID; mirroring now "
+                "would drop what the playlist has for them. Re-run the search, "
+                "or pass --force to keep those entries and remove nothing"
+            )
+        logger.info(
+            f"Found {len(video_ids) - unresolved} video IDs to mirror "
+            f"({unresolved} unresolved)"
+        )
+    else:
+        logger.info(f"Found {len(video_ids)} video IDs to add to playlist")
 
     cookies_file = Path(cookies_path)
 
+    # Imported here so the search stage never loads Playwright
+    from playwright.sync_api import sync_playwright
+
     with sync_playwright() as p:
         # Launch browser
-        browser = p.chromium.launch(headless=False)
-        context = browser.new_context()
+        with tracing.span("browser launch", "browser"):
+            browser = p.chromium.launch(headless=False)
+            context = browser.new_context()
 
         # Load cookies
         load_cookies(context, cookies_file)
@@ -187,9 +740,10 @@ def add_videos_to_playlist(
         page = context.new_page()
 
         # Go to YouTube and verify login
-        page.goto("https://www.youtube.com")
-        page.wait_for_load_state("networkidle")
-        time.sleep(2)
+        with tracing.span("goto", "browser", url="https://www.youtube.com"):
+            page.goto("https://www.youtube.com")
+            page.wait_for_load_state("networkidle")
+        _pause(2)
 
         if page.locator("button:has-text('Sign in')").is_visible():
             logger.error("Not logged in! Cookies may be invalid.")
@@ -200,93 +754,84 @@ def add_videos_to_playlist(
 
         logger.info("Successfully logged into YouTube")
 
-        # Iterate through video IDs and add to playlist
+        if mode == "mirror":
+            try:
+                with tracing.span("mirror"):
+                    _mirror_videos(page, context, video_ids, playlist_names)
+            finally:
+                context.close()
+                browser.close()
+            return
+
         successful = 0
-        failed = 0
+        remaining = video_ids
+        if mode == "direct" and video_ids:
+            with tracing.span("direct adds", videos=len(video_ids)):
+                successful, remaining = _add_videos_directly(
+                    page, context, video_ids, playlist_names
+                )
 
-        # Use tqdm for progress bar during playlist addition
-        with tqdm(
-            total=len(video_ids), desc="Adding to playlist", unit="video"
-        ) as pbar:
-            for i, video_id in enumerate(video_ids, 1):
-                logger.info(f"[{i}/{len(video_ids)}] Processing video ID: {video_id}")
-
-                try:
-                    # Navigate to video
-                    page.goto(f"https://www.youtube.com/watch?v={video_id}")
-                    page.wait_for_load_state("networkidle")
-                    time.sleep(2)
-
-                    # Click 3-dot menu
-                    three_dot_menu = page.locator(
-                        "button.yt-spec-button-shape-next[aria-label='More actions']"
-                    ).first
-                    three_dot_menu.wait_for(state="visible", timeout=10000)
-                    three_dot_menu.click()
-                    logger.debug(f"  → Clicked 3-dot menu")
-                    time.sleep(1)
-
-                    # Click "Save" option
-                    save_option = page.locator(
-                        "ytd-menu-service-item-renderer:has-text('Save')"
-                    ).first
-                    save_option.wait_for(state="visible", timeout=5000)
-                    save_option.click()
-                    logger.debug(f"  → Clicked Save option")
-                    time.sleep(2)
-
-                    # Click on playlist
-                    playlist_item = page.locator(
-                        f"yt-list-item-view-model[aria-label^='{playlist_name},']"
-                    ).first
-                    playlist_item.wait_for(state="visible", timeout=5000)
-                    playlist_item.click()
-                    logger.info(f"  ✓ Added to playlist: {playlist_name}")
-                    time.sleep(1)
-
-                    # Close dialog
-                    page.keyboard.press("Escape")
-                    time.sleep(1)
-
-                    successful += 1
-
-                except Exception as e:
-                    logger.error(f"  ✗ Failed to add video {video_id}: {e}")
-                    page.screenshot(path=f"debug_error_{video_id}.png")
-                    failed += 1
-                    # Continue with next video
-
-                pbar.update(1)
+        failed = 0
+        if remaining:
+            with tracing.span("click adds", videos=len(remaining)):
+                clicked, failed = _add_videos_by_clicking(
+                    page, remaining, playlist_names
+                )
+            successful += clicked
 
         logger.info(f"Finished! Successfully added: {successful}, Failed: {failed}")
 
-        time.sleep(2)
+        _pause(2)
         context.close()
         browser.close()
 
 
 def create_youtube_playlist_from_spotify(
-    song_file_path: str, playlist_name: str, cookies_path: str = "cookies.json"
+    song_file_path: str,
+    playlist_name: str | Iterable[str],
+    cookies_path: str = "cookies.json",
+    provider: SearchProvider | None = None,
+    executor_kind: str = "thread",
+    add_mode: str = "direct",
+    resolvers: list[Resolver] | None = None,
+    preflight: bool = True,
+    force: bool = False,
 ):
     """
     Complete workflow: Convert Spotify playlist text file to YouTube playlist.
 
     Args:
         song_file_path: Path to text file with song names (from Spotify)
-        playlist_name: Name of pre-existing YouTube playlist
+        playlist_name: Name of pre-existing YouTube playlist (or several names)
         cookies_path: Path to cookies.json for YouTube authentication
+        provider: Search backend for step 1 (default: yt-dlp)
+        executor_kind: 'thread' or 'process' workers for step 1
+        add_mode: 'direct', 'click' or 'mirror' for step 2
+        resolvers: Consulted before searching in step 1 (see
+            generate_video_ids_file)
+        preflight: Validate video IDs before step 2
+        force: Mirror despite unresolved songs (see add_videos_to_playlist)
     """
     logger.info("=" * 60)
     logger.info("Starting Spotify → YouTube playlist conversion")
     logger.info("=" * 60)
 
-    # Step 1: Generate video IDs file (with parallel yt-dlp searches)
+    # Step 1: Generate video IDs file (with parallel searches)
     logger.info("STEP 1: Generating video IDs from song names...")
-    video_ids_file = generate_video_ids_file(song_file_path)
+    with tracing.span("search stage"):
+        video_ids_file = generate_video_ids_file(
+            song_file_path,
+            provider=provider,
+            executor_kind=executor_kind,
+            resolvers=resolvers,
+        )
 
     # Step 2: Add videos to YouTube playlist
     logger.info("STEP 2: Adding videos to YouTube playlist...")
-    add_videos_to_playlist(video_ids_file, playlist_name, cookies_path)
+    with tracing.span("add stage", mode=add_mode):
+        add_videos_to_playlist(
+            video_ids_file, playlist_name, cookies_path, add_mode, preflight, force
+        )
 
     logger.info("=" * 60)
     logger.info("Playlist conversion complete!")
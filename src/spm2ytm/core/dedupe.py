@@ -0,0 +1,328 @@
+import logging
+import re
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from spm2ytm.normalize import normalize_batch, search_key
+
+logger = logging.getLogger(__name__)
+
+# Words that label a release rather than identify a song. They are dropped
+# inside brackets or a trailing " - ..." suffix, and in flattened lines only
+# as part of a run with a FLAT_LABELS word that does not start the line,
+# since titles such as "Radio Ga Ga" or "Clean" use them too.
+RELEASE_LABELS = frozenset(
+    {
+        "remaster",
+        "remastered",
+        "version",
+        "edit",
+        "radio",
+        "mono",
+        "stereo",
+        "deluxe",
+        "edition",
+        "explicit",
+        "clean",
+        "bonus",
+        "track",
+        "with",
+        "official",
+        "audio",
+        "video",
+        "lyrics",
+    }
+)
+# Release labels that mark a label run in lines without brackets or " - "
+# ("Yesterday Remastered 2009 The Beatles", "Halo Radio Edit Beyonce")
+FLAT_LABELS = frozenset(
+    {"remaster", "remastered", "version", "edit", "deluxe", "edition", "bonus"}
+)
+# Words dropped wherever they appear
+STOP_WORDS = frozenset({"feat", "ft", "featuring", "the", "a", "and"})
+NOISE_WORDS = RELEASE_LABELS | STOP_WORDS
+YEAR_RE = re.compile(r"^(19|20)\d\d$")
+# Arabic numbers, and roman numerals up to 39 ("Part II", "Vol. IV")
+NUMBER_RE = re.compile(r"^(\d+|(?=[ivx])x{0,3}(ix|iv|v?i{0,3}))$")
+# Words after which a lone "i", "v" or "x" is a numeral rather than a word
+# or a name ("Part I" but "I Will Survive", "feat X")
+NUMBERING_WORDS = frozenset(
+    {"part", "pt", "no", "nr", "vol", "volume", "op", "act", "chapter", "book"}
+)
+# Bracketed text, and a " - ..." suffix up to the artist column (two spaces)
+LABEL_RE = re.compile(r"\([^()]*\)|\[[^\[\]]*\]|\s-\s.*?(?=\s{2,}|$)")
+
+# MinHash parameters: a prime above 2**32 and fixed permutation coefficients
+_PRIME = 4294967311
+_MAX_HASH = (1 << 32) - 1
+
+
+def _split_labels(line: str) -> tuple[str, str]:
+    """(line without its label positions, text found in label positions)."""
+    labels = LABEL_RE.findall(line)
+    if not labels:
+        return line, ""
+    return LABEL_RE.sub(" ", line), " ".join(labels)
+
+
+def _flat_labels(words: list[str]) -> set[int]:
+    """Positions of release-label runs, with a year next to them, in key words."""
+    found: set[int] = set()
+    i = 1  # the title comes first, so a line never starts with a label
+    while i < len(words):
+        j = i
+        while j < len(words) and words[j] in RELEASE_LABELS:
+            j += 1
+        if any(w in FLAT_LABELS for w in words[i:j]):
+            start = i - 1 if i > 1 and YEAR_RE.match(words[i - 1]) else i
+            end = j + 1 if j < len(words) and YEAR_RE.match(words[j]) else j
+            found.update(range(start, end))
+        i = j + 1
+    return found
+
+
+def _key_words(key: str, label_key: str = "") -> list[str]:
+    words = key.split()
+    labels = label_key.split()
+    flat = _flat_labels(words)
+    kept = [w for n, w in enumerate(words) if w not in STOP_WORDS and n not in flat]
+    kept += [w for w in labels if w not in NOISE_WORDS and not YEAR_RE.match(w)]
+    # Never normalize a line away entirely
+    return kept or words + labels
+
+
+def normalize_words(line: str) -> list[str]:
+    """Search-key words of a song line without release labels or years."""
+    main, labels = _split_labels(line)
+    return _key_words(search_key(main), search_key(labels) if labels else "")
+
+
+def normalize_tokens(line: str) -> frozenset[str]:
+    """Search-key word set of a song line without release labels or years."""
+    return frozenset(normalize_words(line))
+
+
+def normalize_key(line: str) -> str:
+    """Order-insensitive key; lines with equal keys are exact duplicates."""
+    return " ".join(sorted(normalize_tokens(line)))
+
+
+def number_tokens(words: list[str]) -> frozenset[str]:
+    """
+    The numbers and roman numerals among key words in line order ("No 9",
+    "Part II"). A one-letter numeral only counts after a NUMBERING_WORDS word.
+    """
+    return frozenset(
+        w
+        for n, w in enumerate(words)
+        if NUMBER_RE.match(w)
+        and (len(w) > 1 or w.isdigit() or (n and words[n - 1] in NUMBERING_WORDS))
+    )
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a: int, b: int):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            # Keep the earliest line as the root
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+class MinHasher:
+    """MinHash signatures over token sets, with cached per-token permutations."""
+
+    def __init__(self, num_perm: int = 16, seed: int = 1):
+        coefficients = []
+        x = seed
+        for _ in range(num_perm):
+            # Deterministic LCG so signatures are stable across runs
+            x = (x * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            a = (x >> 32) % (_PRIME - 1) + 1
+            x = (x * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            b = (x >> 32) % _PRIME
+            coefficients.append((a, b))
+        self.coefficients = coefficients
+        # token -> its value under every permutation
+        self._token_values: dict[str, tuple[int, ...]] = {}
+
+    def _values(self, token: str) -> tuple[int, ...]:
+        values = self._token_values.get(token)
+        if values is None:
+            h = zlib.crc32(token.encode("utf-8"))
+            values = tuple(
+                ((a * h + b) % _PRIME) & _MAX_HASH for a, b in self.coefficients
+            )
+            self._token_values[token] = values
+        return values
+
+    def signature(self, tokens: frozenset[str]) -> tuple[int, ...]:
+        # Element-wise minimum over the tokens' cached permutation values
+        return tuple(map(min, zip(*(self._values(t) for t in tokens))))
+
+
+@dataclass
+class DedupeResult:
+    unique: list[str]  # first line of every cluster, in original order
+    clusters: list[list[str]] = field(default_factory=list)  # clusters of 2+ lines
+    exact_removed: int = 0
+    near_removed: int = 0
+
+
+def find_duplicates(
+    lines: list[str],
+    near: bool = True,
+    threshold: float = 0.7,
+    num_perm: int = 16,
+    bands: int = 8,
+    max_bucket: int = 200,
+) -> DedupeResult:
+    """
+    Group exact and near-duplicate song lines.
+
+    Exact duplicates share a normalized key (same words ignoring case,
+    punctuation, order, and release labels or years in brackets, a " - "
+    suffix or, in flattened lines, a run of label words such as "Remastered
+    2009"). Near duplicates are found with MinHash/LSH over the distinct
+    keys and confirmed when their token Jaccard similarity reaches
+    `threshold` and they have the same numbers, so "Part I" and "Part II"
+    stay apart. Runtime is near-linear in the number of lines.
+
+    Args:
+        lines: Song lines (blank lines are ignored)
+        near: Also look for near duplicates
+        threshold: Minimum Jaccard similarity for near duplicates
+        num_perm: MinHash signature length
+        bands: LSH bands (num_perm must be divisible by bands)
+        max_bucket: LSH buckets larger than this are only compared against
+            their first members, to keep very common word pairs linear
+
+    Returns:
+        DedupeResult with the deduplicated lines and the duplicate clusters
+    """
+    lines = [line.strip() for line in lines if line.strip()]
+    if num_perm % bands:
+        raise ValueError("num_perm must be divisible by bands")
+
+    # Step 1: exact duplicates by normalized key
+    key_to_lines: dict[str, list[int]] = {}
+    key_tokens: dict[str, frozenset[str]] = {}
+    key_numbers: dict[str, frozenset[str]] = {}
+    mains, labels = zip(*map(_split_labels, lines)) if lines else ((), ())
+    batch_keys = zip(normalize_batch(mains).keys, normalize_batch(labels).keys)
+    for i, (line_key, label_key) in enumerate(batch_keys):
+        words = _key_words(line_key, label_key)
+        tokens = frozenset(words)
+        key = " ".join(sorted(tokens))
+        key_to_lines.setdefault(key, []).append(i)
+        if key not in key_tokens:
+            key_tokens[key] = tokens
+            key_numbers[key] = number_tokens(words)
+
+    keys = list(key_to_lines)
+    numbers = [key_numbers[key] for key in keys]
+    uf = _UnionFind(len(keys))
+
+    # Step 2: near duplicates between distinct keys via MinHash LSH
+    if near and len(keys) > 1:
+        hasher = MinHasher(num_perm)
+        rows = num_perm // bands
+        buckets: dict[tuple, list[int]] = defaultdict(list)
+        for k, key in enumerate(keys):
+            sig = hasher.signature(key_tokens[key])
+            for band in range(bands):
+                buckets[(band, sig[band * rows : (band + 1) * rows])].append(k)
+
+        checked = set()
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            oversized = len(members) > max_bucket
+            reps = members[:8] if oversized else members
+            for i, a in enumerate(reps):
+                for b in members if oversized else members[i + 1 :]:
+                    if a == b or (a, b) in checked:
+                        continue
+                    checked.add((a, b))
+                    if numbers[a] != numbers[b]:
+                        continue
+                    similarity = jaccard(key_tokens[keys[a]], key_tokens[keys[b]])
+                    if similarity >= threshold:
+                        uf.union(a, b)
+
+    # Step 3: build clusters in original line order
+    groups: dict[int, list[int]] = defaultdict(list)
+    for k, key in enumerate(keys):
+        groups[uf.find(k)].extend(key_to_lines[key])
+
+    clusters = sorted((sorted(idx) for idx in groups.values()), key=lambda g: g[0])
+    unique = [lines[g[0]] for g in clusters]
+
+    result = DedupeResult(unique=unique)
+    for group in clusters:
+        if len(group) < 2:
+            continue
+        result.clusters.append([lines[i] for i in group])
+    result.exact_removed = len(lines) - len(keys)
+    result.near_removed = len(keys) - len(clusters)
+    return result
+
+
+def dedupe_file(
+    song_file_path: str,
+    output_path: str | None = None,
+    clusters_path: str | None = None,
+    near: bool = True,
+    threshold: float = 0.7,
+) -> tuple[str, DedupeResult]:
+    """
+    Deduplicate a song file into '<name>-unique.txt' and write the duplicate
+    clusters for review to '<name>-duplicates.txt'.
+
+    Returns:
+        (path to the deduplicated file, DedupeResult)
+    """
+    song_path = Path(song_file_path)
+    if not song_path.exists():
+        raise FileNotFoundError(f"Song file not found: {song_file_path}")
+
+    with open(song_path, "r", encoding="utf-8") as f:
+        lines = [line.strip() for line in f if line.strip()]
+
+    result = find_duplicates(lines, near=near, threshold=threshold)
+
+    output = Path(output_path or song_path.parent / f"{song_path.stem}-unique.txt")
+    with open(output, "w", encoding="utf-8") as f:
+        f.write("\n".join(result.unique))
+
+    clusters_file = Path(
+        clusters_path or song_path.parent / f"{song_path.stem}-duplicates.txt"
+    )
+    with open(clusters_file, "w", encoding="utf-8") as f:
+        for n, cluster in enumerate(result.clusters, 1):
+            f.write(f"# cluster {n} (kept first)\n")
+            for line in cluster:
+                f.write(f"{line}\n")
+            f.write("\n")
+
+    logger.info(
+        f"Deduplicated {len(lines)} → {len(result.unique)} songs "
+        f"({result.exact_removed} exact, {result.near_removed} near duplicates)"
+    )
+    return str(output), result
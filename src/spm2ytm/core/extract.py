@@ -1,22 +1,26 @@
 import logging
+import os
+import re
+import time
+from typing import TYPE_CHECKING
 
-from spm2ytm.clients.spotify_client import SpotifyClient
-from spm2ytm.utils import clean_string, save_list_to_file
+from spm2ytm import tracing
+from spm2ytm.normalize import normalize_batch
+from spm2ytm.utils import save_list_to_file
+
+if TYPE_CHECKING:
+    from spm2ytm.clients.spotify_client import PlaylistTracks, SpotifyClient
 
-logging.basicConfig(
-    level=logging.INFO,  # Set log level
-    format="%(asctime)s - %(levelname)s - %(message)s",  # Log format
-    handlers=[logging.StreamHandler()],  # Print logs to terminal
-)
 logger = logging.getLogger(__name__)
 
 
-def extract_liked_songs_to_text(client: SpotifyClient, output_path: str):
+def extract_liked_songs_to_text(client: "SpotifyClient", output_path: str):
     logger.info("Extracting liked songs...")
 
-    tracks = client.get_liked_songs()
+    with tracing.span("spotify extract", source="liked songs"):
+        tracks = client.get_liked_songs()
 
-    cleaned = [clean_string(f"{t['title']} {t['artist']}") for t in tracks]
+    cleaned = normalize_batch(f"{t['title']} {t['artist']}" for t in tracks).display
 
     save_list_to_file(cleaned, output_path)
     logger.info(f"Saved liked songs to: {output_path}")
@@ -25,15 +29,101 @@ def extract_liked_songs_to_text(client: SpotifyClient, output_path: str):
 
 
 def extract_playlist_to_text(
-    client: SpotifyClient, playlist_url: str, output_path: str
+    client: "SpotifyClient", playlist_url: str, output_path: str
 ):
     logger.info(f"Extracting playlist → text for {playlist_url}")
 
-    tracks = client.get_playlist_tracks(playlist_url)
+    with tracing.span("spotify extract", source=playlist_url):
+        tracks = client.get_playlist_tracks(playlist_url)
 
-    cleaned = [clean_string(f"{t['title']} {t['artist']}") for t in tracks]
+    cleaned = normalize_batch(f"{t['title']} {t['artist']}" for t in tracks).display
 
     save_list_to_file(cleaned, output_path)
     logger.info(f"Saved playlist songs to: {output_path}")
 
     return cleaned
+
+
+def build_playlist_file_path(
+    client: "SpotifyClient", playlist_url: str, output_dir: str
+) -> str:
+    """
+    Build the text file path for a playlist: '<id>-<Sanitized_Name>.txt'.
+
+    Args:
+        client: Spotify client used to look up the playlist name
+        playlist_url: Spotify playlist URL
+        output_dir: Directory the file will be written to
+
+    Returns:
+        Path to the playlist text file
+    """
+    playlist_id = playlist_url.split("/")[-1].split("?")[0]
+    playlist_info = client.sp.playlist(playlist_id)
+    playlist_name = playlist_info.get("name", "")
+
+    return os.path.join(output_dir, playlist_file_name(playlist_id, playlist_name))
+
+
+def playlist_file_name(playlist_id: str, playlist_name: str) -> str:
+    """'<id>-<Sanitized_Name>.txt', or '<id>.txt' if nothing of the name is left."""
+    # Sanitize playlist name: only alphanumerics and spaces
+    sanitized_name = re.sub(r"[^A-Za-z0-9 ]+", "", playlist_name).strip()
+    sanitized_name = sanitized_name.replace(" ", "_")
+
+    if sanitized_name:
+        return f"{playlist_id}-{sanitized_name}.txt"
+    return f"{playlist_id}.txt"
+
+
+def extract_library_to_text(
+    client: "SpotifyClient", output_dir: str
+) -> list[tuple[str | None, "PlaylistTracks"]]:
+    """
+    Export every playlist in the user's library in one pass.
+
+    All playlists are paged through the client's shared scheduler at once
+    (see SpotifyClient.get_playlists_tracks) and each is written to
+    '<output_dir>/<id>-<Sanitized_Name>.txt', as the playlist command does.
+
+    Returns:
+        (file path, PlaylistTracks) per playlist; the path is None for
+        playlists that could not be fetched
+    """
+    start = time.perf_counter()
+    with tracing.span("spotify extract", source="library"):
+        playlists = client.get_user_playlists()
+        fetched = client.get_playlists_tracks(playlists)
+
+    exported = []
+    for playlist in fetched:
+        if playlist.error:
+            logger.error(f"  ✗ {playlist.name}: {playlist.error}")
+            exported.append((None, playlist))
+            continue
+        path = os.path.join(
+            output_dir, playlist_file_name(playlist.playlist_id, playlist.name)
+        )
+        lines = normalize_batch(
+            f"{t['title']} {t['artist']}" for t in playlist.tracks
+        ).display
+        save_list_to_file(lines, path)
+        exported.append((path, playlist))
+
+    # Timing summary, slowest playlists first
+    for path, playlist in sorted(exported, key=lambda e: e[1].seconds, reverse=True):
+        if path:
+            logger.info(
+                f"  ✓ {playlist.seconds:6.2f}s {playlist.pages:>4} page(s) "
+                f"{len(playlist.tracks):>6} tracks  {playlist.name} → {path}"
+            )
+    elapsed = time.perf_counter() - start
+    scheduler = client.scheduler
+    failed = sum(1 for path, _ in exported if path is None)
+    logger.info(
+        f"Library export: {len(exported) - failed}/{len(exported)} playlists, "
+        f"{sum(len(p.tracks) for _, p in exported)} tracks, "
+        f"{scheduler.requests} requests in {elapsed:.1f}s "
+        f"({scheduler.waited:.1f}s of request time spent waiting on the rate limit)"
+    )
+    return exported
@@ -0,0 +1,204 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import (FIRST_COMPLETED, Future, ThreadPoolExecutor,
+                                wait)
+
+from spm2ytm.clients.search_providers import (SearchHit, SearchProvider,
+                                              get_search_provider)
+from spm2ytm.core.benchmark import percentile
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Rolling window of recent latencies with percentile lookups."""
+
+    def __init__(self, window: int = 200):
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> float:
+        with self._lock:
+            samples = list(self._samples)
+        return percentile(samples, pct)
+
+
+class HedgedSearchProvider(SearchProvider):
+    """
+    Wraps a provider and hedges slow searches.
+
+    When a search has not answered after the learned `hedge_percentile`
+    latency, a duplicate request is fired (through `secondary` if given)
+    and whichever answers first wins; the other is ignored. Hedges are
+    capped at `budget` of all requests so a slow backend is not flooded.
+
+    Args:
+        primary: Provider used for every search
+        secondary: Optional provider used for hedge requests
+        hedge_percentile: Latency percentile after which to hedge
+        budget: Maximum fraction of requests that may be hedged
+        min_samples: Latency samples needed before the percentile is trusted
+        initial_delay: Hedge delay (seconds) until min_samples are collected
+        max_threads: Threads available to in-flight attempts, including
+            stuck ones that are being ignored
+    """
+
+    def __init__(
+        self,
+        primary: SearchProvider,
+        secondary: SearchProvider | None = None,
+        hedge_percentile: float = 95.0,
+        budget: float = 0.05,
+        min_samples: int = 20,
+        initial_delay: float = 5.0,
+        max_threads: int = 32,
+    ):
+        self.primary = primary
+        self.secondary = secondary or primary
+        self.name = f"hedged-{primary.name}"
+        self.hedge_percentile = hedge_percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+
+        self.tracker = LatencyTracker()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_threads, thread_name_prefix="hedge"
+        )
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        # End-to-end latency per request, and the primary attempt's own
+        # latency (what the request would have cost without hedging)
+        self.latencies: list[float] = []
+        self.primary_latencies: list[float] = []
+        # Start times of primary attempts still running
+        self._running: dict[Future, float] = {}
+
+    def hedge_delay(self) -> float:
+        if len(self.tracker) < self.min_samples:
+            return self.initial_delay
+        return self.tracker.percentile(self.hedge_percentile)
+
+    def _can_hedge(self) -> bool:
+        with self._lock:
+            if self.hedges + 1 > self.budget * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+    def _attempt(self, provider: SearchProvider, query: str, primary: bool):
+        start = time.perf_counter()
+        future = self._executor.submit(provider.search, query)
+        if not primary:
+            return future
+
+        with self._lock:
+            self._running[future] = start
+
+        def done(_):
+            elapsed = time.perf_counter() - start
+            # Learn from primary attempts only, including late ones
+            self.tracker.record(elapsed)
+            with self._lock:
+                self.primary_latencies.append(elapsed)
+                self._running.pop(future, None)
+
+        future.add_done_callback(done)
+        return future
+
+    def search(self, query: str) -> SearchHit | None:
+        start = time.perf_counter()
+        with self._lock:
+            self.requests += 1
+
+        primary = self._attempt(self.primary, query, primary=True)
+        done, _ = wait([primary], timeout=self.hedge_delay())
+
+        if done or not self._can_hedge():
+            result = primary.result()
+            self._record(start)
+            return result
+
+        logger.debug(f"Hedging slow search for: {query}")
+        hedge = self._attempt(self.secondary, query, primary=False)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                if future is hedge:
+                    with self._lock:
+                        self.hedge_wins += 1
+                # The slower attempt is left to finish in the background
+                self._record(start)
+                return future.result()
+
+        self._record(start)
+        raise error
+
+    def _record(self, start: float):
+        with self._lock:
+            self.latencies.append(time.perf_counter() - start)
+
+    def summary(self) -> str | None:
+        now = time.perf_counter()
+        with self._lock:
+            latencies = list(self.latencies)
+            # Primaries still running count with their time so far (a lower
+            # bound); leaving them out would hide the slowest ones
+            primary = self.primary_latencies + [
+                now - start for start in self._running.values()
+            ]
+            hedges, wins, requests = self.hedges, self.hedge_wins, self.requests
+
+        if not requests:
+            return None
+
+        saved = max(0.0, sum(primary) - sum(latencies))
+        p99_before = percentile(primary, 99)
+        p99_after = percentile(latencies, 99)
+        return (
+            f"Hedging: {hedges}/{requests} requests hedged ({wins} won), "
+            f"p99 {p99_before:.2f}s → {p99_after:.2f}s, "
+            f"~{saved:.1f}s of search time saved"
+        )
+
+    def close(self):
+        # Do not wait for stuck attempts
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.primary.close()
+        if self.secondary is not self.primary:
+            self.secondary.close()
+
+
+def build_search_provider(
+    name: str, hedge: bool = False, hedge_provider: str | None = None
+) -> SearchProvider:
+    """
+    Instantiate a search provider by name, optionally wrapped for hedging.
+
+    Args:
+        name: Primary provider name
+        hedge: Wrap the provider in a HedgedSearchProvider
+        hedge_provider: Provider name for hedge requests (default: same as name)
+    """
+    provider = get_search_provider(name)
+    if not hedge:
+        return provider
+
+    secondary = get_search_provider(hedge_provider) if hedge_provider else None
+    return HedgedSearchProvider(provider, secondary)
@@ -0,0 +1,349 @@
+import gzip
+import json
+import logging
+import os
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+from spm2ytm.core.dedupe import normalize_key, normalize_words, number_tokens
+from spm2ytm.core.pipeline import iter_songs
+from spm2ytm.core.resolvers import Resolver
+from spm2ytm.normalize import search_key
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT = "spm2ytm-history"
+INDEX_VERSION = 2
+DEFAULT_PLAYLISTS_DIR = os.path.join("data", "playlists")
+DEFAULT_HISTORY_INDEX = os.path.join("data", "cache", "history_index.json.gz")
+# Similarity needed before a match is used instead of a search;
+# "Song Artist" vs "Song Artist Remix" scores 0.8
+DEFAULT_MIN_SCORE = 0.85
+# Search results matching their query worse than this are not indexed
+DEFAULT_MIN_CONFIDENCE = 0.5
+# Words introducing featured artists; the words after them are optional
+CREDIT_WORDS = frozenset({"feat", "ft", "featuring"})
+
+
+def credited(song: str) -> frozenset[str]:
+    """Words of a song line credited after "feat"/"ft", as far as they are
+    not also in the line before the credit."""
+    words = search_key(song).split()
+    for n, word in enumerate(words):
+        if word in CREDIT_WORDS:
+            return frozenset(words[n + 1 :]).difference(words[:n])
+    return frozenset()
+
+
+def _word_similarity(a: str, b: str) -> float:
+    """1.0 for equal words, 1 - 1/length for words one edit apart, else 0."""
+    if a == b:
+        return 1.0
+    if abs(len(a) - len(b)) > 1:
+        return 0.0
+    short, long = sorted((a, b), key=len)
+    i = 0
+    while i < len(short) and short[i] == long[i]:
+        i += 1
+    rest = short[i + 1 :] if len(short) == len(long) else short[i:]
+    if rest != long[i + 1 :]:
+        return 0.0
+    return 1 - 1 / len(long)
+
+
+def similarity(query: list[str], entry: list[str]) -> float:
+    """
+    Dice similarity of two word lists weighted by word length. Every query
+    word is paired with an equal entry word, else with one a single edit
+    away, so a typo costs part of a word rather than the whole word.
+    """
+    total = sum(map(len, query)) + sum(map(len, entry))
+    if not total:
+        return 1.0
+    left = list(entry)
+    unmatched = []
+    shared = 0.0
+    for word in query:
+        if word in left:
+            left.remove(word)
+            shared += 2 * len(word)
+        else:
+            unmatched.append(word)
+    for word in unmatched:
+        best = max(left, key=lambda other: _word_similarity(word, other), default="")
+        score = _word_similarity(word, best) if best else 0.0
+        if score:
+            left.remove(best)
+            shared += score * (len(word) + len(best))
+    return shared / total
+
+
+@dataclass
+class HistoryMatch:
+    video_id: str
+    score: float  # see similarity(); 1.0 for the same word set
+    song: str  # the indexed song line that matched
+
+
+class HistoryIndex(Resolver):
+    """
+    Approximate lookup of songs resolved in earlier runs.
+
+    Indexes the song file / '-ID.txt' pairs in data/playlists by normalized
+    word set. Candidates sharing the rarest words are found through an
+    inverted index, then ranked by word similarity that tolerates one-letter
+    typos, so word order, release labels, punctuation and small spelling
+    differences do not defeat a match. Featured artists ("feat X") only
+    count when both lines credit them. A candidate whose numbers differ
+    from the query's ("No 5" vs "No 9", "Part I" vs "Part II") never
+    matches, however close the rest of the text is.
+
+    Songs whose last search result was a poor match (see update()) are
+    remembered, and their lines in the '-ID.txt' files are not indexed.
+
+    The index is cached as gzipped JSON and refresh() only rereads pairs
+    whose files changed since they were indexed.
+
+    Args:
+        path: Cache location used by save() and flush()
+        min_score: Similarity needed for lookup() to answer without a search
+        min_confidence: Match score a new search result needs to be indexed
+        max_postings: Words found in more entries than this are too common
+            to select candidates (they still count towards the score)
+        candidates: Candidates scored per lookup
+    """
+
+    name = "history"
+
+    def __init__(
+        self,
+        path: str | None = None,
+        min_score: float = DEFAULT_MIN_SCORE,
+        min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+        max_postings: int = 1000,
+        candidates: int = 8,
+    ):
+        self.path = path
+        self.min_score = min_score
+        self.min_confidence = min_confidence
+        self.max_postings = max_postings
+        self.candidates = candidates
+        # ID file path -> [mtime_ns, size, song file mtime_ns] when indexed
+        self.files: dict[str, list[int]] = {}
+        self.dirty = False
+        self._entries: list[tuple[str, str]] = []  # (song, video_id)
+        self._tokens: list[frozenset[str]] = []
+        self._numbers: list[frozenset[str]] = []
+        self._credited: list[frozenset[str]] = []
+        self._by_key: dict[str, int] = {}
+        # Word-set keys of songs whose last search result was a poor match
+        self._doubtful: set[str] = set()
+        self._postings: dict[str, list[int]] = defaultdict(list)
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------
+    # Building
+    # ------------------------
+    def add(self, song: str, video_id: str) -> bool:
+        """Index one resolved song; a song with the same word set is replaced."""
+        words = normalize_words(song)
+        tokens = frozenset(words)
+        key = " ".join(sorted(tokens))
+        with self._lock:
+            if key in self._doubtful:
+                return False
+            idx = self._by_key.get(key)
+            if idx is None:
+                idx = self._by_key[key] = len(self._entries)
+                self._entries.append((song, video_id))
+                self._tokens.append(tokens)
+                self._numbers.append(number_tokens(words))
+                self._credited.append(tokens & credited(song))
+                for token in tokens:
+                    self._postings[token].append(idx)
+            elif self._entries[idx][1] != video_id:
+                # Same word set, so the cached tokens still apply
+                self._entries[idx] = (song, video_id)
+            else:
+                return False
+            self.dirty = True
+            return True
+
+    def add_id_file(self, song_file: str, ids_file: str | None = None) -> int:
+        """Index a song file with its positional '-ID.txt' results."""
+        song_path = Path(song_file)
+        ids_path = Path(ids_file or song_path.parent / f"{song_path.stem}-ID.txt")
+
+        added = 0
+        with open(ids_path, "r", encoding="utf-8") as ids:
+            for song, video_id in zip(iter_songs(song_path), ids):
+                video_id = video_id.strip()
+                if video_id:
+                    added += self.add(song, video_id)
+        return added
+
+    def refresh(self, playlists_dir: str = DEFAULT_PLAYLISTS_DIR) -> int:
+        """
+        Index song/'-ID.txt' pairs that are new or changed since last indexed.
+
+        Returns:
+            Number of pairs (re)read
+        """
+        read = 0
+        for ids_path in sorted(Path(playlists_dir).glob("*-ID.txt")):
+            song_path = ids_path.with_name(ids_path.name[: -len("-ID.txt")] + ".txt")
+            if not song_path.exists():
+                continue
+            ids_stat = ids_path.stat()
+            song_mtime = song_path.stat().st_mtime_ns
+            stamp = [ids_stat.st_mtime_ns, ids_stat.st_size, song_mtime]
+            if self.files.get(str(ids_path)) == stamp:
+                continue
+
+            self.add_id_file(str(song_path), str(ids_path))
+            with self._lock:
+                self.files[str(ids_path)] = stamp
+                self.dirty = True
+            read += 1
+
+        if read:
+            logger.info(f"History index: read {read} song file(s), {len(self)} songs")
+        return read
+
+    # ------------------------
+    # Querying
+    # ------------------------
+    def search(self, song: str, limit: int = 1) -> list[HistoryMatch]:
+        """Best indexed matches for `song`, highest similarity first."""
+        words = normalize_words(song)
+        tokens = frozenset(words)
+        with self._lock:
+            idx = self._by_key.get(" ".join(sorted(tokens)))
+            if idx is not None and limit == 1:
+                entry_song, video_id = self._entries[idx]
+                return [HistoryMatch(video_id, 1.0, entry_song)]
+
+            postings = [self._postings[t] for t in tokens if t in self._postings]
+            if not postings:
+                return []
+            selective = [p for p in postings if len(p) <= self.max_postings]
+            counts: Counter[int] = Counter()
+            for posting in selective or [min(postings, key=len)]:
+                counts.update(posting)
+
+            numbers = number_tokens(words)
+            optional = tokens & credited(song)
+            matches = []
+            for idx, _ in counts.most_common(self.candidates):
+                if self._numbers[idx] != numbers:
+                    continue
+                # Credits count only when both lines have them
+                entry = self._tokens[idx]
+                query_words = [t for t in tokens if t not in optional or t in entry]
+                entry_words = [
+                    t for t in entry if t not in self._credited[idx] or t in tokens
+                ]
+                score = similarity(sorted(query_words), sorted(entry_words))
+                entry_song, video_id = self._entries[idx]
+                matches.append(HistoryMatch(video_id, round(score, 3), entry_song))
+
+        matches.sort(key=lambda m: m.score, reverse=True)
+        return matches[:limit]
+
+    # ------------------------
+    # Resolver interface
+    # ------------------------
+    def lookup(self, song: str) -> str | None:
+        matches = self.search(song)
+        if matches and matches[0].score >= self.min_score:
+            return matches[0].video_id
+        return None
+
+    def update(self, song: str, video_id: str, confidence: float = 1.0):
+        key = normalize_key(song)
+        with self._lock:
+            if confidence < self.min_confidence:
+                # Also keeps refresh() from reading it back from the ID file
+                if key not in self._doubtful:
+                    self._doubtful.add(key)
+                    self.dirty = True
+                return
+            if key in self._doubtful:
+                self._doubtful.discard(key)
+                self.dirty = True
+        self.add(song, video_id)
+
+    def flush(self):
+        if self.dirty and self.path:
+            self.save()
+
+    # ------------------------
+    # Persistence
+    # ------------------------
+    def save(self, path: str | None = None) -> str:
+        path = path or self.path
+        if not path:
+            raise ValueError("No path given for the history index")
+
+        with self._lock:
+            data = {
+                "format": INDEX_FORMAT,
+                "version": INDEX_VERSION,
+                "files": dict(self.files),
+                "entries": [list(entry) for entry in self._entries],
+                "doubtful": sorted(self._doubtful),
+            }
+            self.dirty = False
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        # Search workers sharing this index may flush it at the same time
+        with self._save_lock:
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "HistoryIndex":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format") != INDEX_FORMAT or data.get("version") != INDEX_VERSION:
+            raise ValueError(f"{path} is not a history index this version can read")
+
+        index = cls(path=path, **kwargs)
+        index._doubtful.update(data["doubtful"])
+        for song, video_id in data["entries"]:
+            index.add(song, video_id)
+        index.files = data["files"]
+        index.dirty = False
+        return index
+
+    @classmethod
+    def open(
+        cls,
+        path: str = DEFAULT_HISTORY_INDEX,
+        playlists_dir: str = DEFAULT_PLAYLISTS_DIR,
+        **kwargs,
+    ) -> "HistoryIndex":
+        """
+        Load the cached index (rebuilding it if missing or unreadable) and
+        bring it up to date with `playlists_dir`.
+        """
+        index = None
+        if Path(path).exists():
+            try:
+                index = cls.load(path, **kwargs)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Rebuilding history index ({e})")
+        if index is None:
+            index = cls(path=path, **kwargs)
+        index.refresh(playlists_dir)
+        index.flush()
+        return index
@@ -0,0 +1,219 @@
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from spm2ytm.core.dedupe import normalize_key
+from spm2ytm.core.pipeline import iter_songs
+from spm2ytm.core.resolvers import Resolver
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT = "spm2ytm-mapping"
+BUNDLE_VERSION = 1
+DEFAULT_MAPPING_STORE = os.path.join("data", "mappings.json.gz")
+
+# Confidence for pairs taken from existing song/-ID.txt files, whose match
+# quality is unknown
+ID_FILE_CONFIDENCE = 0.5
+# Below this a mapping is kept (and exported) but not used to skip a search
+DEFAULT_MIN_CONFIDENCE = 0.5
+
+
+def query_key(song: str) -> str:
+    """
+    Bundle key for a song line: its order-insensitive normalized words.
+
+    Uses the dedupe key, so lines that dedupe treats as exact duplicates
+    share a mapping; release labels count only in brackets or a " - "
+    suffix, and numbers always count.
+    """
+    return f"q:{normalize_key(song)}"
+
+
+@dataclass(frozen=True)
+class Mapping:
+    video_id: str
+    confidence: float = 1.0
+    updated_at: float = field(default_factory=time.time)
+
+    def wins_over(self, other: "Mapping") -> bool:
+        """Higher confidence wins; equal confidence falls back to the newer one."""
+        mine = (self.confidence, self.updated_at)
+        return mine > (other.confidence, other.updated_at)
+
+
+@dataclass
+class MergeStats:
+    added: int = 0
+    replaced: int = 0
+    kept: int = 0
+
+    def __str__(self) -> str:
+        return f"{self.added} added, {self.replaced} replaced, {self.kept} kept"
+
+
+class MappingBundle(Resolver):
+    """
+    Portable song → video ID mappings, keyed by normalized query.
+
+    Saved as gzipped JSON:
+        {"format": "spm2ytm-mapping", "version": 1, "created_at": ...,
+         "entries": [[key, video_id, confidence, updated_at], ...]}
+
+    Args:
+        entries: Initial key -> Mapping entries
+        path: Default location for save()
+        min_confidence: Mappings below this confidence are not used by lookup()
+    """
+
+    name = "bundle"
+
+    def __init__(
+        self,
+        entries: dict[str, Mapping] | None = None,
+        path: str | None = None,
+        min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+    ):
+        self.entries: dict[str, Mapping] = dict(entries or {})
+        self.path = path
+        self.min_confidence = min_confidence
+        self.dirty = False
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: str) -> Mapping | None:
+        return self.entries.get(key)
+
+    def put(self, key: str, mapping: Mapping) -> str:
+        """
+        Insert `mapping` unless the existing entry wins the conflict.
+
+        Returns:
+            'added', 'replaced' or 'kept'
+        """
+        with self._lock:
+            current = self.entries.get(key)
+            if current is not None and not mapping.wins_over(current):
+                return "kept"
+            self.entries[key] = mapping
+            self.dirty = True
+            return "added" if current is None else "replaced"
+
+    # ------------------------
+    # Resolver interface
+    # ------------------------
+    def lookup(self, song: str) -> str | None:
+        mapping = self.entries.get(query_key(song))
+        if mapping and mapping.confidence >= self.min_confidence:
+            return mapping.video_id
+        return None
+
+    def update(self, song: str, video_id: str, confidence: float = 1.0):
+        self.put(query_key(song), Mapping(video_id, round(confidence, 3)))
+
+    def flush(self):
+        if self.dirty and self.path:
+            self.save()
+
+    # ------------------------
+    # Building and merging
+    # ------------------------
+    def merge(self, other: "MappingBundle") -> MergeStats:
+        stats = MergeStats()
+        for key, mapping in other.entries.items():
+            outcome = self.put(key, mapping)
+            setattr(stats, outcome, getattr(stats, outcome) + 1)
+        return stats
+
+    def add_id_file(
+        self,
+        song_file: str,
+        ids_file: str | None = None,
+        confidence: float = ID_FILE_CONFIDENCE,
+    ) -> MergeStats:
+        """
+        Import a song file and its positional '-ID.txt' results. Songs with an
+        empty ID line (not found) are skipped. Entries are timestamped with
+        the ID file's modification time.
+        """
+        song_path = Path(song_file)
+        ids_path = Path(ids_file or song_path.parent / f"{song_path.stem}-ID.txt")
+        updated_at = ids_path.stat().st_mtime
+
+        stats = MergeStats()
+        with open(ids_path, "r", encoding="utf-8") as ids:
+            for song, video_id in zip(iter_songs(song_path), ids):
+                video_id = video_id.strip()
+                if not video_id:
+                    continue
+                outcome = self.put(
+                    query_key(song), Mapping(video_id, confidence, updated_at)
+                )
+                setattr(stats, outcome, getattr(stats, outcome) + 1)
+        return stats
+
+    # ------------------------
+    # Persistence
+    # ------------------------
+    def save(self, path: str | None = None) -> str:
+        path = path or self.path
+        if not path:
+            raise ValueError("No path given for the mapping bundle")
+
+        with self._lock:
+            entries = [
+                [key, m.video_id, m.confidence, int(m.updated_at)]
+                for key, m in sorted(self.entries.items())
+            ]
+            self.dirty = False
+        data = {
+            "format": BUNDLE_FORMAT,
+            "version": BUNDLE_VERSION,
+            "created_at": int(time.time()),
+            "entries": entries,
+        }
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        # Concurrent search runs may flush the same store
+        with self._save_lock:
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "MappingBundle":
+        """Read a bundle; raises ValueError for foreign or newer formats."""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+
+        if data.get("format") != BUNDLE_FORMAT:
+            raise ValueError(f"{path} is not a mapping bundle")
+        version = data.get("version", 0)
+        if version > BUNDLE_VERSION:
+            raise ValueError(
+                f"{path} uses bundle version {version}; "
+                f"this version of spm2ytm reads up to {BUNDLE_VERSION}"
+            )
+
+        entries = {
+            key: Mapping(video_id, confidence, updated_at)
+            for key, video_id, confidence, updated_at in data["entries"]
+        }
+        return cls(entries, path=path, **kwargs)
+
+    @classmethod
+    def open(cls, path: str = DEFAULT_MAPPING_STORE, **kwargs) -> "MappingBundle":
+        """Load the bundle at `path`, or start an empty one that saves there."""
+        if Path(path).exists():
+            return cls.load(path, **kwargs)
+        return cls(path=path, **kwargs)
@@ -0,0 +1,192 @@
+import bisect
+import logging
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+
+from spm2ytm.clients.yt_playlist_editor import PlaylistEditor, PlaylistItem
+from spm2ytm.errors.custom_errors import PlaylistEditError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MirrorPlan:
+    """
+    Edits turning a playlist's current entries into the target order.
+
+    Entries are matched to target positions by video ID. The longest run of
+    matches already in target order stays put; other matches are moved,
+    unmatched entries removed and unmatched target positions added.
+
+    A target position without a video ID (a song that was not found) keeps
+    the entry sitting at that position, if there is one. Unmatched entries
+    are only removed when every target position has a video ID; otherwise
+    they are left where they are.
+    """
+
+    removes: list[PlaylistItem] = field(default_factory=list)
+    # target index -> current entry moved there
+    moves: dict[int, PlaylistItem] = field(default_factory=dict)
+    adds: list[int] = field(default_factory=list)  # target indices, ascending
+    # (target index, current entry) left where they are
+    kept: list[tuple[int, PlaylistItem]] = field(default_factory=list)
+    # target indices without a video ID and without an entry to keep there
+    unresolved: list[int] = field(default_factory=list)
+    # unmatched entries not removed because the target is incomplete
+    left: list[PlaylistItem] = field(default_factory=list)
+
+    @property
+    def edits(self) -> int:
+        return len(self.removes) + len(self.moves) + len(self.adds)
+
+    def summary(self) -> str:
+        summary = (
+            f"{len(self.removes)} to remove, {len(self.adds)} to add, "
+            f"{len(self.moves)} to move, {len(self.kept)} unchanged"
+        )
+        if self.left:
+            summary += f", {len(self.left)} unmatched left in place"
+        return summary
+
+    def placed(self) -> list[int]:
+        """Target indices that end up with an entry, ascending."""
+        return sorted([*(j for j, _ in self.kept), *self.moves, *self.adds])
+
+
+def _longest_increasing(values: list[int]) -> set[int]:
+    """Positions in `values` of one longest strictly increasing subsequence."""
+    tails: list[int] = []  # smallest tail value of an increasing run per length
+    tail_pos: list[int] = []
+    previous = [-1] * len(values)
+    for pos, value in enumerate(values):
+        length = bisect.bisect_left(tails, value)
+        if length == len(tails):
+            tails.append(value)
+            tail_pos.append(pos)
+        else:
+            tails[length] = value
+            tail_pos[length] = pos
+        previous[pos] = tail_pos[length - 1] if length else -1
+
+    chosen = set()
+    pos = tail_pos[-1] if tail_pos else -1
+    while pos != -1:
+        chosen.add(pos)
+        pos = previous[pos]
+    return chosen
+
+
+def plan_mirror(current: list[PlaylistItem], target: list[str]) -> MirrorPlan:
+    """
+    Minimal edits to make `current` list the videos of `target` in order.
+
+    The k-th entry of a video in the playlist is matched to its k-th
+    position in `target`, and a longest increasing subsequence of the
+    matched target positions (the LCS of the two lists when video IDs are
+    unique) stays in place. Runs in O(n log n); the number of edits is the
+    edit distance, so a mirror that is already up to date needs none.
+
+    Empty strings in `target` mark songs that were not found. Such a
+    position is given the unmatched entry right after the one placed at the
+    previous position, so a failed search never deletes what is there, and
+    nothing is removed while any position is unresolved.
+    """
+    positions: dict[str, deque[int]] = defaultdict(deque)
+    for j, video_id in enumerate(target):
+        if video_id:
+            positions[video_id].append(j)
+
+    slot_of: dict[int, int] = {}  # current index -> target index
+    for i, item in enumerate(current):
+        free = positions.get(item.video_id)
+        if free:
+            slot_of[i] = free.popleft()
+
+    plan = MirrorPlan()
+    entry_at = {j: i for i, j in slot_of.items()}
+    for j, video_id in enumerate(target):
+        if video_id:
+            continue
+        previous = entry_at.get(j - 1) if j else -1
+        i = previous + 1 if previous is not None else None
+        if i is not None and i < len(current) and i not in slot_of:
+            slot_of[i] = entry_at[j] = j
+        else:
+            plan.unresolved.append(j)
+
+    unmatched = [item for i, item in enumerate(current) if i not in slot_of]
+    if plan.unresolved:
+        plan.left = unmatched
+    else:
+        plan.removes = unmatched
+
+    matched = [(slot_of[i], current[i]) for i in sorted(slot_of)]
+    in_order = _longest_increasing([j for j, _ in matched])
+    for pos, (j, item) in enumerate(matched):
+        if pos in in_order:
+            plan.kept.append((j, item))
+        else:
+            plan.moves[j] = item
+
+    plan.adds = [
+        j for j, video_id in enumerate(target) if video_id and j not in entry_at
+    ]
+    return plan
+
+
+def mirror_playlist(
+    editor: PlaylistEditor, playlist_id: str, video_ids: list[str]
+) -> MirrorPlan:
+    """
+    Make a playlist list exactly `video_ids`, in order, with the fewest edits.
+
+    Empty IDs are songs that were not found; see plan_mirror for how their
+    positions are kept. The playlist is read once. Entries are then removed,
+    added (appended to the end) and moved after their target predecessor,
+    walking the target order so every predecessor is already in place when
+    it is used. Added videos that end the playlist are appended in order and
+    never moved.
+
+    Returns:
+        The plan that was applied
+    """
+    current = editor.get_playlist_items(playlist_id)
+    plan = plan_mirror(current, video_ids)
+    logger.info(f"Mirror: {plan.summary()}")
+    if not plan.edits:
+        return plan
+
+    if plan.removes:
+        editor.remove_items(playlist_id, plan.removes)
+
+    set_ids: dict[int, str] = {j: item.set_video_id for j, item in plan.kept}
+    set_ids.update((j, item.set_video_id) for j, item in plan.moves.items())
+    if plan.adds:
+        new_ids = editor.append_videos(playlist_id, [video_ids[j] for j in plan.adds])
+        if None in new_ids:
+            # YouTube did not report the new entries; they are the ones
+            # not seen before, at the end of the playlist
+            known = {item.set_video_id for item in current}
+            new_ids = [
+                item.set_video_id
+                for item in editor.get_playlist_items(playlist_id)
+                if item.set_video_id not in known
+            ][-len(plan.adds) :]
+            if len(new_ids) != len(plan.adds):
+                raise PlaylistEditError("Could not find the added playlist entries")
+        set_ids.update(zip(plan.adds, new_ids))
+
+    # Added videos after the last kept or moved entry are already in place
+    adds = set(plan.adds)
+    placed = plan.placed()
+    settled = len(placed)
+    while settled and placed[settled - 1] in adds:
+        settled -= 1
+    moves = [
+        (set_ids[j], set_ids[placed[k - 1]] if k else None)
+        for k, j in enumerate(placed[:settled])
+        if j in adds or j in plan.moves
+    ]
+    if moves:
+        editor.move_items(playlist_id, moves)
+    return plan
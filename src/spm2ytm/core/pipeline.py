@@ -0,0 +1,68 @@
+from concurrent.futures import Executor, Future, wait
+from typing import Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+def iter_songs(song_path) -> Iterator[str]:
+    """Lazily yield the non-empty, stripped lines of a song file."""
+    with open(song_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def bounded_ordered_map(
+    executor: Executor,
+    fn: Callable[[T], object],
+    items: Iterable[T],
+    window: int,
+    shortcut: Callable[[T], object | None] | None = None,
+) -> Iterator[tuple[T, Future]]:
+    """
+    Submit `fn(item)` for each item with at most `window` items outstanding,
+    yielding (item, completed future) pairs in input order.
+
+    Items are pulled from `items` lazily, and results that finish ahead of
+    the next in-order item wait in a reorder buffer. Memory therefore stays
+    proportional to `window`, not to the number of items.
+
+    If `shortcut` is given it is called in the caller's thread before an item
+    is submitted; a non-None return value becomes that item's result without
+    touching the executor.
+    """
+    if window < 1:
+        raise ValueError("window must be at least 1")
+
+    items = iter(items)
+    pending: dict[int, tuple[T, Future]] = {}
+    next_seq = 0
+    submitted = 0
+    exhausted = False
+
+    while True:
+        # Top up the window
+        while not exhausted and submitted - next_seq < window:
+            try:
+                item = next(items)
+            except StopIteration:
+                exhausted = True
+                break
+            result = shortcut(item) if shortcut else None
+            if result is not None:
+                future = Future()
+                future.set_result(result)
+            else:
+                future = executor.submit(fn, item)
+            pending[submitted] = (item, future)
+            submitted += 1
+
+        if next_seq == submitted:
+            return
+
+        # Release the head of the line once it completes
+        item, future = pending.pop(next_seq)
+        wait([future])
+        next_seq += 1
+        yield item, future
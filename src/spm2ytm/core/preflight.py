@@ -0,0 +1,130 @@
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from spm2ytm.clients.http_session import build_session
+from spm2ytm.clients.yt_oembed import (DEAD, OEMBED_URL, UNKNOWN, ProbeResult,
+                                       probe_video)
+from spm2ytm.logging_setup import PER_ITEM
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PreflightReport:
+    valid: list[str] = field(default_factory=list)  # IDs to hand to the writer
+    # (line number, video ID, status, reason) for everything else
+    rejected: list[tuple[int, str, str, str]] = field(default_factory=list)
+    empty_lines: int = 0
+    unknown: int = 0
+
+    @property
+    def dead(self) -> int:
+        return sum(1 for _, _, status, _ in self.rejected if status == DEAD)
+
+
+def validate_video_ids(
+    lines: list[str],
+    max_workers: int = 16,
+    session=None,
+    base_url: str = OEMBED_URL,
+    timeout: float = 10.0,
+) -> PreflightReport:
+    """
+    Probe every video ID concurrently before the browser stage.
+
+    Args:
+        lines: Lines of an '-ID.txt' file; empty lines are songs that had no
+            search result and are reported, not probed
+        max_workers: Concurrent probes
+        session: requests.Session to use (default: pooled session with
+            retries on 429/5xx)
+        base_url: oEmbed endpoint
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        PreflightReport. IDs whose status could not be determined are kept
+        in `valid` so a flaky probe never drops a good video.
+    """
+    session = session or build_session(max_connections=max_workers, retries=3)
+    report = PreflightReport()
+
+    # Probe each distinct ID once
+    unique_ids = list(dict.fromkeys(line.strip() for line in lines if line.strip()))
+    probe = functools.partial(probe_video, session, base_url=base_url, timeout=timeout)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results: dict[str, ProbeResult] = dict(
+            zip(unique_ids, executor.map(probe, unique_ids))
+        )
+
+    for line_no, line in enumerate(lines, 1):
+        video_id = line.strip()
+        if not video_id:
+            report.empty_lines += 1
+            report.rejected.append((line_no, "", DEAD, "empty line (song not found)"))
+            continue
+
+        result = results[video_id]
+        if result.status == DEAD:
+            logger.warning(
+                f"  ✗ Skipping {video_id}: {result.reason}", extra=PER_ITEM
+            )
+            report.rejected.append((line_no, video_id, DEAD, result.reason))
+            continue
+        if result.status == UNKNOWN:
+            report.unknown += 1
+            report.rejected.append((line_no, video_id, UNKNOWN, result.reason))
+        report.valid.append(video_id)
+
+    return report
+
+
+def write_report(report: PreflightReport, path: str):
+    """Tab-separated report of the IDs that were skipped or could not be checked."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            f"# {len(report.valid)} valid, {report.dead} dead "
+            f"({report.empty_lines} empty lines), "
+            f"{report.unknown} unchecked (kept)\n"
+        )
+        f.write("# line\tvideo_id\tstatus\treason\n")
+        for line_no, video_id, status, reason in report.rejected:
+            f.write(f"{line_no}\t{video_id}\t{status}\t{reason}\n")
+
+
+def preflight_ids_file(
+    video_ids_file: str, keep_positions: bool = False, **kwargs
+) -> list[str]:
+    """
+    Validate an '-ID.txt' file and write '<name>-preflight.txt' next to it.
+
+    Args:
+        video_ids_file: Path to the '-ID.txt' file
+        keep_positions: Return one entry per line, with dead IDs blanked
+            like songs that were not found, instead of only the good IDs
+
+    Returns:
+        Video IDs worth sending to the playlist writer, in file order
+    """
+    ids_path = Path(video_ids_file)
+    with open(ids_path, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+
+    report = validate_video_ids(lines, **kwargs)
+    report_path = ids_path.parent / f"{ids_path.stem}-preflight.txt"
+    write_report(report, str(report_path))
+
+    logger.info(
+        f"Pre-flight: {len(report.valid)} valid, {report.dead} dead "
+        f"({report.empty_lines} empty lines), {report.unknown} unchecked "
+        f"→ report: {report_path}"
+    )
+    if keep_positions:
+        dead = {line_no for line_no, _, status, _ in report.rejected if status == DEAD}
+        return [
+            "" if line_no in dead else line.strip()
+            for line_no, line in enumerate(lines, 1)
+        ]
+    return report.valid
@@ -0,0 +1,338 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from spm2ytm.errors.custom_errors import LeaseLostError
+
+# Stages a conversion job moves through, in order
+STAGES = ("extract", "search", "add")
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Seconds a claim stays valid without a heartbeat from its worker
+DEFAULT_LEASE = 300.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    stage TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    next_run_at REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    source TEXT NOT NULL DEFAULT '',
+    lease_until REAL NOT NULL DEFAULT 0,
+    claim_token TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (stage, status, next_run_at);
+CREATE TABLE IF NOT EXISTS served (
+    stage TEXT NOT NULL,
+    source TEXT NOT NULL,
+    claimed_at REAL NOT NULL,
+    PRIMARY KEY (stage, source)
+);
+"""
+
+# Columns added after the first release, for databases created before them
+_ADDED_COLUMNS = {
+    "source": "TEXT NOT NULL DEFAULT ''",
+    "lease_until": "REAL NOT NULL DEFAULT 0",
+    "claim_token": "TEXT",
+}
+
+
+@dataclass
+class Job:
+    id: int
+    stage: str
+    status: str
+    payload: dict = field(default_factory=dict)
+    attempts: int = 0
+    max_attempts: int = 5
+    next_run_at: float = 0.0
+    last_error: str | None = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+    source: str = ""
+    lease_until: float = 0.0
+    claim_token: str | None = None  # identifies the claim that ran the job
+
+
+class JobQueue:
+    """
+    Durable, SQLite-backed queue of conversion jobs.
+
+    Each job is a single row that advances through STAGES. Every job has a
+    source (who or what submitted it). Sources take turns per stage: a claim
+    serves the source whose last job of that stage was claimed longest ago.
+    Within a source, jobs are first come, first served, and retried jobs go
+    to the back of the line. One source submitting a whole library therefore
+    cannot starve the others.
+
+    A claim is a lease of `lease` seconds that the worker renews with
+    heartbeat(). Jobs whose lease ran out (their service died) are put back
+    by requeue_expired(). Jobs held by another live service are not touched.
+    Results are only recorded while the job is still held by the claim that
+    ran it; a worker whose job was requeued meanwhile gets LeaseLostError.
+    """
+
+    def __init__(self, db_path: str, lease: float = DEFAULT_LEASE):
+        self.lease = lease
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            db_path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, ddl in _ADDED_COLUMNS.items():
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {ddl}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def submit(
+        self, stage: str, payload: dict, max_attempts: int = 5, source: str = ""
+    ) -> int:
+        """
+        Enqueue a new job starting at the given stage.
+
+        Args:
+            stage: First stage to run
+            payload: Stage handler input
+            max_attempts: Attempts per stage before the job fails
+            source: Submitter the job is scheduled fairly against
+
+        Returns:
+            The new job's ID
+        """
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage '{stage}'. Expected one of {STAGES}")
+
+        now = time.time()
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO jobs (stage, status, payload, max_attempts,"
+                " next_run_at, created_at, updated_at, source)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    stage,
+                    QUEUED,
+                    json.dumps(payload),
+                    max_attempts,
+                    now,
+                    now,
+                    now,
+                    source,
+                ),
+            )
+            return cur.lastrowid
+
+    def claim(self, stage: str) -> Job | None:
+        """
+        Atomically claim the next runnable job of a stage, taking sources in
+        turn (see the class docstring).
+
+        Returns:
+            The claimed job (now RUNNING), or None if nothing is runnable
+        """
+        now = time.time()
+        lease_until = now + self.lease
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT jobs.* FROM jobs LEFT JOIN served"
+                    " ON served.stage = jobs.stage AND served.source = jobs.source"
+                    " WHERE jobs.stage = ? AND jobs.status = ? AND next_run_at <= ?"
+                    " ORDER BY COALESCE(served.claimed_at, 0), next_run_at, id"
+                    " LIMIT 1",
+                    (stage, QUEUED, now),
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, attempts = attempts + 1,"
+                    " lease_until = ?, claim_token = ?, updated_at = ? WHERE id = ?",
+                    (RUNNING, lease_until, token, now, row["id"]),
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO served (stage, source, claimed_at)"
+                    " VALUES (?, ?, ?)",
+                    (stage, row["source"], now),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        job = self._row_to_job(row)
+        job.status = RUNNING
+        job.attempts += 1
+        job.lease_until = lease_until
+        job.claim_token = token
+        return job
+
+    def heartbeat(self, jobs: list[Job]):
+        """Renew the leases of running jobs whose worker is still alive."""
+        lease_until = time.time() + self.lease
+        with self._lock:
+            for job in jobs:
+                self._conn.execute(
+                    "UPDATE jobs SET lease_until = ?"
+                    " WHERE id = ? AND status = ? AND claim_token = ?",
+                    (lease_until, job.id, RUNNING, job.claim_token),
+                )
+
+    def _update_claimed(self, job: Job, assignments: str, params: tuple):
+        # Only the claim that ran a job may record its result
+        cur = self._conn.execute(
+            f"UPDATE jobs SET {assignments}"
+            " WHERE id = ? AND status = ? AND claim_token = ?",
+            (*params, job.id, RUNNING, job.claim_token),
+        )
+        if cur.rowcount == 0:
+            raise LeaseLostError(f"Job {job.id} is no longer held by this worker")
+
+    def advance(self, job: Job, next_stage: str | None, payload: dict):
+        """
+        Move a job to its next stage, or mark it done if next_stage is None.
+
+        Raises:
+            LeaseLostError: If the job was requeued since it was claimed
+        """
+        now = time.time()
+        with self._lock:
+            if next_stage is None:
+                self._update_claimed(
+                    job,
+                    "status = ?, payload = ?, last_error = NULL, updated_at = ?",
+                    (DONE, json.dumps(payload), now),
+                )
+            else:
+                # Attempts are counted per stage
+                self._update_claimed(
+                    job,
+                    "stage = ?, status = ?, payload = ?, attempts = 0,"
+                    " last_error = NULL, next_run_at = ?, updated_at = ?",
+                    (next_stage, QUEUED, json.dumps(payload), now, now),
+                )
+
+    def retry_or_fail(self, job: Job, error: str, delay: float) -> bool:
+        """
+        Requeue a job after `delay` seconds, or mark it failed once it has
+        used up its attempts.
+
+        Returns:
+            True if the job was requeued, False if it was marked failed
+
+        Raises:
+            LeaseLostError: If the job was requeued since it was claimed
+        """
+        now = time.time()
+        will_retry = job.attempts < job.max_attempts
+        with self._lock:
+            if will_retry:
+                self._update_claimed(
+                    job,
+                    "status = ?, last_error = ?, next_run_at = ?, updated_at = ?",
+                    (QUEUED, error, now + delay, now),
+                )
+            else:
+                self._update_claimed(
+                    job,
+                    "status = ?, last_error = ?, updated_at = ?",
+                    (FAILED, error, now),
+                )
+        return will_retry
+
+    def requeue_expired(self) -> int:
+        """
+        Put RUNNING jobs whose lease ran out (their service stopped or
+        crashed) back in the queue.
+
+        Returns:
+            Number of jobs requeued
+        """
+        now = time.time()
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE jobs SET status = ?, next_run_at = ?, updated_at = ?"
+                " WHERE status = ? AND lease_until < ?",
+                (QUEUED, now, now, RUNNING, now),
+            )
+            return cur.rowcount
+
+    def get(self, job_id: int) -> Job | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def list_jobs(self, status: str | None = None, limit: int = 50) -> list[Job]:
+        with self._lock:
+            if status:
+                rows = self._conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY id DESC LIMIT ?",
+                    (status, limit),
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,)
+                ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def counts(self) -> dict[tuple[str, str], int]:
+        """Number of jobs per (stage, status)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT stage, status, COUNT(*) AS n FROM jobs GROUP BY stage, status"
+            ).fetchall()
+        return {(row["stage"], row["status"]): row["n"] for row in rows}
+
+    def has_pending(self) -> bool:
+        """True while any job is still queued or running."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM jobs WHERE status IN (?, ?) LIMIT 1",
+                (QUEUED, RUNNING),
+            ).fetchone()
+        return row is not None
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Job:
+        return Job(
+            id=row["id"],
+            stage=row["stage"],
+            status=row["status"],
+            payload=json.loads(row["payload"]),
+            attempts=row["attempts"],
+            max_attempts=row["max_attempts"],
+            next_run_at=row["next_run_at"],
+            last_error=row["last_error"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+            source=row["source"],
+            lease_until=row["lease_until"],
+            claim_token=row["claim_token"],
+        )
@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+
+
+class Resolver(ABC):
+    """
+    Source of song → video ID answers consulted before any search is made.
+
+    The search stage calls `lookup` for every song (from one thread) and
+    `update` with each fresh search result, so resolvers can learn as they go.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def lookup(self, song: str) -> str | None:
+        """Return a known video ID for `song`, or None to fall through to search."""
+
+    def update(self, song: str, video_id: str, confidence: float = 1.0):
+        """Record a search result. Resolvers that only read can ignore it."""
+
+    def flush(self):
+        """Persist what was learned; called at the end of a search run."""
+
+
+def resolve(resolvers, song: str) -> tuple[str, str] | None:
+    """First answer from `resolvers` as (video_id, resolver name), or None."""
+    for resolver in resolvers:
+        video_id = resolver.lookup(song)
+        if video_id:
+            return video_id, resolver.name
+    return None
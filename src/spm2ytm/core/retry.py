@@ -0,0 +1,154 @@
+import logging
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+TRANSIENT = "transient"
+PERMANENT = "permanent"
+
+# Substrings of error messages (yt-dlp wraps most network errors in
+# DownloadError) that indicate a temporary network or throttling problem
+TRANSIENT_MARKERS = (
+    "429",
+    "too many requests",
+    "timed out",
+    "timeout",
+    "temporary failure",
+    "connection reset",
+    "connection aborted",
+    "connection refused",
+    "remote end closed",
+    "unable to download api page",
+    "http error 5",
+    "service unavailable",
+    "bad gateway",
+    "name or service not known",
+    "network is unreachable",
+)
+
+
+def classify_error(exc: BaseException) -> str:
+    """
+    Classify an exception raised by a search as TRANSIENT or PERMANENT.
+
+    Validation errors (ValueError) are permanent; socket-level errors and
+    network/throttling messages are transient; anything else is permanent.
+    """
+    if isinstance(exc, ValueError):
+        return PERMANENT
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return TRANSIENT
+
+    message = str(exc).lower()
+    if any(marker in message for marker in TRANSIENT_MARKERS):
+        return TRANSIENT
+    if isinstance(exc, OSError):
+        return TRANSIENT
+    return PERMANENT
+
+
+class CircuitBreaker:
+    """
+    Pauses every caller when the recent error rate spikes.
+
+    Outcomes of the last `window` calls are tracked. When at least
+    `min_calls` were recorded and the failure ratio reaches `threshold`,
+    the breaker opens and wait() blocks all workers for `cooldown` seconds.
+    Afterwards the window is cleared and calls resume.
+    """
+
+    def __init__(
+        self,
+        window: int = 20,
+        threshold: float = 0.5,
+        min_calls: int = 10,
+        cooldown: float = 30.0,
+    ):
+        self.window = window
+        self.threshold = threshold
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.trips = 0
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return time.monotonic() < self._open_until
+
+    def wait(self):
+        """Block while the breaker is open."""
+        while True:
+            with self._lock:
+                remaining = self._open_until - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(remaining)
+
+    def record(self, success: bool):
+        with self._lock:
+            self._outcomes.append(success)
+            if len(self._outcomes) < self.min_calls:
+                return
+
+            failures = self._outcomes.count(False)
+            if failures / len(self._outcomes) >= self.threshold:
+                self._open_until = time.monotonic() + self.cooldown
+                self._outcomes.clear()
+                self.trips += 1
+                logger.warning(
+                    f"Circuit breaker open: {failures} recent errors, "
+                    f"pausing all workers for {self.cooldown:.0f}s"
+                )
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Retries transient errors with full-jitter exponential backoff.
+
+    Permanent errors are raised immediately. When a circuit breaker is
+    attached, every attempt waits for it to close and reports its outcome.
+    """
+
+    max_attempts: int = 4
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    classify: Callable[[BaseException], str] = classify_error
+    breaker: CircuitBreaker | None = None
+    sleep: Callable[[float], None] = field(default=time.sleep, repr=False)
+
+    def backoff(self, attempt: int) -> float:
+        """Random delay in [0, min(max_delay, base_delay * 2**(attempt-1))]."""
+        cap = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, cap)
+
+    def call(self, fn: Callable, *args, **kwargs):
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.breaker:
+                self.breaker.wait()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                kind = self.classify(e)
+                if self.breaker:
+                    # Only transient errors say something about the service's health
+                    self.breaker.record(kind != TRANSIENT)
+                if kind != TRANSIENT or attempt >= self.max_attempts:
+                    raise
+                delay = self.backoff(attempt)
+                logger.debug(f"Transient error ({e}), retry {attempt} in {delay:.1f}s")
+                self.sleep(delay)
+                continue
+
+            if self.breaker:
+                self.breaker.record(True)
+            return result
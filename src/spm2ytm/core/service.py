@@ -0,0 +1,274 @@
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import closing
+from typing import Callable
+
+from spm2ytm.core.queue import STAGES, Job, JobQueue
+from spm2ytm.errors.custom_errors import LeaseLostError
+
+logger = logging.getLogger(__name__)
+
+# Default number of workers per stage
+DEFAULT_CONCURRENCY = {"extract": 2, "search": 2, "add": 1}
+
+
+def backoff_delay(
+    attempt: int, base: float = 5.0, cap: float = 600.0, jitter: float = 0.25
+) -> float:
+    """
+    Exponential backoff with jitter for the given (1-based) attempt number.
+
+    Args:
+        attempt: Number of attempts made so far
+        base: Delay after the first failed attempt, in seconds
+        cap: Maximum delay in seconds
+        jitter: Fraction of the delay to randomize by (+/-)
+
+    Returns:
+        Delay in seconds before the next attempt
+    """
+    delay = min(cap, base * (2 ** max(attempt - 1, 0)))
+    return delay * random.uniform(1 - jitter, 1 + jitter)
+
+
+class ConversionService:
+    """
+    Long-running service that processes queued conversion jobs.
+
+    Each stage (extract, search, add) has its own pool of worker threads
+    claiming jobs from the shared JobQueue, so a slow browser stage never
+    holds up searching for the next playlist. While running, the service
+    renews the leases of its jobs and requeues jobs whose lease expired.
+
+    Args:
+        shutdown_timeout: Seconds run() waits for jobs in progress when
+            stopping; jobs still running after that are left to be requeued
+            once their lease expires
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        concurrency: dict[str, int] | None = None,
+        spotify_client_factory: Callable | None = None,
+        search_workers: int = 4,
+        search_provider: str = "ytdlp",
+        hedge: bool = False,
+        hedge_provider: str | None = None,
+        executor_kind: str = "thread",
+        resolvers: list | None = None,
+        poll_interval: float = 1.0,
+        shutdown_timeout: float = 30.0,
+    ):
+        self.queue = queue
+        self.concurrency = {**DEFAULT_CONCURRENCY, **(concurrency or {})}
+        self.search_workers = search_workers
+        self.search_provider = search_provider
+        self.hedge = hedge
+        self.hedge_provider = hedge_provider
+        self.executor_kind = executor_kind
+        self.resolvers = resolvers or []
+        self.poll_interval = poll_interval
+        self.shutdown_timeout = shutdown_timeout
+        self._spotify_client_factory = spotify_client_factory
+        self._spotify_client = None
+        self._spotify_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._active: dict[int, Job] = {}  # jobs being processed, by ID
+        self._active_lock = threading.Lock()
+
+        self.handlers: dict[str, Callable[[Job], tuple[str | None, dict]]] = {
+            "extract": self._handle_extract,
+            "search": self._handle_search,
+            "add": self._handle_add,
+        }
+
+    # ------------------------
+    # Stage handlers
+    # ------------------------
+    def _get_spotify_client(self):
+        with self._spotify_lock:
+            if self._spotify_client is None:
+                if self._spotify_client_factory is None:
+                    raise RuntimeError("No Spotify credentials configured")
+                self._spotify_client = self._spotify_client_factory()
+            return self._spotify_client
+
+    def _handle_extract(self, job: Job) -> tuple[str | None, dict]:
+        from spm2ytm.core.extract import (build_playlist_file_path,
+                                          extract_playlist_to_text)
+
+        payload = dict(job.payload)
+        client = self._get_spotify_client()
+
+        output_dir = payload.get("output_path") or os.path.join("data", "playlists")
+        os.makedirs(output_dir, exist_ok=True)
+
+        file_path = build_playlist_file_path(
+            client, payload["playlist_url"], output_dir
+        )
+        extract_playlist_to_text(client, payload["playlist_url"], file_path)
+
+        payload["song_file"] = file_path
+        return "search", payload
+
+    def _handle_search(self, job: Job) -> tuple[str | None, dict]:
+        from spm2ytm.core.create import generate_video_ids_file
+        from spm2ytm.core.hedging import build_search_provider
+
+        payload = dict(job.payload)
+        provider = build_search_provider(
+            self.search_provider, self.hedge, self.hedge_provider
+        )
+        with closing(provider):
+            payload["ids_file"] = generate_video_ids_file(
+                payload["song_file"],
+                max_workers=self.search_workers,
+                provider=provider,
+                executor_kind=self.executor_kind,
+                resolvers=self.resolvers,
+            )
+        next_stage = "add" if payload.get("youtube_playlist_name") else None
+        return next_stage, payload
+
+    def _handle_add(self, job: Job) -> tuple[str | None, dict]:
+        from spm2ytm.core.create import add_videos_to_playlist
+
+        payload = dict(job.payload)
+        add_videos_to_playlist(
+            payload["ids_file"],
+            payload["youtube_playlist_name"],
+            payload.get("cookies_path", "cookies.json"),
+            payload.get("add_mode", "direct"),
+            payload.get("preflight", True),
+            payload.get("force", False),
+        )
+        return None, payload
+
+    # ------------------------
+    # Worker loop
+    # ------------------------
+    def process_one(self, stage: str) -> bool:
+        """
+        Claim and process a single job of a stage.
+
+        Returns:
+            True if a job was processed, False if none was runnable
+        """
+        job = self.queue.claim(stage)
+        if job is None:
+            return False
+
+        with self._active_lock:
+            self._active[job.id] = job
+        try:
+            self._process(stage, job)
+        except LeaseLostError:
+            logger.warning(
+                f"[job {job.id}] ✗ {stage} result dropped: the job was requeued "
+                "while it ran"
+            )
+        finally:
+            with self._active_lock:
+                self._active.pop(job.id, None)
+        return True
+
+    def _process(self, stage: str, job: Job):
+        logger.info(f"[job {job.id}] {stage} (attempt {job.attempts})")
+        try:
+            next_stage, payload = self.handlers[stage](job)
+        except Exception as e:
+            delay = backoff_delay(job.attempts)
+            if self.queue.retry_or_fail(job, str(e), delay):
+                logger.warning(
+                    f"[job {job.id}] ✗ {stage} failed: {e} (retrying in {delay:.0f}s)"
+                )
+            else:
+                logger.error(f"[job {job.id}] ✗ {stage} failed permanently: {e}")
+            return
+
+        self.queue.advance(job, next_stage, payload)
+        if next_stage:
+            logger.info(f"[job {job.id}] ✓ {stage} done → {next_stage}")
+        else:
+            logger.info(f"[job {job.id}] ✓ completed")
+
+    def _worker(self, stage: str):
+        while not self._stop.is_set():
+            if not self.process_one(stage):
+                self._stop.wait(self.poll_interval)
+
+    def _heartbeat(self):
+        # Renew our leases well before they run out, and pick up jobs
+        # abandoned by services that died
+        while not self._stop.wait(self.queue.lease / 3):
+            with self._active_lock:
+                active = list(self._active.values())
+            self.queue.heartbeat(active)
+            requeued = self.queue.requeue_expired()
+            if requeued:
+                logger.warning(f"Requeued {requeued} job(s) whose lease expired")
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self, drain: bool = False) -> bool:
+        """
+        Start all stage worker pools and block until stopped.
+
+        Args:
+            drain: Exit once no jobs are queued or running anymore
+
+        Returns:
+            True if every worker finished; False if some were still running
+            jobs after shutdown_timeout, in which case the queue must stay
+            open for them
+        """
+        requeued = self.queue.requeue_expired()
+        if requeued:
+            logger.info(f"Requeued {requeued} job(s) left running by a stopped service")
+
+        heartbeat = threading.Thread(
+            target=self._heartbeat, name="heartbeat", daemon=True
+        )
+        heartbeat.start()
+        threads = []
+        for stage in STAGES:
+            for n in range(self.concurrency.get(stage, 1)):
+                t = threading.Thread(
+                    target=self._worker,
+                    args=(stage,),
+                    name=f"{stage}-{n}",
+                    daemon=True,
+                )
+                t.start()
+                threads.append(t)
+
+        logger.info(
+            "Service started with workers: "
+            + ", ".join(f"{s}={self.concurrency.get(s, 1)}" for s in STAGES)
+        )
+
+        try:
+            while not self._stop.is_set():
+                if drain and not self.queue.has_pending():
+                    break
+                time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            logger.info("Stopping service...")
+        finally:
+            self.stop()
+            deadline = time.monotonic() + self.shutdown_timeout
+            for t in threads:
+                t.join(max(0.0, deadline - time.monotonic()))
+            with self._active_lock:
+                unfinished = len(self._active)
+            if unfinished:
+                logger.warning(
+                    f"Stopped with {unfinished} job(s) still running; they are "
+                    "requeued once their lease expires"
+                )
+        return not any(t.is_alive() for t in threads)
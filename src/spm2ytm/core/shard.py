@@ -0,0 +1,202 @@
+import hashlib
+import heapq
+import json
+import logging
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from spm2ytm.core.pipeline import iter_songs
+
+logger = logging.getLogger(__name__)
+
+SHARD_FORMAT = "spm2ytm-shard"
+
+
+@dataclass(frozen=True)
+class ShardInfo:
+    """Header of a '.idx' sidecar, tying a shard back to its source file."""
+
+    name: str  # stem of the source song file
+    shard: int  # 1-based
+    shards: int
+    total: int  # songs in the source file
+    source: str  # fingerprint of the source file's songs
+
+    def header(self) -> str:
+        return "# " + json.dumps({"format": SHARD_FORMAT, **self.__dict__})
+
+    @classmethod
+    def parse(cls, line: str) -> "ShardInfo":
+        try:
+            data = json.loads(line.removeprefix("#").strip())
+        except ValueError:
+            data = {}
+        if data.pop("format", None) != SHARD_FORMAT:
+            raise ValueError("Not a shard index file (missing header)")
+        return cls(**data)
+
+
+def shard_of(song: str, shards: int) -> int:
+    """Stable 1-based shard for a song, the same on every machine and run."""
+    digest = hashlib.blake2b(song.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shards + 1
+
+
+def shard_path(song_path: Path, shard: int, shards: int, output_dir: Path) -> Path:
+    digits = max(2, len(str(shards)))
+    return output_dir / (
+        f"{song_path.stem}.shard-{shard:0{digits}d}-of-{shards:0{digits}d}.txt"
+    )
+
+
+def shard_song_file(
+    song_file_path: str, shards: int, output_dir: str | None = None
+) -> list[str]:
+    """
+    Split a song file into hash-partitioned shards for searching on several hosts.
+
+    Each shard 'X.shard-KK-of-NN.txt' gets a sidecar 'X.shard-KK-of-NN.idx'
+    holding, for every line of the shard, its index among the non-empty
+    lines of the source file. Run the search stage on each shard (its output
+    is 'X.shard-KK-of-NN-ID.txt') and reassemble with merge_shard_ids.
+
+    Args:
+        song_file_path: Path to the song file
+        shards: Number of shards
+        output_dir: Where to write the shards (default: next to the song file)
+
+    Returns:
+        Paths of the shard song files, in shard order
+    """
+    if shards < 1:
+        raise ValueError("Number of shards must be at least 1")
+
+    song_path = Path(song_file_path)
+    out_dir = Path(output_dir) if output_dir else song_path.parent
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # First pass fingerprints the source so merge can tell shard sets apart
+    fingerprint = hashlib.sha1()
+    total = 0
+    for song in iter_songs(song_path):
+        fingerprint.update(song.encode("utf-8") + b"\n")
+        total += 1
+
+    paths = [shard_path(song_path, k, shards, out_dir) for k in range(1, shards + 1)]
+    with ExitStack() as stack:
+        song_files, idx_files = [], []
+        for k, path in enumerate(paths, 1):
+            song_files.append(stack.enter_context(open(path, "w", encoding="utf-8")))
+            idx_file = stack.enter_context(
+                open(path.with_suffix(".idx"), "w", encoding="utf-8")
+            )
+            info = ShardInfo(
+                song_path.stem, k, shards, total, fingerprint.hexdigest()[:16]
+            )
+            idx_file.write(info.header() + "\n")
+            idx_files.append(idx_file)
+
+        for idx, song in enumerate(iter_songs(song_path)):
+            k = shard_of(song, shards) - 1
+            song_files[k].write(song + "\n")
+            idx_files[k].write(f"{idx}\n")
+
+    logger.info(f"Split {total} songs from {song_path.name} into {shards} shards")
+    return [str(path) for path in paths]
+
+
+def _sidecar_for(ids_file: Path) -> Path:
+    """'X.shard-01-of-04-ID.txt' → 'X.shard-01-of-04.idx'"""
+    stem = ids_file.stem.removesuffix("-ID")
+    return ids_file.with_name(f"{stem}.idx")
+
+
+def _read_shard(ids_file: Path) -> tuple[ShardInfo, list[int], list[str]]:
+    idx_path = _sidecar_for(ids_file)
+    if not idx_path.exists():
+        raise FileNotFoundError(f"Shard index not found: {idx_path}")
+
+    with open(idx_path, "r", encoding="utf-8") as f:
+        info = ShardInfo.parse(f.readline())
+        indices = [int(line) for line in f if line.strip()]
+    with open(ids_file, "r", encoding="utf-8") as f:
+        content = f.read()
+    # '-ID.txt' files have one line per song and no trailing newline
+    video_ids = content.split("\n") if indices else []
+
+    if len(video_ids) != len(indices):
+        raise ValueError(
+            f"{ids_file.name} has {len(video_ids)} lines but its shard holds "
+            f"{len(indices)} songs"
+        )
+    return info, indices, video_ids
+
+
+def merge_shard_ids(ids_files: list[str], output_path: str | None = None) -> str:
+    """
+    Reassemble per-shard '-ID.txt' files into one '-ID.txt' in source order.
+
+    Every shard of the same split must be present exactly once; shards from
+    a different split of the file (other shard count or contents) are
+    rejected.
+
+    Args:
+        ids_files: The shards' '-ID.txt' files, in any order
+        output_path: Default: '<source name>-ID.txt' next to the first shard
+
+    Returns:
+        Path to the merged video IDs file
+    """
+    if not ids_files:
+        raise ValueError("No shard files given")
+
+    shards: dict[int, tuple[Path, list[int], list[str]]] = {}
+    first: ShardInfo | None = None
+    for ids_file in map(Path, ids_files):
+        info, indices, video_ids = _read_shard(ids_file)
+        first = first or info
+        split = (info.shards, info.total, info.source)
+        if split != (first.shards, first.total, first.source):
+            raise ValueError(
+                f"{ids_file.name} belongs to a different split of "
+                f"{info.name} than {ids_files[0]}"
+            )
+        if info.shard in shards:
+            raise ValueError(
+                f"Duplicate shard {info.shard}: {shards[info.shard][0].name} "
+                f"and {ids_file.name}"
+            )
+        shards[info.shard] = (ids_file, indices, video_ids)
+
+    missing = sorted(set(range(1, first.shards + 1)) - set(shards))
+    if missing:
+        raise ValueError(
+            f"Missing shard(s) {', '.join(map(str, missing))} of {first.shards}"
+        )
+
+    songs = sum(len(indices) for _, indices, _ in shards.values())
+    if songs != first.total:
+        raise ValueError(f"Shards hold {songs} songs, expected {first.total}")
+
+    if output_path is None:
+        output_path = str(Path(ids_files[0]).with_name(f"{first.name}-ID.txt"))
+
+    # Each shard is already in source order, so a k-way merge restores it
+    merged: Iterator[tuple[int, str]] = heapq.merge(
+        *(zip(indices, video_ids) for _, indices, video_ids in shards.values())
+    )
+    found = 0
+    with open(output_path, "w", encoding="utf-8") as out:
+        for expected, (idx, video_id) in enumerate(merged):
+            if idx != expected:
+                raise ValueError(f"Shard indices are corrupt near song {expected}")
+            out.write(("\n" if idx else "") + video_id)
+            found += bool(video_id)
+
+    logger.info(
+        f"Merged {first.shards} shards: {found}/{first.total} videos found "
+        f"→ {output_path}"
+    )
+    return output_path
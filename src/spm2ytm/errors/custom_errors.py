@@ -0,0 +1,14 @@
+class SpotifyAuthError(Exception):
+    """Raised when no usable Spotify token exists and we cannot prompt for one."""
+
+
+class PlaylistEditError(Exception):
+    """Raised when YouTube rejects a direct playlist edit request."""
+
+    def __init__(self, message: str, status: int | None = None):
+        super().__init__(message)
+        self.status = status
+
+
+class LeaseLostError(Exception):
+    """Raised when a job was requeued or claimed elsewhere while it ran."""
@@ -0,0 +1,127 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+# Pass as `extra=` on messages logged once per song or video, so they can be
+# rate-limited without touching run-level messages:
+#     logger.warning(f"No video found for: {song}", extra=PER_ITEM)
+PER_ITEM = {"per_item": True}
+
+_handler: logging.Handler | None = None
+_listener: QueueListener | None = None
+_limiter: "ItemRateLimiter | None" = None
+
+
+class ItemRateLimiter(logging.Filter):
+    """
+    Token bucket for per-item DEBUG and INFO records; all other records,
+    including per-item warnings and errors, pass through.
+
+    Up to `burst` per-item messages are let through at once, then `rate` per
+    second. Dropped messages are counted and the count is appended to the
+    next message that gets through.
+    """
+
+    def __init__(self, rate: float = 20.0, burst: int = 50, clock=time.monotonic):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.suppressed = 0
+        self.total_suppressed = 0
+        self._tokens = float(burst)
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not getattr(record, "per_item", False):
+            return True
+
+        with self._lock:
+            now = self.clock()
+            refill = (now - self._last) * self.rate
+            self._tokens = min(self.burst, self._tokens + refill)
+            self._last = now
+            if self._tokens < 1:
+                self.suppressed += 1
+                self.total_suppressed += 1
+                return False
+            self._tokens -= 1
+            suppressed, self.suppressed = self.suppressed, 0
+
+        if suppressed:
+            record.msg = f"{record.getMessage()} (+{suppressed} similar suppressed)"
+            record.args = None
+        return True
+
+
+def setup_logging(
+    level: int = logging.INFO,
+    quiet: bool = False,
+    background: bool = True,
+    item_rate: float | None = 20.0,
+    item_burst: int = 50,
+    stream=None,
+):
+    """
+    Configure the root logger once for the whole application.
+
+    Library modules only create their own loggers; entry points call this.
+    Records are handed to a queue and written to the terminal by a
+    background thread, so worker threads never block on console I/O.
+
+    Args:
+        level: Root log level
+        quiet: High-throughput mode; only warnings and errors are shown
+        background: Write logs from a background thread (False writes inline)
+        item_rate: Per-item messages (see PER_ITEM) allowed per second,
+            or None to disable rate limiting
+        item_burst: Per-item messages allowed in a burst
+        stream: Where to write (default: stderr)
+    """
+    global _handler, _listener, _limiter
+
+    stop_logging()
+
+    console = logging.StreamHandler(stream)  # Print logs to terminal
+    console.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    if background:
+        log_queue = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, console)
+        _listener.start()
+        _handler = QueueHandler(log_queue)
+    else:
+        _handler = console
+
+    _limiter = ItemRateLimiter(item_rate, item_burst) if item_rate else None
+    if _limiter:
+        # Filter before enqueueing so dropped records cost almost nothing
+        _handler.addFilter(_limiter)
+
+    root = logging.getLogger()
+    root.setLevel(max(level, logging.WARNING) if quiet else level)
+    root.addHandler(_handler)
+
+
+def stop_logging():
+    """Flush queued records and detach the handlers installed by setup_logging."""
+    global _handler, _listener, _limiter
+
+    if _limiter is not None and _limiter.total_suppressed:
+        logging.getLogger(__name__).warning(
+            f"{_limiter.total_suppressed} per-item log messages were suppressed"
+        )
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+    if _listener is not None:
+        _listener.stop()  # Drains the queue before returning
+    _handler = _listener = _limiter = None
+
+
+atexit.register(stop_logging)
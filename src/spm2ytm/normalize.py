@@ -0,0 +1,171 @@
+"""
+Batch normalization of track text.
+
+Every line gets two forms:
+    display: readable line for song files and queries. Letters and digits
+        of any script are kept with their accents, punctuation becomes
+        spaces, apostrophes are dropped ("Don't" → "Dont") and runs of
+        whitespace collapse to one space.
+    key: lowercase search/match key. Latin accents are stripped, Cyrillic
+        and Greek are transliterated, and scripts without a romanization
+        here (CJK, Arabic, ...) are kept rather than deleted.
+
+A batch is joined into one string per pass, so the per-character work
+runs in C: ASCII rows (the bulk of most catalogs) take str.translate's
+ASCII fast path and str.lower, and the other rows go through translation
+tables that learn each distinct character's mapping once.
+"""
+
+import unicodedata
+from itertools import compress, filterfalse
+from typing import Callable, Iterable, NamedTuple
+
+APOSTROPHES = "'’ʼ`´"
+ROW_SEPARATOR = "\n"
+
+# Letters NFKD does not reduce to ASCII
+LATIN_EXTRA = {
+    "ß": "ss",
+    "æ": "ae",
+    "ø": "o",
+    "œ": "oe",
+    "ł": "l",
+    "đ": "d",
+    "ð": "d",
+    "þ": "th",
+    "ı": "i",
+    "ħ": "h",
+    "ŋ": "ng",
+}
+CYRILLIC = dict(
+    zip(
+        "абвгдеёжзийклмнопрстуфхцчшщъыьэюяіїєґў",
+        "a b v g d e e zh z i y k l m n o p r s t u f kh ts ch sh shch - y - e yu ya "
+        "i yi ye g u".split(),
+    )
+)
+GREEK = dict(
+    zip(
+        "αβγδεζηθικλμνξοπρσςτυφχψω",
+        "a v g d e z i th i k l m n x o p r s s t y f ch ps o".split(),
+    )
+)
+TRANSLITERATIONS = {
+    char: "" if latin == "-" else latin
+    for table in (LATIN_EXTRA, CYRILLIC, GREEK)
+    for char, latin in table.items()
+}
+
+
+class NormalizedBatch(NamedTuple):
+    """Normalized forms of a track list, as parallel columns."""
+
+    display: list[str]
+    keys: list[str]
+
+
+def _display_char(char: str) -> str:
+    if char == ROW_SEPARATOR:
+        return char
+    if char in APOSTROPHES:
+        return ""
+    # Letters, numbers and the combining marks that belong to them
+    if char == "_" or unicodedata.category(char)[0] not in "LNM":
+        return " "
+    return char
+
+
+def _key_char(char: str) -> str:
+    """Key for one character of display text (a letter, digit or mark)."""
+    if char in (" ", ROW_SEPARATOR):
+        return char
+    if unicodedata.combining(char):
+        # Stray Latin/Greek/Cyrillic accents go; other scripts need theirs
+        return "" if "\u0300" <= char <= "\u036f" else char
+    lower = char.lower()
+    if lower in TRANSLITERATIONS:
+        return TRANSLITERATIONS[lower]
+    if unicodedata.category(char) == "Nd":
+        return str(unicodedata.digit(char))
+
+    # é → e, ά → α → a; other scripts keep their letters and marks
+    base = "".join(
+        c for c in unicodedata.normalize("NFD", lower) if not unicodedata.combining(c)
+    )
+    if base.isascii():
+        return base
+    if base in TRANSLITERATIONS:
+        return TRANSLITERATIONS[base]
+    return lower
+
+
+# codepoint -> replacement; ASCII is filled in up front, other characters
+# the first time a batch contains them
+DISPLAY_TABLE = {code: _display_char(chr(code)) for code in range(128)}
+KEY_TABLE = {code: _key_char(chr(code)) for code in range(128)}
+
+
+def _learn(table: dict, fold: Callable[[str], str], text: str):
+    for char in set(text):
+        if ord(char) not in table:
+            table[ord(char)] = fold(char)
+
+
+def _display_rows(rows: list[str], is_ascii: bool) -> list[str]:
+    blob = ROW_SEPARATOR.join(rows)
+    # Rows must not contain the separator
+    if blob.count(ROW_SEPARATOR) != len(rows) - 1:
+        blob = ROW_SEPARATOR.join(row.replace(ROW_SEPARATOR, " ") for row in rows)
+    if not is_ascii:
+        # Compose decomposed accents (e.g. from macOS file names) and fold
+        # compatibility forms such as fullwidth letters and ligatures
+        blob = unicodedata.normalize("NFKC", blob)
+        _learn(DISPLAY_TABLE, _display_char, blob)
+    blob = blob.translate(DISPLAY_TABLE)
+    return [" ".join(row.split()) for row in blob.split(ROW_SEPARATOR)]
+
+
+def _key_rows(display_rows: list[str], is_ascii: bool) -> list[str]:
+    blob = ROW_SEPARATOR.join(display_rows)
+    if is_ascii:
+        return blob.lower().split(ROW_SEPARATOR)
+    _learn(KEY_TABLE, _key_char, blob)
+    return blob.translate(KEY_TABLE).split(ROW_SEPARATOR)
+
+
+def _normalize(rows: list[str], is_ascii: bool) -> NormalizedBatch:
+    if not rows:
+        return NormalizedBatch([], [])
+    display = _display_rows(rows, is_ascii)
+    return NormalizedBatch(display, _key_rows(display, is_ascii))
+
+
+def normalize_batch(texts: Iterable[str]) -> NormalizedBatch:
+    """
+    Display form and search key for every line of a track list.
+
+    ASCII and non-ASCII rows are processed as two batches and merged back
+    in input order.
+    """
+    rows = list(texts)
+    is_ascii = list(map(str.isascii, rows))
+    if all(is_ascii):
+        return _normalize(rows, True)
+
+    plain = _normalize(list(compress(rows, is_ascii)), True)
+    other = _normalize(list(filterfalse(str.isascii, rows)), False)
+    merged = []
+    for plain_column, other_column in zip(plain, other):
+        plain_it, other_it = iter(plain_column), iter(other_column)
+        merged.append([next(plain_it) if a else next(other_it) for a in is_ascii])
+    return NormalizedBatch(*merged)
+
+
+def display_form(text: str) -> str:
+    """Readable line: punctuation to spaces, letters of any script kept."""
+    return normalize_batch([text]).display[0]
+
+
+def search_key(text: str) -> str:
+    """Lowercase, transliterated key for searching and matching."""
+    return normalize_batch([text]).keys[0]
@@ -0,0 +1,229 @@
+"""
+Run tracing in Chrome's trace-event format, and cProfile reports.
+
+Spans are recorded only while a trace is active (see start_tracing); the
+rest of the time span() is a no-op. The trace lists stages and items as
+complete ("X") events on the lane of the thread that ran them, plus a
+"queued" async span for work that waited in an executor. Open the file in
+chrome://tracing or https://ui.perfetto.dev.
+
+    with tracing.span("search", "item", song=song):
+        ...
+"""
+
+import atexit
+import cProfile
+import io
+import itertools
+import json
+import os
+import pstats
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+DEFAULT_LOG_DIR = os.path.join("data", "logs")
+
+_tracer: "Tracer | None" = None
+
+
+def now() -> int:
+    """Timestamp in the tracer's clock (nanoseconds)."""
+    return time.perf_counter_ns()
+
+
+class Tracer:
+    """Collects trace events in memory; write() saves them as JSON."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.pid = os.getpid()
+        self.origin = now()
+        self.events: list[dict] = []
+        self._threads: dict[int, str] = {}
+        self._ids = itertools.count(1)
+
+    def _us(self, ns: int) -> float:
+        return (ns - self.origin) / 1000
+
+    def _tid(self) -> int:
+        thread = threading.current_thread()
+        tid = thread.ident or 0
+        if tid not in self._threads:
+            self._threads[tid] = thread.name
+        return tid
+
+    def complete(self, name: str, cat: str, start: int, end: int, args: dict):
+        # list.append is atomic, so worker threads need no lock
+        self.events.append(
+            {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": self._us(start),
+                "dur": (end - start) / 1000,
+                "pid": self.pid,
+                "tid": self._tid(),
+                "args": args,
+            }
+        )
+
+    def async_span(self, name: str, cat: str, start: int, end: int, args: dict):
+        span_id = next(self._ids)
+        tid = self._tid()
+        for phase, ts, extra in (("b", start, args), ("e", end, {})):
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": cat,
+                    "ph": phase,
+                    "id": span_id,
+                    "ts": self._us(ts),
+                    "pid": self.pid,
+                    "tid": tid,
+                    "args": extra,
+                }
+            )
+
+    def write(self) -> str:
+        # Name the process and each thread's lane
+        metadata = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": self.pid,
+                "args": {"name": "spm2ytm"},
+            }
+        ]
+        metadata += [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self.pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in list(self._threads.items())
+        ]
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"traceEvents": metadata + self.events, "displayTimeUnit": "ms"},
+                f,
+                separators=(",", ":"),
+            )
+        return self.path
+
+
+def _timestamped(prefix: str, suffix: str) -> str:
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(DEFAULT_LOG_DIR, f"{prefix}-{stamp}{suffix}")
+
+
+def start_tracing(path: str | None = None) -> str:
+    """
+    Start recording spans; `path` defaults to data/logs/trace-<time>.json.
+
+    Returns:
+        The path the trace will be written to by stop_tracing()
+    """
+    global _tracer
+    _tracer = Tracer(path or _timestamped("trace", ".json"))
+    return _tracer.path
+
+
+def stop_tracing() -> str | None:
+    """Write the trace and stop recording; returns its path if one was active."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer.write() if tracer is not None else None
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+@contextmanager
+def span(name: str, cat: str = "stage", **args):
+    """Record the enclosed block as a span on the current thread's lane."""
+    tracer = _tracer
+    if tracer is None:
+        yield
+        return
+    start = now()
+    try:
+        yield
+    finally:
+        tracer.complete(name, cat, start, now(), args)
+
+
+def record(name: str, cat: str, start: int, end: int | None = None, **args):
+    """Record a span that has already happened (timestamps from now())."""
+    tracer = _tracer
+    if tracer is not None:
+        tracer.complete(name, cat, start, now() if end is None else end, args)
+
+
+class _QueueTracedExecutor:
+    """Executor proxy recording how long each submission waited for a worker."""
+
+    def __init__(self, executor: Executor, name: str):
+        self._executor = executor
+        self._name = name
+
+    def submit(self, fn, *args, **kwargs):
+        submitted = now()
+
+        def run():
+            tracer = _tracer
+            if tracer is not None:
+                tracer.async_span(self._name, "queue", submitted, now(), {})
+            return fn(*args, **kwargs)
+
+        return self._executor.submit(run)
+
+    def __getattr__(self, name):
+        return getattr(self._executor, name)
+
+
+def trace_queue(executor: Executor, name: str = "queued") -> Executor:
+    """
+    Wrap a thread pool so queueing delays show up in the trace.
+
+    Process pools and untraced runs get the executor back unchanged (the
+    wrapper could not be pickled to another process).
+    """
+    if _tracer is None or not isinstance(executor, ThreadPoolExecutor):
+        return executor
+    return _QueueTracedExecutor(executor, name)
+
+
+def write_profile(
+    profiler: cProfile.Profile, path: str | None = None, limit: int = 60
+) -> str:
+    """
+    Save a profile as a text report (top functions by cumulative and own
+    time) next to the raw .prof file, for snakeviz or pstats.
+
+    Returns:
+        Path of the text report (default data/logs/profile-<time>.txt)
+    """
+    path = path or _timestamped("profile", ".txt")
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    raw_path = str(Path(path).with_suffix(".prof"))
+    profiler.dump_stats(raw_path)
+
+    report = io.StringIO()
+    stats = pstats.Stats(profiler, stream=report).strip_dirs()
+    for order in ("cumulative", "tottime"):
+        report.write(f"=== Sorted by {order} ===\n")
+        stats.sort_stats(order).print_stats(limit)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"# cProfile of all threads; raw data: {raw_path}\n")
+        f.write(report.getvalue())
+    return path
+
+
+atexit.register(stop_tracing)
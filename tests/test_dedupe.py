@@ -0,0 +1,137 @@
+import random
+import time
+
+from click.testing import CliRunner
+
+from spm2ytm.cli.main import cli
+from spm2ytm.core.dedupe import dedupe_file, find_duplicates, normalize_key
+from spm2ytm.normalize import normalize_batch
+
+
+def test_normalize_key_ignores_labels_years_and_order():
+    assert normalize_key("Wonderwall - Remastered 2014  Oasis") == normalize_key(
+        "Oasis Wonderwall"
+    )
+    assert normalize_key("Song (feat. Someone) Artist") != normalize_key("Song Artist")
+    # Label words are only labels in brackets or a " - " suffix
+    assert normalize_key("Radio Ga Ga  Queen") != normalize_key("Ga Ga  Queen")
+    assert normalize_key("Clean  Taylor Swift") != normalize_key("Taylor Swift")
+    assert normalize_key("1999  Prince") != normalize_key("Prince")
+
+
+def test_find_duplicates_keeps_numbered_songs_apart():
+    lines = [
+        "Nocturne Op 9 No 1  Chopin",
+        "Nocturne Op 9 No 2  Chopin",
+        "Another Brick In The Wall Part I  Pink Floyd",
+        "Another Brick In The Wall Part II  Pink Floyd",
+        "Another Brick in the Wall, Pt. II  Pink Floyd",
+        "Radio Ga Ga  Queen",
+        "Ga Ga  Queen",
+    ]
+    result = find_duplicates(lines)
+
+    assert result.clusters == [
+        [
+            "Another Brick In The Wall Part II  Pink Floyd",
+            "Another Brick in the Wall, Pt. II  Pink Floyd",
+        ]
+    ]
+
+
+def test_find_duplicates_groups_exact_and_near():
+    lines = [
+        "Wonderwall  Oasis",
+        "Bohemian Rhapsody  Queen",
+        "Wonderwall - Remastered 2014  Oasis",
+        "wonderwall oasis",
+        "Bohemian Rhapsody - 2011 Mix  Queen",
+        "Don't Stop Me Now  Queen",
+        "Dont Stop Me Now Queen",
+        "Love Song  Adele",
+        "Love Song  The Cure Robert Smith",
+        "",
+    ]
+    result = find_duplicates(lines)
+
+    assert result.unique == [
+        "Wonderwall  Oasis",
+        "Bohemian Rhapsody  Queen",
+        "Don't Stop Me Now  Queen",
+        "Love Song  Adele",
+        "Love Song  The Cure Robert Smith",
+    ]
+    assert result.exact_removed == 3
+    assert result.near_removed == 1
+    assert result.clusters == [
+        [
+            "Wonderwall  Oasis",
+            "Wonderwall - Remastered 2014  Oasis",
+            "wonderwall oasis",
+        ],
+        ["Bohemian Rhapsody  Queen", "Bohemian Rhapsody - 2011 Mix  Queen"],
+        ["Don't Stop Me Now  Queen", "Dont Stop Me Now Queen"],
+    ]
+
+    exact = find_duplicates(lines, near=False)
+    assert len(exact.unique) == 6
+
+
+def test_find_duplicates_on_extracted_lines():
+    # Song files are written flattened: no brackets, " - " or artist column
+    lines = normalize_batch(
+        [
+            "Yesterday - Remastered 2009 The Beatles",
+            "Yesterday The Beatles",
+            "Halo (Radio Edit) Beyonce",
+            "Halo Beyonce",
+            "Bohemian Rhapsody - 2011 Remaster Queen",
+            "Bohemian Rhapsody Queen",
+            "Radio Ga Ga Queen",
+            "1999 Prince",
+            "1999 Remastered 2019 Prince",
+            "Clean Taylor Swift",
+        ]
+    ).display
+    assert "(" not in "".join(lines) and " - " not in "".join(lines)
+
+    result = find_duplicates(lines)
+
+    assert result.clusters == [
+        ["Yesterday Remastered 2009 The Beatles", "Yesterday The Beatles"],
+        ["Halo Radio Edit Beyonce", "Halo Beyonce"],
+        ["Bohemian Rhapsody 2011 Remaster Queen", "Bohemian Rhapsody Queen"],
+        ["1999 Prince", "1999 Remastered 2019 Prince"],
+    ]
+    assert len(result.unique) == 6
+
+
+def test_find_duplicates_scales_near_linearly():
+    rng = random.Random(0)
+    words = [f"w{n}" for n in range(5000)]
+    lines = [" ".join(rng.sample(words, 5)) for _ in range(20000)]
+    lines += lines[:1000]
+
+    start = time.perf_counter()
+    result = find_duplicates(lines)
+    elapsed = time.perf_counter() - start
+
+    assert len(result.unique) == 20000
+    assert result.exact_removed == 1000
+    assert elapsed < 10
+
+
+def test_dedupe_file_and_command(tmp_path):
+    song_file = tmp_path / "songs.txt"
+    song_file.write_text("A Song  Band\nA Song (Remastered)  Band\nOther  Band\n")
+
+    output, result = dedupe_file(str(song_file))
+    assert output == str(tmp_path / "songs-unique.txt")
+    assert (tmp_path / "songs-unique.txt").read_text() == "A Song  Band\nOther  Band"
+    assert "A Song (Remastered)  Band" in (tmp_path / "songs-duplicates.txt").read_text()
+
+    out = tmp_path / "out.txt"
+    runner = CliRunner()
+    res = runner.invoke(cli, ["dedupe", str(song_file), "--output", str(out)])
+    assert res.exit_code == 0, res.output
+    assert out.read_text() == "A Song  Band\nOther  Band"
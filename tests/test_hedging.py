@@ -0,0 +1,106 @@
+import re
+import threading
+
+import pytest
+
+from spm2ytm.clients.search_providers import FakeSearchProvider, SearchHit
+from spm2ytm.core.hedging import HedgedSearchProvider, build_search_provider
+
+
+class StuckOnceProvider(FakeSearchProvider):
+    """Hangs on the first search for a query, answers quickly afterwards."""
+
+    def __init__(self, results, stuck_for=1.0):
+        super().__init__(results)
+        self.stuck_for = stuck_for
+        self._seen = set()
+        self._seen_lock = threading.Lock()
+
+    def search(self, query):
+        with self._seen_lock:
+            first = query not in self._seen
+            self._seen.add(query)
+        if first and query.startswith("slow"):
+            threading.Event().wait(self.stuck_for)
+        return super().search(query)
+
+
+def test_slow_search_is_hedged_and_fast_answer_wins():
+    results = {f"song{i}": f"id{i}" for i in range(20)}
+    primary = StuckOnceProvider({**results, "slow": "id_slow"})
+    hedged = HedgedSearchProvider(
+        primary, budget=0.5, min_samples=5, initial_delay=0.05
+    )
+
+    for i in range(20):
+        assert hedged.search(f"song{i}").video_id == f"id{i}"
+    assert hedged.hedges == 0
+
+    hit = hedged.search("slow")
+    assert hit.video_id == "id_slow"
+    assert hedged.hedges == 1 and hedged.hedge_wins == 1
+    assert hedged.latencies[-1] < 0.5
+    assert "1/21 requests hedged (1 won)" in hedged.summary()
+    hedged.close()
+
+
+def test_hedge_goes_through_secondary_provider():
+    primary = StuckOnceProvider({"slow": "id_primary"}, stuck_for=1.0)
+    secondary = FakeSearchProvider({"slow": SearchHit("id_secondary")})
+    hedged = HedgedSearchProvider(
+        primary, secondary, budget=1.0, min_samples=100, initial_delay=0.05
+    )
+
+    assert hedged.search("slow").video_id == "id_secondary"
+    assert secondary.calls == ["slow"]
+    hedged.close()
+
+
+def test_summary_counts_primaries_still_running_and_close_reaches_providers():
+    primary = StuckOnceProvider({"slow": "id_primary"}, stuck_for=1.0)
+    secondary = FakeSearchProvider({"slow": "id_secondary"})
+    closed = []
+    secondary.close = lambda: closed.append("secondary")
+    hedged = HedgedSearchProvider(
+        primary, secondary, budget=1.0, min_samples=100, initial_delay=0.2
+    )
+
+    hedged.search("slow")
+    assert hedged.primary_latencies == []  # the primary is still stuck
+
+    before = float(re.search(r"p99 ([\d.]+)s →", hedged.summary()).group(1))
+    assert before >= 0.2
+    hedged.close()
+    assert closed == ["secondary"]
+
+
+def test_budget_caps_hedges():
+    primary = FakeSearchProvider({"q": "id"}, latency=0.05)
+    hedged = HedgedSearchProvider(
+        primary, budget=0.1, min_samples=1000, initial_delay=0.01
+    )
+
+    for _ in range(20):
+        hedged.search("q")
+
+    assert hedged.hedges <= 2
+    hedged.close()
+
+
+def test_errors_surface_when_every_attempt_fails():
+    primary = FakeSearchProvider({"q": TimeoutError("down")}, latency=0.05)
+    hedged = HedgedSearchProvider(
+        primary, budget=1.0, min_samples=1000, initial_delay=0.01
+    )
+
+    with pytest.raises(TimeoutError):
+        hedged.search("q")
+    hedged.close()
+
+
+def test_build_search_provider():
+    assert build_search_provider("ytdlp").name == "ytdlp"
+    hedged = build_search_provider("ytdlp", hedge=True, hedge_provider="ytmusic")
+    assert isinstance(hedged, HedgedSearchProvider)
+    assert hedged.secondary.name == "ytmusic"
+    hedged.close()
@@ -0,0 +1,141 @@
+import os
+import threading
+
+from spm2ytm.clients.search_providers import FakeSearchProvider, SearchHit
+from spm2ytm.core.create import generate_video_ids_file
+from spm2ytm.core.history import HistoryIndex
+
+
+def _write_pair(directory, name, songs, ids):
+    (directory / f"{name}.txt").write_text("\n".join(songs) + "\n")
+    (directory / f"{name}-ID.txt").write_text("\n".join(ids))
+
+
+def test_search_tolerates_order_labels_and_spelling():
+    index = HistoryIndex()
+    index.add("Wonderwall  Oasis", "vidWonderwa")
+    index.add("Don't Stop Me Now  Queen", "vidDontStop")
+    index.add("Love Song  Adele", "vidLoveSong")
+
+    assert index.search("Oasis - Wonderwall (Remastered 2014)")[0].score == 1.0
+    assert index.lookup("Dont Stop Me Now - 2011 Mix  Queen") == "vidDontStop"
+    fuzzy = index.search("Dont Stop Me Nw  Queen")[0]
+    assert fuzzy.video_id == "vidDontStop" and 0.7 < fuzzy.score < 1.0
+
+    # Shared words are not enough for a confident answer
+    assert index.search("Love Song  Sara Bareilles")[0].score < 0.5
+    assert index.lookup("Love Song  Sara Bareilles") is None
+    assert index.search("Completely Different  Band") == []
+
+
+def test_lookup_ignores_featured_artists_and_typos():
+    index = HistoryIndex()
+    index.add("Song Artist", "vidSong0001")
+    index.add("Bohemian Rhapsody  Queen", "vidBohemian")
+    index.add("Perfect  Ed Sheeran", "vidPerfect1")
+
+    assert index.lookup("Artist Song feat X") == "vidSong0001"
+    assert index.lookup("Song feat Stormzy Artist") == "vidSong0001"
+    assert index.lookup("Bohemian Rapsody Queen") == "vidBohemian"
+    assert index.lookup("Perfect Ed Sheeren") == "vidPerfect1"
+    # An extra word that is not a credit still needs a search
+    assert index.lookup("Song Artist Remix") is None
+
+
+def test_open_indexes_playlist_pairs_incrementally(tmp_path):
+    playlists = tmp_path / "playlists"
+    playlists.mkdir()
+    cache = str(tmp_path / "history.json.gz")
+    _write_pair(playlists, "mix", ["Song A  Artist", "Song B  Artist"], ["vidA", ""])
+    (playlists / "orphan.txt").write_text("Song C  Artist\n")
+
+    index = HistoryIndex.open(cache, str(playlists))
+    assert len(index) == 1 and index.lookup("song a artist") == "vidA"
+    assert os.path.exists(cache)
+
+    # Unchanged files are not reread on the next run
+    index = HistoryIndex.open(cache, str(playlists))
+    assert len(index) == 1
+    assert index.refresh(str(playlists)) == 0
+
+    songs = ["Song A  Artist", "Song B  Artist"]
+    _write_pair(playlists, "mix", songs, ["vidA", "vidB"])
+    _write_pair(playlists, "other", ["Song D  Artist"], ["vidD"])
+    assert index.refresh(str(playlists)) == 2
+    assert index.lookup("Artist - Song B") == "vidB"
+    assert index.lookup("Song D  Artist") == "vidD"
+
+
+def test_history_answers_search_stage_and_learns(tmp_path):
+    index = HistoryIndex(path=str(tmp_path / "history.json.gz"))
+    index.add("Halo  Beyonce", "vidHalo0001")
+
+    songs = tmp_path / "songs.txt"
+    songs.write_text("Beyonce - Halo (Official Audio)\nSingle Ladies  Beyonce\n")
+    provider = FakeSearchProvider(
+        {"Single Ladies  Beyonce": SearchHit("vidLadies01", "Single Ladies", "Beyonce")}
+    )
+    output = generate_video_ids_file(
+        str(songs), max_workers=2, provider=provider, resolvers=[index]
+    )
+
+    with open(output) as f:
+        assert f.read().split("\n") == ["vidHalo0001", "vidLadies01"]
+    assert provider.calls == ["Single Ladies  Beyonce"]
+    reloaded = HistoryIndex.load(index.path)
+    assert reloaded.lookup("Beyonce Single Ladies") == "vidLadies01"
+
+
+def test_numbers_must_agree():
+    index = HistoryIndex()
+    index.add("Symphony No 5  Beethoven", "vidSymphon5")
+    index.add("Nocturne Op 9 No 1  Chopin", "vidNoctur01")
+    index.add("Another Brick In The Wall Part I  Pink Floyd", "vidBrickPt1")
+
+    assert index.lookup("Symphony No 9  Beethoven") is None
+    assert index.lookup("Nocturne Op 9 No 2  Chopin") is None
+    assert index.lookup("Another Brick In The Wall Part II  Pink Floyd") is None
+    assert index.lookup("Beethoven - Symphony No. 5") == "vidSymphon5"
+
+
+def test_poor_search_results_are_not_indexed(tmp_path):
+    playlists = tmp_path / "playlists"
+    playlists.mkdir()
+    index = HistoryIndex(path=str(tmp_path / "history.json.gz"))
+
+    index.update("Halo  Beyonce", "vidWrongHal", confidence=0.2)
+    index.update("Single Ladies  Beyonce", "vidLadies01", confidence=0.9)
+    assert index.lookup("Halo  Beyonce") is None
+    assert index.lookup("Single Ladies  Beyonce") == "vidLadies01"
+
+    # The ID file written by that run does not bring the poor match back
+    _write_pair(playlists, "mix", ["Halo  Beyonce"], ["vidWrongHal"])
+    index.save()
+    reloaded = HistoryIndex.load(index.path)
+    reloaded.refresh(str(playlists))
+    assert reloaded.lookup("Halo  Beyonce") is None
+
+    reloaded.update("Halo  Beyonce", "vidHalo0001", confidence=0.8)
+    assert reloaded.lookup("Halo  Beyonce") == "vidHalo0001"
+
+
+def test_concurrent_saves_do_not_collide(tmp_path):
+    index = HistoryIndex(path=str(tmp_path / "history.json.gz"))
+    index.add("Halo  Beyonce", "vidHalo0001")
+    errors = []
+
+    def save():
+        try:
+            for _ in range(20):
+                index.save()
+        except OSError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert HistoryIndex.load(index.path).lookup("Halo  Beyonce") == "vidHalo0001"
@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Modules that only the commands touching a browser, yt-dlp or Spotify need
+HEAVY_MODULES = ("playwright", "yt_dlp", "tqdm", "spotipy", "dotenv")
+
+
+def imported_modules(*args: str) -> dict[str, int]:
+    """
+    Run Python with -X importtime and return {top-level module: cumulative us}.
+    """
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=60,
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [p.strip() for p in line[len("import time:") :].split("|")]
+        if not parts[1].isdigit():
+            continue  # header line
+        name = parts[2]
+        modules[name] = int(parts[1])
+    return modules
+
+
+def test_cli_import_skips_heavy_dependencies():
+    modules = imported_modules("-c", "import spm2ytm.cli.main")
+
+    assert "spm2ytm.cli.main" in modules
+    loaded = [m for m in HEAVY_MODULES if m in modules]
+    assert loaded == [], f"Heavy modules imported at CLI startup: {loaded}"
+
+
+@pytest.mark.parametrize("module", ["spm2ytm.cli.main", "spm2ytm.cli.main_spotify_only"])
+def test_help_skips_heavy_dependencies(module):
+    modules = imported_modules("-m", module, "--help")
+
+    loaded = [m for m in HEAVY_MODULES if m in modules]
+    assert loaded == [], f"Heavy modules imported for --help: {loaded}"
+
+
+def test_extract_module_does_not_load_browser_or_ytdlp():
+    modules = imported_modules("-c", "import spm2ytm.core.extract")
+
+    for name in ("playwright", "yt_dlp", "tqdm", "spotipy"):
+        assert name not in modules
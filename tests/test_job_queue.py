@@ -0,0 +1,147 @@
+import threading
+import time
+
+import pytest
+
+from spm2ytm.core.queue import DONE, FAILED, QUEUED, RUNNING, JobQueue
+from spm2ytm.core.service import ConversionService
+from spm2ytm.errors.custom_errors import LeaseLostError
+
+
+def test_jobs_advance_through_stages(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+    job_id = queue.submit("search", {"song_file": "songs.txt"})
+
+    job = queue.claim("search")
+    assert job.id == job_id
+    assert job.status == RUNNING
+    assert queue.claim("search") is None
+
+    queue.advance(job, "add", {**job.payload, "ids_file": "songs-ID.txt"})
+    job = queue.claim("add")
+    assert job.payload["ids_file"] == "songs-ID.txt"
+    assert job.attempts == 1
+
+    queue.advance(job, None, job.payload)
+    assert queue.get(job_id).status == DONE
+    assert not queue.has_pending()
+
+
+def test_claim_is_fifo_per_stage(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+    first = queue.submit("extract", {"playlist_url": "a"})
+    second = queue.submit("extract", {"playlist_url": "b"})
+    queue.submit("search", {"song_file": "c"})
+
+    assert queue.claim("extract").id == first
+    assert queue.claim("extract").id == second
+    assert queue.claim("extract") is None
+
+
+def test_retry_with_backoff_then_fail(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+    job_id = queue.submit("search", {}, max_attempts=2)
+
+    job = queue.claim("search")
+    assert queue.retry_or_fail(job, "boom", delay=60)
+    stored = queue.get(job_id)
+    assert stored.status == QUEUED
+    assert stored.next_run_at > time.time() + 30
+    # Not runnable until the backoff has elapsed
+    assert queue.claim("search") is None
+
+    job_id = queue.submit("search", {}, max_attempts=2)
+    job = queue.claim("search")
+    assert job.id == job_id
+    assert queue.retry_or_fail(job, "boom", delay=0)
+    job = queue.claim("search")
+    assert not queue.retry_or_fail(job, "boom again", delay=0)
+    assert queue.get(job_id).status == FAILED
+    assert queue.get(job_id).last_error == "boom again"
+
+
+def test_sources_take_turns(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+    library = [queue.submit("search", {}, source="alice") for _ in range(3)]
+    single = queue.submit("search", {}, source="bob")
+
+    claimed = [queue.claim("search").id for _ in range(4)]
+    assert claimed == [library[0], single, library[1], library[2]]
+
+
+def test_queue_survives_reopen_and_requeues_expired_leases(tmp_path):
+    db = str(tmp_path / "jobs.sqlite3")
+    queue = JobQueue(db, lease=0.2)
+    job_id = queue.submit("add", {"ids_file": "x"})
+    queue.claim("add")
+    queue.close()
+
+    # The claiming service may still be alive: the job is left alone
+    queue = JobQueue(db)
+    assert queue.get(job_id).status == RUNNING
+    assert queue.requeue_expired() == 0
+
+    time.sleep(0.3)
+    assert queue.requeue_expired() == 1
+    assert queue.claim("add").id == job_id
+
+
+def test_requeued_job_rejects_the_stale_worker(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), lease=0)
+    job_id = queue.submit("search", {})
+    stale = queue.claim("search")
+    time.sleep(0.01)
+    assert queue.requeue_expired() == 1
+    current = queue.claim("search")
+
+    # The stale worker can neither renew, finish nor fail the job
+    queue.heartbeat([stale])
+    with pytest.raises(LeaseLostError):
+        queue.advance(stale, None, {"by": "stale"})
+    with pytest.raises(LeaseLostError):
+        queue.retry_or_fail(stale, "boom", delay=0)
+
+    queue.advance(current, None, {"by": "current"})
+    assert queue.get(job_id).status == DONE
+    assert queue.get(job_id).payload == {"by": "current"}
+
+
+def test_service_drains_queue_with_stage_handlers(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+    for name in ("one", "two", "three"):
+        queue.submit("search", {"song_file": name, "youtube_playlist_name": "yt"})
+
+    seen = []
+    svc = ConversionService(queue, poll_interval=0.01)
+    svc.handlers["search"] = lambda job: (
+        "add",
+        {**job.payload, "ids_file": job.payload["song_file"] + "-ID"},
+    )
+
+    def fake_add(job):
+        seen.append(job.payload["ids_file"])
+        return None, job.payload
+
+    svc.handlers["add"] = fake_add
+    assert svc.run(drain=True)
+
+    assert sorted(seen) == ["one-ID", "three-ID", "two-ID"]
+    assert all(job.status == DONE for job in queue.list_jobs())
+
+
+def test_service_stop_does_not_wait_for_stuck_jobs(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), lease=0.3)
+    job_id = queue.submit("add", {})
+    release = threading.Event()
+    svc = ConversionService(queue, poll_interval=0.01, shutdown_timeout=0.2)
+    svc.handlers["add"] = lambda job: (release.wait(), (None, job.payload))[1]
+
+    threading.Timer(0.5, svc.stop).start()
+    started = time.monotonic()
+    assert not svc.run()
+    # The heartbeat kept the lease alive while the handler ran
+    assert time.monotonic() - started < 2
+    assert queue.get(job_id).status == RUNNING
+    release.set()
+    while queue.get(job_id).status == RUNNING:
+        time.sleep(0.01)
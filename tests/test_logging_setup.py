@@ -0,0 +1,91 @@
+import logging
+import threading
+
+import pytest
+
+from spm2ytm.logging_setup import (PER_ITEM, ItemRateLimiter, setup_logging,
+                                   stop_logging)
+
+
+class Console:
+    """Stream stand-in recording (writer thread name, message) per line."""
+
+    def __init__(self):
+        self.records = []
+
+    def write(self, text):
+        for line in text.splitlines():
+            message = line.split(" - ", 2)[-1]
+            self.records.append((threading.current_thread().name, message))
+
+    def flush(self):
+        pass
+
+    @property
+    def messages(self):
+        return [msg for _, msg in self.records]
+
+
+@pytest.fixture
+def console():
+    stream = Console()
+    previous = logging.getLogger().level
+    yield stream
+    stop_logging()
+    logging.getLogger().setLevel(previous)
+
+
+def _record(
+    msg: str, per_item: bool = True, level: int = logging.INFO
+) -> logging.LogRecord:
+    record = logging.LogRecord("test", level, __file__, 1, msg, None, None)
+    if per_item:
+        record.per_item = True
+    return record
+
+
+def test_rate_limiter_bursts_then_throttles_per_item_records():
+    now = [0.0]
+    limiter = ItemRateLimiter(rate=2.0, burst=3, clock=lambda: now[0])
+
+    allowed = [limiter.filter(_record(f"m{i}")) for i in range(5)]
+    assert allowed == [True, True, True, False, False]
+    # Run-level messages, and per-item warnings and errors, are never limited
+    assert limiter.filter(_record("summary", per_item=False))
+    assert limiter.filter(_record("not found", level=logging.WARNING))
+    assert limiter.filter(_record("failed", level=logging.ERROR))
+
+    now[0] = 0.5  # one token refilled
+    record = _record("next")
+    assert limiter.filter(record)
+    assert record.getMessage() == "next (+2 similar suppressed)"
+    assert limiter.total_suppressed == 2
+
+
+def test_setup_logging_writes_from_background_thread(console):
+    setup_logging(item_rate=1.0, item_burst=2, stream=console)
+
+    logger = logging.getLogger("spm2ytm.test")
+    for i in range(10):
+        logger.info(f"item {i}", extra=PER_ITEM)
+    logger.info("done")
+    stop_logging()
+
+    assert console.messages == [
+        "item 0",
+        "item 1",
+        "done",
+        "8 per-item log messages were suppressed",
+    ]
+    caller = threading.current_thread().name
+    assert all(thread != caller for thread, _ in console.records)
+
+
+def test_quiet_mode_only_lets_warnings_through(console):
+    setup_logging(quiet=True, background=False, stream=console)
+
+    logger = logging.getLogger("spm2ytm.test")
+    logger.info("progress")
+    logger.warning("problem")
+
+    assert console.messages == ["problem"]
@@ -0,0 +1,128 @@
+import gzip
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from spm2ytm.cli.main import cli
+from spm2ytm.clients.search_providers import FakeSearchProvider, SearchHit
+from spm2ytm.core.create import generate_video_ids_file
+from spm2ytm.core.mapping import (BUNDLE_VERSION, Mapping, MappingBundle,
+                                  query_key)
+
+
+def test_query_key_is_normalized():
+    assert query_key("Wonderwall - Remastered  Oasis") == query_key("oasis WONDERWALL")
+    assert query_key("Symphony No 5  Beethoven") != query_key("Symphony No 9  Beethoven")
+
+
+def test_lookup_ignores_low_confidence_mappings():
+    bundle = MappingBundle()
+    bundle.update("Halo  Beyonce", "vidHalo0001", confidence=0.3)
+    bundle.update("Single Ladies  Beyonce", "vidLadies01", confidence=0.9)
+
+    assert bundle.lookup("Halo  Beyonce") is None
+    assert bundle.lookup("Single Ladies  Beyonce") == "vidLadies01"
+    assert MappingBundle(bundle.entries, min_confidence=0.0).lookup("Halo Beyonce")
+
+
+def test_conflicts_prefer_confidence_then_recency():
+    bundle = MappingBundle({"q:a": Mapping("old_high", 0.9, 100)})
+
+    assert bundle.put("q:a", Mapping("new_low", 0.5, 200)) == "kept"
+    assert bundle.put("q:a", Mapping("new_high", 0.9, 200)) == "replaced"
+    assert bundle.put("q:a", Mapping("stale", 0.9, 150)) == "kept"
+    assert bundle.put("q:b", Mapping("fresh", 0.1, 1)) == "added"
+    assert bundle.get("q:a").video_id == "new_high"
+
+    other = MappingBundle(
+        {"q:a": Mapping("best", 1.0, 50), "q:b": Mapping("older", 0.1, 0)}
+    )
+    stats = bundle.merge(other)
+    assert (stats.added, stats.replaced, stats.kept) == (0, 1, 1)
+    assert bundle.get("q:a").video_id == "best"
+
+
+def test_save_load_round_trip_and_version_check(tmp_path):
+    path = tmp_path / "bundle.json.gz"
+    bundle = MappingBundle()
+    bundle.update("Song  Artist", "vid00000001", confidence=0.8)
+    bundle.put("q:other song", Mapping("vid00000002", 1.0, 1700000000))
+    bundle.save(str(path))
+
+    loaded = MappingBundle.load(str(path))
+    assert loaded.lookup("song artist") == "vid00000001"
+    assert loaded.get("q:other song") == Mapping("vid00000002", 1.0, 1700000000)
+    assert loaded.path == str(path)
+
+    with gzip.open(path, "rt") as f:
+        data = json.load(f)
+    data["version"] = BUNDLE_VERSION + 1
+    with gzip.open(path, "wt") as f:
+        json.dump(data, f)
+    with pytest.raises(ValueError, match="version"):
+        MappingBundle.load(str(path))
+
+
+def test_add_id_file_skips_not_found(tmp_path):
+    songs = tmp_path / "mix.txt"
+    songs.write_text("Song A  Artist\nSong B  Artist\nSong C  Artist\n")
+    (tmp_path / "mix-ID.txt").write_text("vidA\n\nvidC")
+
+    bundle = MappingBundle()
+    stats = bundle.add_id_file(str(songs))
+
+    assert stats.added == 2
+    assert bundle.lookup("Song A  Artist") == "vidA"
+    assert bundle.lookup("Song B  Artist") is None
+    assert bundle.get(query_key("Song C  Artist")).confidence == 0.5
+
+
+def test_bundle_prewarms_search_stage_and_learns(tmp_path):
+    songs = tmp_path / "songs.txt"
+    songs.write_text("Known Song  Artist\nNew Song  Artist\nMissing  Artist\n")
+    store = tmp_path / "store.json.gz"
+    bundle = MappingBundle(path=str(store))
+    bundle.update("known song artist", "vidKnown001")
+
+    provider = FakeSearchProvider(
+        {"New Song  Artist": SearchHit("vidNew00001", "New Song", "Artist")}
+    )
+    output = generate_video_ids_file(
+        str(songs), max_workers=2, provider=provider, resolvers=[bundle]
+    )
+
+    with open(output) as f:
+        assert f.read().split("\n") == ["vidKnown001", "vidNew00001", ""]
+    assert "Known Song  Artist" not in provider.calls
+    # The fresh hit was recorded with its match score and flushed to disk
+    learned = MappingBundle.load(str(store)).get(query_key("New Song  Artist"))
+    assert (learned.video_id, learned.confidence) == ("vidNew00001", 1.0)
+
+
+def test_mapping_cli_export_import_merge(tmp_path):
+    songs = tmp_path / "mix.txt"
+    songs.write_text("Song A  Artist\nSong B  Artist\n")
+    (tmp_path / "mix-ID.txt").write_text("vidA\nvidB")
+    store = tmp_path / "store.json.gz"
+    runner = CliRunner()
+
+    exported = tmp_path / "shared.json.gz"
+    result = runner.invoke(
+        cli,
+        ["mapping", "export", str(exported), str(songs), "--store", str(store)],
+    )
+    assert result.exit_code == 0, result.output
+
+    result = runner.invoke(
+        cli, ["mapping", "import", str(exported), "--store", str(store)]
+    )
+    assert result.exit_code == 0, result.output
+    assert MappingBundle.load(str(store)).lookup("song b artist") == "vidB"
+
+    merged = tmp_path / "merged.json.gz"
+    result = runner.invoke(
+        cli, ["mapping", "merge", str(exported), str(store), "-o", str(merged)]
+    )
+    assert result.exit_code == 0, result.output
+    assert len(MappingBundle.load(str(merged))) == 2
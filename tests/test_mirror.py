@@ -0,0 +1,131 @@
+import random
+
+import pytest
+
+from spm2ytm.clients.yt_playlist_editor import PlaylistItem
+from spm2ytm.core.create import add_videos_to_playlist
+from spm2ytm.core.mirror import mirror_playlist, plan_mirror
+from spm2ytm.errors.custom_errors import PlaylistEditError
+
+
+class FakeEditor:
+    """In-memory playlist with edit_playlist's remove/append/move semantics."""
+
+    def __init__(self, video_ids, report_set_ids=True):
+        self.items = []
+        self.next_id = 0
+        self.reads = 0
+        self.actions = 0
+        self.report_set_ids = report_set_ids
+        for video_id in video_ids:
+            self._new(video_id)
+
+    def _new(self, video_id):
+        self.next_id += 1
+        item = PlaylistItem(video_id, f"set{self.next_id}")
+        self.items.append(item)
+        return item.set_video_id
+
+    def get_playlist_items(self, playlist_id):
+        self.reads += 1
+        return list(self.items)
+
+    def remove_items(self, playlist_id, items):
+        self.actions += len(items)
+        gone = {item.set_video_id for item in items}
+        self.items = [item for item in self.items if item.set_video_id not in gone]
+
+    def append_videos(self, playlist_id, video_ids):
+        self.actions += len(video_ids)
+        set_ids = [self._new(video_id) for video_id in video_ids]
+        return set_ids if self.report_set_ids else [None] * len(set_ids)
+
+    def move_items(self, playlist_id, moves):
+        self.actions += len(moves)
+        for set_id, predecessor in moves:
+            item = next(i for i in self.items if i.set_video_id == set_id)
+            self.items.remove(item)
+            at = 0
+            if predecessor is not None:
+                at = 1 + [i.set_video_id for i in self.items].index(predecessor)
+            self.items.insert(at, item)
+
+    def video_ids(self):
+        return [item.video_id for item in self.items]
+
+
+def test_plan_is_the_edit_distance():
+    current = [PlaylistItem(v, f"s{v}") for v in "ABCDEF"]
+
+    plan = plan_mirror(current, list("ABCDEF"))
+    assert plan.edits == 0 and len(plan.kept) == 6
+
+    plan = plan_mirror(current, list("AXCDBFE"))
+    assert [item.video_id for item in plan.removes] == []
+    assert plan.adds == [1]
+    # A C D and one of E/F stay; B and the other one move
+    assert len(plan.moves) == 2 and len(plan.kept) == 4
+
+
+def test_mirror_edits_only_what_changed():
+    editor = FakeEditor(list("ABCDEF"))
+    mirror_playlist(editor, "PL", list("ABCDEF"))
+    assert editor.actions == 0 and editor.reads == 1
+
+    # New songs at the end are appended without moves
+    mirror_playlist(editor, "PL", list("ABCDEFGH"))
+    assert editor.video_ids() == list("ABCDEFGH") and editor.actions == 2
+
+    editor.actions = 0
+    target = list("XBADFGHCC")
+    mirror_playlist(editor, "PL", target)
+    assert editor.video_ids() == target
+    # Remove E, append X and C, then place X, B and the first C
+    assert editor.actions == 6
+
+
+def test_mirror_random_playlists_converge():
+    rng = random.Random(7)
+    for report_set_ids in (True, False):
+        for _ in range(50):
+            current = [f"v{rng.randrange(30)}" for _ in range(rng.randrange(25))]
+            target = [f"v{rng.randrange(30)}" for _ in range(rng.randrange(1, 25))]
+            editor = FakeEditor(current, report_set_ids)
+
+            plan = mirror_playlist(editor, "PL", target)
+
+            assert editor.video_ids() == target
+            assert len(plan.kept) + len(plan.moves) + len(plan.adds) == len(target)
+
+
+def test_unresolved_song_keeps_its_entry():
+    # C was not found this time: its entry stays and nothing is removed
+    editor = FakeEditor(list("ABCD"))
+    plan = mirror_playlist(editor, "PL", ["A", "B", "", "D"])
+    assert editor.video_ids() == list("ABCD")
+    assert plan.edits == 0 and not plan.unresolved
+
+    # An unresolved song next to changes keeps whatever sits at its position
+    plan = mirror_playlist(editor, "PL", ["", "X", "D", "B", ""])
+    assert plan.removes == []
+    assert editor.video_ids() == list("AXDBC")
+    assert plan.unresolved == [] and plan.left == []
+
+
+def test_unresolved_position_without_entry_removes_nothing():
+    editor = FakeEditor(list("ABE"))
+    plan = mirror_playlist(editor, "PL", ["A", "X", "", "B"])
+    # No entry sits after X (it is new), so E is left rather than removed
+    assert plan.unresolved == [2]
+    assert [item.video_id for item in plan.left] == ["E"]
+    assert plan.removes == []
+    target_order = [v for v in editor.video_ids() if v != "E"]
+    assert target_order == list("AXB") and "E" in editor.video_ids()
+
+
+def test_mirror_refuses_unresolved_songs_without_force(tmp_path):
+    ids_file = tmp_path / "mix-ID.txt"
+    ids_file.write_text("vid00000001\n\nvid00000003")
+
+    with pytest.raises(PlaylistEditError, match="1 song"):
+        add_videos_to_playlist(str(ids_file), "Mix", mode="mirror", preflight=False)
@@ -0,0 +1,47 @@
+import pytest
+
+from spm2ytm.clients import yt_client
+from spm2ytm.core.dedupe import normalize_key
+from spm2ytm.normalize import display_form, normalize_batch, search_key
+
+
+def test_display_keeps_letters_of_any_script():
+    assert display_form("Don't Stop Me Now - 2011 Mix") == "Dont Stop Me Now 2011 Mix"
+    assert display_form("Beyoncé — Halo (feat. X)") == "Beyoncé Halo feat X"
+    assert display_form("夜に駆ける / YOASOBI") == "夜に駆ける YOASOBI"
+    # Fullwidth forms and decomposed accents are folded
+    assert display_form("ＡＢＣ１２３ Café") == "ABC123 Café"
+    assert display_form("?!") == ""
+
+
+def test_search_key_transliterates_instead_of_deleting():
+    assert search_key("Beyoncé Motörhead Straße") == "beyonce motorhead strasse"
+    assert search_key("Вечно молодой") == "vechno molodoy"
+    assert search_key("Σωκράτης") == "sokratis"
+    assert search_key("नमस्ते") == "नमस्ते"
+    assert normalize_key("Łódź  Café") == normalize_key("Cafe Lodz")
+
+
+def test_batch_matches_single_rows_in_order():
+    texts = ["Wonderwall  Oasis", "Вечно молодой", "Don't", "", "a\nb", "Café"]
+    batch = normalize_batch(texts)
+
+    assert batch.display == [display_form(t) for t in texts]
+    assert batch.keys == [search_key(t) for t in texts]
+    assert batch.keys[4] == "a b"
+    assert normalize_batch([]) == ([], [])
+
+
+def test_ytdlp_accepts_display_forms(monkeypatch):
+    class FakeYoutubeDL:
+        def extract_info(self, term, download):
+            return {"entries": [{"id": "vid00000001", "title": term}]}
+
+    query = display_form("Вечно молодой — Смысловые Галлюцинации")
+    entry = yt_client.search_entry_ytdlp(query, FakeYoutubeDL())
+    assert entry["title"] == f"ytsearch1:{query}"
+    assert yt_client.search_entry_ytdlp("नमस्ते दुनिया", FakeYoutubeDL())
+
+    for bad in ("Song - Artist", "   "):
+        with pytest.raises(ValueError):
+            yt_client.search_entry_ytdlp(bad, FakeYoutubeDL())
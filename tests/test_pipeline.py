@@ -0,0 +1,130 @@
+import pickle
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from spm2ytm.clients.search_providers import FakeSearchProvider
+from spm2ytm.core import create
+from spm2ytm.core.create import generate_video_ids_file
+from spm2ytm.core.pipeline import bounded_ordered_map, iter_songs
+from spm2ytm.core.retry import CircuitBreaker, RetryPolicy
+
+
+def test_bounded_ordered_map_keeps_order_and_bounds_window():
+    consumed = 0
+    outstanding = 0
+    max_outstanding = 0
+    lock = threading.Lock()
+
+    def items():
+        nonlocal consumed
+        for i in range(200):
+            consumed += 1
+            yield i
+
+    def work(i):
+        nonlocal outstanding, max_outstanding
+        with lock:
+            outstanding += 1
+            max_outstanding = max(max_outstanding, outstanding)
+        time.sleep(random.uniform(0, 0.002))
+        with lock:
+            outstanding -= 1
+        return i * 2
+
+    results = []
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for item, future in bounded_ordered_map(executor, work, items(), window=8):
+            # Input is pulled lazily: never more than a window ahead
+            assert consumed - item <= 8
+            results.append(future.result())
+
+    assert results == [i * 2 for i in range(200)]
+    assert max_outstanding <= 4
+
+
+def test_bounded_ordered_map_rejects_empty_window():
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with pytest.raises(ValueError):
+            list(bounded_ordered_map(executor, str, [1], window=0))
+
+
+def test_iter_songs_skips_blank_lines(tmp_path):
+    path = tmp_path / "songs.txt"
+    path.write_text("  a \n\n b\n   \nc")
+    assert list(iter_songs(path)) == ["a", "b", "c"]
+
+
+def test_generate_streams_results_in_order(tmp_path):
+    songs = [f"song {i}" for i in range(300)]
+    song_file = tmp_path / "big.txt"
+    song_file.write_text("\n".join(songs) + "\n")
+
+    results = {song: f"id{i}" for i, song in enumerate(songs) if i % 7}
+    provider = FakeSearchProvider(results, latency=lambda q: random.uniform(0, 0.001))
+
+    output = generate_video_ids_file(
+        str(song_file), max_workers=8, provider=provider, window=16
+    )
+
+    lines = open(output, encoding="utf-8").read().split("\n")
+    assert lines == [results.get(song, "") for song in songs]
+
+
+def test_generate_in_process_pool(tmp_path):
+    songs = [f"song {i}" for i in range(40)]
+    song_file = tmp_path / "songs.txt"
+    song_file.write_text("\n".join(songs))
+    results = {song: f"id{i}" for i, song in enumerate(songs) if i % 3}
+
+    output = generate_video_ids_file(
+        str(song_file),
+        max_workers=2,
+        provider=FakeSearchProvider(results),
+        executor_kind="process",
+    )
+
+    lines = open(output, encoding="utf-8").read().split("\n")
+    assert lines == [results.get(song, "") for song in songs]
+
+
+def test_process_workers_use_the_callers_policy(tmp_path):
+    policy = RetryPolicy(
+        max_attempts=2, base_delay=0.1, breaker=CircuitBreaker(cooldown=5)
+    )
+    init_args = create._process_init_args(FakeSearchProvider(), policy)
+
+    # What a spawned worker runs with after unpickling its initializer args
+    create._init_search_process(*pickle.loads(pickle.dumps(init_args)))
+    worker_policy = create._process_policy
+    assert (worker_policy.max_attempts, worker_policy.base_delay) == (2, 0.1)
+    assert worker_policy.breaker.cooldown == 5
+    assert worker_policy.breaker is not policy.breaker
+
+    song_file = tmp_path / "songs.txt"
+    song_file.write_text("a\n")
+    unpicklable = RetryPolicy(classify=lambda e: "transient")
+    with pytest.raises(ValueError, match="Retry policy cannot be sent"):
+        generate_video_ids_file(
+            str(song_file),
+            policy=unpicklable,
+            provider=FakeSearchProvider(),
+            executor_kind="process",
+        )
+
+
+def test_process_pool_rejects_unpicklable_provider(tmp_path):
+    from spm2ytm.core.hedging import HedgedSearchProvider
+
+    song_file = tmp_path / "songs.txt"
+    song_file.write_text("a\n")
+    provider = HedgedSearchProvider(FakeSearchProvider())
+
+    with pytest.raises(ValueError, match="cannot be sent to worker processes"):
+        generate_video_ids_file(
+            str(song_file), provider=provider, executor_kind="process"
+        )
+    provider.close()
@@ -0,0 +1,212 @@
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from playwright.sync_api import sync_playwright
+
+from spm2ytm.clients.yt_playlist_editor import PlaylistEditor, sapisid_hash
+from spm2ytm.core import create
+from spm2ytm.errors.custom_errors import PlaylistEditError
+
+VALID_IDS = {f"vid{i:08d}" for i in range(120)}
+
+
+class FakeInnertube(BaseHTTPRequestHandler):
+    """Local stand-in for YouTube's playlist endpoints."""
+
+    requests: list[tuple[str, dict, dict]] = []
+    playlist: list[str] = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests.append((self.path, dict(self.headers), body))
+
+        if not self.headers.get("Authorization", "").startswith("SAPISIDHASH "):
+            return self._reply(401, {"error": "unauthorized"})
+
+        if self.path.startswith("/youtubei/v1/playlist/get_add_to_playlist"):
+            options = [
+                {"playlistAddToOptionRenderer": {"playlistId": pid, "title": title}}
+                for pid, title in (
+                    ("PLother", {"simpleText": "Other"}),
+                    ("PLtarget", {"runs": [{"text": "My Mix"}]}),
+                )
+            ]
+            dialog = {"addToPlaylistRenderer": {"playlists": options}}
+            return self._reply(200, {"contents": [dialog]})
+
+        if self.path.startswith("/youtubei/v1/browse/edit_playlist"):
+            ids = [a["addedVideoId"] for a in body["actions"]]
+            if any(v not in VALID_IDS for v in ids):
+                return self._reply(400, {"error": "invalid video"})
+            self.playlist.extend(ids)
+            results = [
+                {"playlistEditVideoAddedResultData": {"setVideoId": f"set-{v}"}}
+                for v in ids
+            ]
+            return self._reply(
+                200, {"status": "STATUS_SUCCEEDED", "playlistEditResults": results}
+            )
+
+        if self.path.startswith("/youtubei/v1/browse?"):
+            start = int(body.get("continuation", "page-0").split("-")[1])
+            page = [
+                {"playlistVideoRenderer": {"videoId": v, "setVideoId": f"set-{v}"}}
+                for v in self.playlist[start : start + 100]
+            ]
+            if start + 100 < len(self.playlist):
+                command = {"continuationCommand": {"token": f"page-{start + 100}"}}
+                more = {"continuationEndpoint": command}
+                page.append({"continuationItemRenderer": more})
+            return self._reply(200, {"contents": {"items": page}})
+
+        self._reply(404, {})
+
+    def _reply(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *_):
+        pass
+
+
+@pytest.fixture
+def editor():
+    FakeInnertube.requests = []
+    FakeInnertube.playlist = []
+    server = HTTPServer(("127.0.0.1", 0), FakeInnertube)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with sync_playwright() as p:
+        request = p.request.new_context()
+        yield PlaylistEditor(
+            request,
+            api_key="test-key",
+            client_context={"client": {"clientName": "WEB"}},
+            sapisid="sapisid-cookie",
+            base_url=f"http://127.0.0.1:{server.server_port}",
+            batch_size=50,
+        )
+        request.dispose()
+    server.shutdown()
+
+
+def test_sapisid_hash_format():
+    value = sapisid_hash("abc", "https://www.youtube.com", now=1700000000)
+
+    digest = hashlib.sha1(b"1700000000 abc https://www.youtube.com").hexdigest()
+    assert value == f"SAPISIDHASH 1700000000_{digest}"
+
+
+def test_find_playlist_id_by_title(editor):
+    assert editor.find_playlist_id("My Mix", "vid00000000") == "PLtarget"
+    assert editor.find_playlist_id("Missing", "vid00000000") is None
+
+    path, headers, body = FakeInnertube.requests[0]
+    assert "key=test-key" in path
+    assert body["videoIds"] == ["vid00000000"]
+    assert body["context"] == {"client": {"clientName": "WEB"}}
+
+
+def test_find_playlist_ids_in_one_request(editor):
+    found = editor.find_playlist_ids(["My Mix", "Other", "Missing"], "vid00000000")
+
+    assert found == {"My Mix": "PLtarget", "Other": "PLother"}
+    assert len(FakeInnertube.requests) == 1
+
+
+def test_add_videos_in_batches(editor):
+    ids = sorted(VALID_IDS)
+
+    added, failed = editor.add_videos("PLtarget", ids)
+
+    assert added == ids and failed == []
+    assert FakeInnertube.playlist == ids
+    edits = [r for r in FakeInnertube.requests if "edit_playlist" in r[0]]
+    assert len(edits) == 3  # 120 videos, 50 per request
+
+
+def test_rejected_batch_is_retried_one_by_one(editor):
+    ids = ["vid00000001", "bad_id_0001", "vid00000002"]
+
+    added, failed = editor.add_videos("PLtarget", ids)
+
+    assert added == ["vid00000001", "vid00000002"]
+    assert failed == ["bad_id_0001"]
+    assert FakeInnertube.playlist == added
+
+
+def test_http_errors_raise_playlist_edit_error(editor):
+    editor.sapisid = ""
+    editor_request = editor.request
+
+    class NoAuth:
+        def post(self, url, headers, data):
+            headers = {k: v for k, v in headers.items() if k != "Authorization"}
+            return editor_request.post(url, headers=headers, data=data)
+
+    editor.request = NoAuth()
+    with pytest.raises(PlaylistEditError) as exc:
+        editor.find_playlist_id("My Mix", "vid00000000")
+    assert exc.value.status == 401
+
+
+def test_transport_errors_raise_playlist_edit_error(editor):
+    class TimingOut:
+        def post(self, url, headers, data):
+            raise TimeoutError("Request timed out")
+
+    class HtmlPage:
+        ok = True
+
+        def json(self):
+            raise ValueError("Expecting value")
+
+    editor.request = TimingOut()
+    with pytest.raises(PlaylistEditError, match="timed out"):
+        editor.find_playlist_id("My Mix", "vid00000000")
+
+    editor.request.post = lambda url, headers, data: HtmlPage()
+    with pytest.raises(PlaylistEditError, match="non-JSON"):
+        editor.find_playlist_id("My Mix", "vid00000000")
+
+
+def test_direct_mode_skips_videos_already_in_playlist(editor, monkeypatch):
+    monkeypatch.setattr(PlaylistEditor, "from_page", lambda page, context: editor)
+    FakeInnertube.playlist = ["vid00000001"]
+    ids = ["vid00000001", "vid00000002", "vid00000003", "vid00000002"]
+
+    added, remaining = create._add_videos_directly(None, None, ids, ["My Mix"])
+
+    assert (added, remaining) == (4, [])
+    assert FakeInnertube.playlist == ["vid00000001", "vid00000002", "vid00000003"]
+
+
+def test_direct_mode_falls_back_to_clicks_on_any_error(monkeypatch):
+    def broken(page, context):
+        raise RuntimeError("Execution context was destroyed")
+
+    monkeypatch.setattr(PlaylistEditor, "from_page", broken)
+    ids = ["vid00000001", "vid00000002"]
+
+    assert create._add_videos_directly(None, None, ids, ["My Mix"]) == (0, ids)
+
+
+def test_read_playlist_across_continuations(editor):
+    ids = sorted(VALID_IDS)
+    assert editor.append_videos("PLtarget", ids) == [f"set-{v}" for v in ids]
+
+    items = editor.get_playlist_items("PLtarget")
+
+    assert [item.video_id for item in items] == ids
+    assert items[0].set_video_id == f"set-{ids[0]}"
+    browses = [r for r in FakeInnertube.requests if "/browse?" in r[0]]
+    assert browses[0][2]["browseId"] == "VLPLtarget"
+    assert browses[1][2]["continuation"] == "page-100"
+    assert len(browses) == 2
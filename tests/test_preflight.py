@@ -0,0 +1,121 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from spm2ytm.clients.yt_oembed import DEAD, UNKNOWN, VALID, probe_video
+from spm2ytm.core.preflight import preflight_ids_file, validate_video_ids
+
+# video ID -> HTTP status served by the fake oEmbed endpoint
+STATUSES = {
+    "live_video1": 200,
+    "live_video2": 200,
+    "noembed_vid": 401,
+    "private_vid": 404,
+    "removed_vid": 404,
+    "bad_request": 400,
+    "throttled_1": 429,
+}
+
+
+class FakeOEmbed(BaseHTTPRequestHandler):
+    delay = 0.0
+    requests: list[str] = []
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        video_id = query["url"][0].rsplit("v=", 1)[1]
+        self.requests.append(video_id)
+        time.sleep(self.delay)
+
+        status = STATUSES.get(video_id, 404)
+        body = json.dumps({"title": f"Title of {video_id}"}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_):
+        pass
+
+
+@pytest.fixture
+def oembed_url():
+    FakeOEmbed.requests = []
+    FakeOEmbed.delay = 0.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOEmbed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/oembed"
+    server.shutdown()
+
+
+def test_probe_video_classifies_responses(oembed_url):
+    import requests
+
+    session = requests.Session()
+
+    live = probe_video(session, "live_video1", oembed_url)
+    assert (live.status, live.title) == (VALID, "Title of live_video1")
+    assert probe_video(session, "noembed_vid", oembed_url).status == VALID
+    assert probe_video(session, "private_vid", oembed_url).status == DEAD
+    assert probe_video(session, "bad_request", oembed_url).status == DEAD
+    assert probe_video(session, "throttled_1", oembed_url).status == UNKNOWN
+    # Malformed IDs are rejected without a request
+    assert probe_video(session, "short", oembed_url).status == DEAD
+    assert "short" not in FakeOEmbed.requests
+
+
+def test_validate_video_ids_probes_concurrently(oembed_url):
+    FakeOEmbed.delay = 0.2
+    lines = [
+        "live_video1",
+        "live_video2",
+        "private_vid",
+        "removed_vid",
+        "noembed_vid",
+        "bad_request",
+        "",
+        "live_video1",  # duplicate, probed once
+    ]
+
+    start = time.perf_counter()
+    report = validate_video_ids(lines, max_workers=8, base_url=oembed_url)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.2 * 6 / 2
+    assert sorted(FakeOEmbed.requests) == sorted(set(filter(None, lines)))
+    assert report.valid == ["live_video1", "live_video2", "noembed_vid", "live_video1"]
+    assert [(n, vid) for n, vid, _, _ in report.rejected] == [
+        (3, "private_vid"),
+        (4, "removed_vid"),
+        (6, "bad_request"),
+        (7, ""),
+    ]
+    assert (report.dead, report.empty_lines) == (4, 1)
+
+
+def test_preflight_ids_file_writes_report(oembed_url, tmp_path):
+    ids_file = tmp_path / "mix-ID.txt"
+    ids_file.write_text("live_video1\nprivate_vid\n\nthrottled_1")
+
+    valid = preflight_ids_file(str(ids_file), base_url=oembed_url, max_workers=4)
+
+    # Unchecked IDs are kept rather than dropped
+    assert valid == ["live_video1", "throttled_1"]
+    report = (tmp_path / "mix-ID-preflight.txt").read_text().splitlines()
+    assert report[0] == "# 2 valid, 2 dead (1 empty lines), 1 unchecked (kept)"
+    assert report[2:] == [
+        "2\tprivate_vid\tdead\tunavailable or private",
+        "3\t\tdead\tempty line (song not found)",
+        "4\tthrottled_1\tunknown\tHTTP 429",
+    ]
+
+    # Mirror mode keeps a line per position, dead IDs blanked
+    positions = preflight_ids_file(
+        str(ids_file), keep_positions=True, base_url=oembed_url, max_workers=4
+    )
+    assert positions == ["live_video1", "", "", "throttled_1"]
@@ -0,0 +1,109 @@
+import pytest
+
+from spm2ytm.core.create import _is_ticked, _playlist_names, _tick_playlists
+from spm2ytm.errors.custom_errors import PlaylistEditError
+
+
+class FakeRow:
+    def __init__(
+        self,
+        title: str,
+        selected: bool,
+        labelled: bool | None = True,
+        sticks: bool = True,
+    ):
+        self.title = title
+        self.selected = selected
+        self.sticks = sticks  # whether a click changes the state
+        # Where the row shows its state: aria-label (True), aria-checked (None)
+        # or nowhere (False)
+        self.labelled = labelled
+        self.clicks = 0
+
+    @property
+    def first(self):
+        return self
+
+    def wait_for(self, state, timeout):
+        pass
+
+    def get_attribute(self, name):
+        if name == "aria-label":
+            if not self.labelled:
+                return f"{self.title}, Private"
+            state = "Selected" if self.selected else "Not selected"
+            return f"{self.title}, Private, {state}"
+        if name == "aria-checked" and self.labelled is None:
+            return "true" if self.selected else "false"
+        return None
+
+    def click(self):
+        self.clicks += 1
+        if self.sticks:
+            self.selected = not self.selected
+
+
+class FakeDialogPage:
+    """Save dialog stand-in resolving rows by their aria-label selector."""
+
+    def __init__(self, rows):
+        self.rows = {row.title: row for row in rows}
+
+    def locator(self, selector):
+        prefix = selector.split("aria-label^='", 1)[1].rsplit(",']", 1)[0]
+        return self.rows[prefix.replace("\\'", "'")]
+
+
+def test_is_ticked_reads_aria_label_state():
+    assert _is_ticked("Road Trip, Private, Selected") is True
+    assert _is_ticked("Road Trip, Private, Not selected") is False
+    assert _is_ticked("Road Trip") is None
+
+
+def test_tick_playlists_in_one_visit_without_unticking():
+    rows = [
+        FakeRow("Road Trip", selected=False),
+        FakeRow("Liked Mirror", selected=True),
+        FakeRow("Rock 'n' Roll", selected=False),
+        FakeRow("Untouched", selected=False),
+    ]
+    page = FakeDialogPage(rows)
+
+    ticked = _tick_playlists(page, ["Road Trip", "Liked Mirror", "Rock 'n' Roll"])
+
+    assert ticked == ["Road Trip", "Rock 'n' Roll"]
+    assert [row.clicks for row in rows] == [1, 0, 1, 0]
+    assert all(row.selected for row in rows[:3])
+
+
+def test_tick_playlists_never_clicks_a_row_of_unknown_state():
+    rows = [
+        FakeRow("Road Trip", selected=True, labelled=None),
+        FakeRow("Mix", selected=False, labelled=None),
+        FakeRow("Mystery", selected=True, labelled=False),
+    ]
+    page = FakeDialogPage(rows)
+
+    with pytest.raises(PlaylistEditError, match="Mystery"):
+        _tick_playlists(page, ["Road Trip", "Mix", "Mystery"])
+
+    # aria-checked is used when the label has no state; otherwise hands off
+    assert [row.clicks for row in rows] == [0, 1, 0]
+    assert rows[1].selected and rows[2].selected
+
+
+def test_tick_playlists_fails_when_a_click_does_not_select():
+    rows = [
+        FakeRow("Road Trip", selected=False, sticks=False),
+        FakeRow("Mix", selected=False),
+    ]
+    page = FakeDialogPage(rows)
+
+    with pytest.raises(PlaylistEditError, match="Road Trip"):
+        _tick_playlists(page, ["Road Trip", "Mix"])
+    assert [row.clicks for row in rows] == [1, 1]
+
+
+def test_playlist_names_accepts_one_or_many():
+    assert _playlist_names("Mix") == ["Mix"]
+    assert _playlist_names(("A", "B", "A")) == ["A", "B"]
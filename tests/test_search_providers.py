@@ -0,0 +1,91 @@
+import pytest
+
+from spm2ytm.clients.search_providers import (FakeSearchProvider, SearchHit,
+                                              SearchProvider,
+                                              YTMusicSearchProvider,
+                                              get_search_provider)
+from spm2ytm.core.benchmark import (benchmark_providers, format_reports,
+                                    match_score, percentile)
+from spm2ytm.core.create import generate_video_ids_file
+from spm2ytm.core.resolvers import Resolver
+
+
+def test_get_search_provider_by_name():
+    assert get_search_provider("ytdlp").name == "ytdlp"
+    assert get_search_provider("ytmusic").name == "ytmusic"
+    with pytest.raises(ValueError):
+        get_search_provider("bing")
+
+
+def test_base_classes_are_abstract():
+    class NoSearch(SearchProvider):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        NoSearch()
+    with pytest.raises(TypeError):
+        Resolver()
+
+
+def test_ytmusic_provider_maps_song_results():
+    class FakeYTMusic:
+        def search(self, query, filter, limit):
+            assert filter == "songs"
+            return [
+                {"resultType": "song", "videoId": None},
+                {
+                    "videoId": "abc123",
+                    "title": "Wonderwall",
+                    "artists": [{"name": "Oasis"}],
+                    "duration_seconds": 259,
+                },
+            ]
+
+    provider = YTMusicSearchProvider()
+    provider._local.client = FakeYTMusic()
+
+    hit = provider.search("Wonderwall Oasis")
+    assert hit == SearchHit("abc123", "Wonderwall", "Oasis", 259)
+
+
+def test_generate_video_ids_file_uses_provider(tmp_path):
+    song_file = tmp_path / "songs.txt"
+    song_file.write_text("a\nb\n\nc\n")
+    provider = FakeSearchProvider({"a": "id_a", "c": "id_c"})
+
+    output = generate_video_ids_file(str(song_file), provider=provider)
+
+    assert open(output, encoding="utf-8").read() == "id_a\n\nid_c"
+    assert sorted(provider.calls) == ["a", "b", "c"]
+
+
+def test_match_score_and_percentile():
+    hit = SearchHit("x", title="Wonderwall (Remastered)", channel="Oasis")
+    assert match_score("Wonderwall Oasis", hit) == 1.0
+    assert match_score("Wonderwall Blur", hit) == 0.5
+    assert match_score("Wonderwall Oasis", None) == 0.0
+    assert percentile([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], 90) == 9
+
+
+def test_benchmark_compares_providers():
+    songs = ["Wonderwall Oasis", "Song Two", "Song Three"]
+    good = FakeSearchProvider(
+        {
+            "Wonderwall Oasis": SearchHit("w", "Wonderwall", "Oasis"),
+            "Song Two": SearchHit("s2", "Song Two", ""),
+        }
+    )
+    good.name = "good"
+    flaky = FakeSearchProvider(
+        {"Wonderwall Oasis": SearchHit("w", "Wonderwall", ""), "Song Two": OSError()}
+    )
+    flaky.name = "flaky"
+
+    reports = benchmark_providers(songs, [good, flaky], max_workers=2)
+
+    assert [r.name for r in reports] == ["good", "flaky"]
+    assert reports[0].hit_rate == pytest.approx(2 / 3)
+    assert reports[0].match_quality == 1.0
+    assert reports[1].errors == 1 and reports[1].match_quality == 0.5
+    table = format_reports(reports)
+    assert "good vs flaky: same video for 1/1 songs" in table
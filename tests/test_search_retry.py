@@ -0,0 +1,97 @@
+import time
+
+import pytest
+
+from spm2ytm.clients.search_providers import FakeSearchProvider
+from spm2ytm.core import create
+from spm2ytm.core.retry import (PERMANENT, TRANSIENT, CircuitBreaker,
+                                RetryPolicy, classify_error)
+
+
+class DownloadError(Exception):
+    """Stand-in for yt_dlp.utils.DownloadError."""
+
+
+def test_classify_error():
+    assert classify_error(ValueError("bad query")) == PERMANENT
+    assert classify_error(TimeoutError()) == TRANSIENT
+    assert classify_error(DownloadError("HTTP Error 429: Too Many Requests")) == TRANSIENT
+    assert classify_error(DownloadError("Unable to download API page")) == TRANSIENT
+    assert classify_error(DownloadError("Video unavailable")) == PERMANENT
+
+
+def test_policy_retries_transient_with_jittered_backoff():
+    sleeps = []
+    policy = RetryPolicy(max_attempts=4, base_delay=1.0, sleep=sleeps.append)
+    calls = iter([TimeoutError(), TimeoutError(), "vid123"])
+
+    def flaky():
+        result = next(calls)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    assert policy.call(flaky) == "vid123"
+    assert len(sleeps) == 2
+    assert 0 <= sleeps[0] <= 1.0 and 0 <= sleeps[1] <= 2.0
+
+
+def test_policy_does_not_retry_permanent_errors():
+    sleeps = []
+    policy = RetryPolicy(sleep=sleeps.append)
+    calls = []
+
+    def invalid():
+        calls.append(1)
+        raise ValueError("Query may only contain letters")
+
+    with pytest.raises(ValueError):
+        policy.call(invalid)
+    assert calls == [1] and sleeps == []
+
+
+def test_breaker_opens_on_error_spike_and_pauses_callers():
+    breaker = CircuitBreaker(window=4, threshold=0.5, min_calls=4, cooldown=0.2)
+    for ok in (True, False, True, False):
+        breaker.record(ok)
+
+    assert breaker.is_open and breaker.trips == 1
+    start = time.monotonic()
+    breaker.wait()
+    assert time.monotonic() - start >= 0.15
+    assert not breaker.is_open
+
+
+def test_generate_separates_not_found_from_errored(tmp_path, caplog):
+    song_file = tmp_path / "songs.txt"
+    song_file.write_text("found song\nmissing song\nflaky song\nbroken song\n")
+
+    attempts = {"flaky song": 0}
+
+    class FlakyProvider(FakeSearchProvider):
+        def search(self, query):
+            if query == "flaky song":
+                attempts[query] += 1
+                if attempts[query] == 1:
+                    raise TimeoutError("timed out")
+            return super().search(query)
+
+    provider = FlakyProvider(
+        {
+            "found song": "id_found",
+            "missing song": None,
+            "flaky song": "id_flaky",
+            "broken song": TimeoutError("still down"),
+        }
+    )
+    policy = RetryPolicy(max_attempts=1, sleep=lambda _: None)
+
+    with caplog.at_level("INFO"):
+        output = create.generate_video_ids_file(
+            str(song_file), policy=policy, provider=provider
+        )
+
+    lines = open(output, encoding="utf-8").read().split("\n")
+    # Flaky song recovered in the reduced-concurrency second pass
+    assert lines == ["id_found", "", "id_flaky", ""]
+    assert "2/4 videos found, 1 not found, 1 errored" in caplog.text
@@ -0,0 +1,97 @@
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from spm2ytm.cli.main import cli
+from spm2ytm.clients.search_providers import FakeSearchProvider, SearchHit
+from spm2ytm.core.create import generate_video_ids_file
+from spm2ytm.core.shard import merge_shard_ids, shard_of, shard_song_file
+
+
+def _songs(tmp_path, count=40):
+    songs = [f"Song {i}  Artist {i % 7}" for i in range(count)]
+    song_file = tmp_path / "mix.txt"
+    # Blank lines are skipped by the search stage, so indices ignore them
+    song_file.write_text("\n".join(songs[:5] + [""] + songs[5:]) + "\n")
+    hits = {
+        song: SearchHit(f"vid{i:08d}", song, "Artist")
+        for i, song in enumerate(songs)
+        if i % 5
+    }
+    return song_file, songs, hits
+
+
+def _search_shards(paths, hits):
+    return [
+        generate_video_ids_file(
+            path, max_workers=2, provider=FakeSearchProvider(hits), retry_workers=0
+        )
+        for path in paths
+    ]
+
+
+def test_shard_of_is_stable():
+    assert shard_of("Wonderwall  Oasis", 4) == shard_of("Wonderwall  Oasis", 4)
+    assert {shard_of(f"song {i}", 3) for i in range(50)} == {1, 2, 3}
+
+
+def test_shard_search_merge_matches_single_host(tmp_path):
+    song_file, songs, hits = _songs(tmp_path)
+    expected = Path(
+        generate_video_ids_file(
+            str(song_file), max_workers=2, provider=FakeSearchProvider(hits)
+        )
+    ).read_text()
+
+    shard_dir = tmp_path / "shards"
+    paths = shard_song_file(str(song_file), 3, str(shard_dir))
+    assert [Path(p).name for p in paths] == [
+        "mix.shard-01-of-03.txt",
+        "mix.shard-02-of-03.txt",
+        "mix.shard-03-of-03.txt",
+    ]
+    assert sum(len(Path(p).read_text().splitlines()) for p in paths) == len(songs)
+
+    ids_files = _search_shards(paths, hits)
+    merged = merge_shard_ids(list(reversed(ids_files)))
+
+    assert merged == str(shard_dir / "mix-ID.txt")
+    assert Path(merged).read_text() == expected
+
+
+def test_merge_detects_missing_duplicate_and_foreign_shards(tmp_path):
+    song_file, _, hits = _songs(tmp_path)
+    ids_files = _search_shards(shard_song_file(str(song_file), 3), hits)
+
+    with pytest.raises(ValueError, match=r"Missing shard\(s\) 2 of 3"):
+        merge_shard_ids([ids_files[0], ids_files[2]])
+    with pytest.raises(ValueError, match="Duplicate shard 1"):
+        merge_shard_ids(ids_files + [ids_files[0]])
+
+    # A shard from an earlier split of a different version of the file
+    other_dir = tmp_path / "old"
+    other_dir.mkdir()
+    (other_dir / "mix.txt").write_text("Only Song  Artist\n")
+    (old,) = _search_shards(shard_song_file(str(other_dir / "mix.txt"), 3)[:1], hits)
+    with pytest.raises(ValueError, match="different split"):
+        merge_shard_ids(ids_files[:2] + [old])
+
+
+def test_shard_and_merge_cli(tmp_path):
+    song_file, _, hits = _songs(tmp_path, count=10)
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ["shard", str(song_file), "-n", "2"])
+    assert result.exit_code == 0, result.output
+    shards = sorted(tmp_path.glob("mix.shard-*-of-02.txt"))
+    ids_files = _search_shards(shards, hits)
+
+    result = runner.invoke(cli, ["merge", ids_files[0]])
+    assert result.exit_code == 1
+    assert "Missing shard(s) 2 of 2" in result.output
+
+    output = tmp_path / "merged-ID.txt"
+    result = runner.invoke(cli, ["merge", *ids_files, "-o", str(output)])
+    assert result.exit_code == 0, result.output
+    assert len(output.read_text().split("\n")) == 10
@@ -0,0 +1,227 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from spm2ytm.clients import spotify_client
+from spm2ytm.clients.request_scheduler import RequestScheduler
+from spm2ytm.clients.spotify_client import SpotifyClient, build_session
+from spm2ytm.core.extract import extract_library_to_text
+from spm2ytm.errors.custom_errors import SpotifyAuthError
+
+
+class FakeOAuth:
+    def __init__(self, cached):
+        self.cached = cached
+        self.refreshed_with = []
+
+    def get_cached_token(self):
+        return self.cached
+
+    def is_token_expired(self, token_info):
+        return token_info["expires_at"] - 60 < time.time()
+
+    def refresh_access_token(self, refresh_token):
+        self.refreshed_with.append(refresh_token)
+        return {
+            "access_token": f"access-{len(self.refreshed_with)}",
+            "refresh_token": f"rotated-{len(self.refreshed_with)}",
+            "expires_at": time.time() + 3600,
+        }
+
+
+@pytest.fixture
+def no_prompt(monkeypatch):
+    def fail(*_):
+        raise AssertionError("input() must not be called")
+
+    monkeypatch.setattr("builtins.input", fail)
+
+
+def make_client(monkeypatch, cached, **kwargs):
+    oauth = FakeOAuth(cached)
+    monkeypatch.setattr(spotify_client, "SpotifyOAuth", lambda **_: oauth)
+    return SpotifyClient("id", "secret", "http://localhost/cb", **kwargs), oauth
+
+
+def test_expired_token_is_refreshed_without_prompt(monkeypatch, no_prompt):
+    cached = {"access_token": "old", "refresh_token": "r0", "expires_at": 0}
+    client, oauth = make_client(monkeypatch, cached, interactive=True)
+
+    assert oauth.refreshed_with == ["r0"]
+    assert client.auth.get_access_token() == "access-1"
+
+
+def test_token_manager_rotates_refresh_token_mid_run(monkeypatch, no_prompt):
+    cached = {"access_token": "a", "refresh_token": "r0", "expires_at": time.time() + 3600}
+    client, oauth = make_client(monkeypatch, cached)
+    assert client.auth.get_access_token() == "a"
+
+    # Token expires during a long extraction
+    client.auth._token_info["expires_at"] = 0
+    assert client.auth.get_access_token() == "access-1"
+    client.auth._token_info["expires_at"] = 0
+    assert client.auth.get_access_token() == "access-2"
+    assert oauth.refreshed_with == ["r0", "rotated-1"]
+
+
+def test_missing_token_raises_when_not_interactive(monkeypatch, no_prompt):
+    with pytest.raises(SpotifyAuthError):
+        make_client(monkeypatch, None, interactive=False)
+
+
+def test_pages_are_fetched_concurrently_in_order(monkeypatch, no_prompt):
+    cached = {"access_token": "a", "refresh_token": "r", "expires_at": time.time() + 3600}
+    client, _ = make_client(monkeypatch, cached, max_connections=4)
+
+    total = 250
+    calls = []
+
+    def fake_playlist_items(playlist_id, limit, offset):
+        calls.append(offset)
+        items = [
+            {"track": {"name": f"song{i}", "artists": [{"name": "artist"}]}}
+            for i in range(offset, min(offset + limit, total))
+        ]
+        return {"items": items, "total": total}
+
+    monkeypatch.setattr(client.sp, "playlist_items", fake_playlist_items)
+    tracks = client.get_playlist_tracks("https://open.spotify.com/playlist/abc?si=x")
+
+    assert sorted(calls) == [0, 100, 200]
+    assert [t["title"] for t in tracks] == [f"song{i}" for i in range(total)]
+
+
+def test_session_honors_retry_after_on_429():
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(time.monotonic())
+            if len(hits) == 1:
+                self.send_response(429)
+                self.send_header("Retry-After", "1")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, *_):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        session = build_session(max_connections=2, retries=3, backoff_factor=0)
+        response = session.get(f"http://127.0.0.1:{server.server_port}/v1/me")
+    finally:
+        server.shutdown()
+
+    assert response.status_code == 200
+    assert len(hits) == 2
+    assert hits[1] - hits[0] >= 0.9
+    assert session.get_adapter("https://api.spotify.com")._pool_maxsize == 2
+
+
+def test_session_caps_retry_after_and_never_retries_post():
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, first_status, headers):
+            hits.append((self.command, time.monotonic()))
+            if len(hits) == 1 or self.command == "POST":
+                self.send_response(first_status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def do_GET(self):
+            self._reply(429, {"Retry-After": "3600"})
+
+        def do_POST(self):
+            self._reply(503, {})
+
+        def log_message(self, *_):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/api/token"
+    try:
+        session = build_session(retries=3, backoff_factor=0, max_retry_after=0.2)
+        start = time.monotonic()
+        assert session.get(url).status_code == 200
+        waited = time.monotonic() - start
+        assert session.post(url).status_code == 503
+    finally:
+        server.shutdown()
+
+    assert 0.15 <= waited < 5
+    assert [method for method, _ in hits] == ["GET", "GET", "POST"]
+
+
+def test_scheduler_limits_rate_after_burst():
+    scheduler = RequestScheduler(max_concurrency=4, rate=50, burst=2)
+    start = time.monotonic()
+    starts = scheduler.map(lambda _: time.monotonic() - start, range(12))
+
+    # 2 immediately, then 10 more at 50/s
+    assert max(starts) >= 0.18
+    assert scheduler.requests == 12
+    scheduler.shutdown()
+
+
+def test_library_export_shares_one_scheduler(monkeypatch, no_prompt, tmp_path):
+    cached = {"access_token": "a", "refresh_token": "r", "expires_at": time.time() + 3600}
+    client, _ = make_client(monkeypatch, cached, max_connections=3)
+
+    playlists = [
+        {"id": f"pl{i}", "name": f"Mix #{i}", "tracks": {"total": 30 * i}}
+        for i in range(12)
+    ]
+    playlists.append({"id": "gone", "name": "Daily Mix", "tracks": {"total": 5}})
+    in_flight = []
+    peak = []
+    lock = threading.Lock()
+
+    def current_user_playlists(limit, offset):
+        return {"items": playlists[offset : offset + limit], "total": len(playlists)}
+
+    def playlist_items(playlist_id, limit, offset):
+        with lock:
+            in_flight.append(1)
+            peak.append(len(in_flight))
+        time.sleep(0.005)
+        with lock:
+            in_flight.pop()
+        if playlist_id == "gone":
+            raise RuntimeError("http status: 404")
+        total = 30 * int(playlist_id[2:])
+        items = [
+            {"track": {"name": f"{playlist_id} song {n}", "artists": []}}
+            for n in range(offset, min(offset + limit, total))
+        ]
+        return {"items": items, "total": total}
+
+    monkeypatch.setattr(client.sp, "current_user_playlists", current_user_playlists)
+    monkeypatch.setattr(client.sp, "playlist_items", playlist_items)
+    exported = extract_library_to_text(client, str(tmp_path))
+
+    assert max(peak) <= 3
+    assert len(exported) == 13
+    path, result = exported[11]
+    assert path == str(tmp_path / "pl11-Mix_11.txt")
+    assert (result.pages, len(result.tracks)) == (4, 330)
+    with open(path) as f:
+        assert f.read().splitlines()[-1] == "pl11 song 329"
+    assert exported[0][1].pages == 0 and (tmp_path / "pl0-Mix_0.txt").exists()
+    assert exported[12][0] is None and "404" in exported[12][1].error
@@ -0,0 +1,84 @@
+import cProfile
+import json
+import pstats
+
+from click.testing import CliRunner
+
+from spm2ytm import tracing
+from spm2ytm.cli.main import cli
+from spm2ytm.clients.search_providers import FakeSearchProvider, SearchHit
+from spm2ytm.core.create import generate_video_ids_file
+
+
+def test_trace_has_stage_item_and_queue_spans(tmp_path):
+    songs = [f"Song {i}  Artist" for i in range(8)]
+    song_file = tmp_path / "songs.txt"
+    song_file.write_text("\n".join(songs))
+    hits = {s: SearchHit(f"vid{i:08d}", s, "Artist") for i, s in enumerate(songs)}
+    provider = FakeSearchProvider(hits, latency=0.02)
+
+    tracing.start_tracing(str(tmp_path / "trace.json"))
+    try:
+        generate_video_ids_file(str(song_file), max_workers=2, provider=provider)
+    finally:
+        path = tracing.stop_tracing()
+    assert not tracing.enabled()
+
+    with open(path) as f:
+        events = json.load(f)["traceEvents"]
+    spans = [e for e in events if e["ph"] == "X"]
+    searches = [e for e in spans if e["name"] == "search"]
+    assert sorted(e["args"]["song"] for e in searches) == sorted(songs)
+    assert all(e["dur"] >= 15000 for e in searches)  # microseconds
+
+    # Each worker thread gets its own named lane
+    lanes = {e["tid"]: e["args"]["name"] for e in events if e["name"] == "thread_name"}
+    assert len({e["tid"] for e in searches}) == 2
+    assert all(lanes[e["tid"]].startswith("ThreadPoolExecutor") for e in searches)
+
+    (search_pass,) = [e for e in spans if e["name"] == "search pass"]
+    assert search_pass["args"] == {"songs": 8}
+    assert lanes[search_pass["tid"]] == "MainThread"
+    queued = [e for e in events if e["name"] == "queued search"]
+    assert len(queued) == 16 and {e["ph"] for e in queued} == {"b", "e"}
+
+
+def test_profile_covers_worker_threads(tmp_path):
+    songs = [f"Song {i}  Artist" for i in range(4)]
+    song_file = tmp_path / "songs.txt"
+    song_file.write_text("\n".join(songs))
+    hits = {s: SearchHit(f"vid{i:08d}", s, "Artist") for i, s in enumerate(songs)}
+    provider = FakeSearchProvider(hits)
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        generate_video_ids_file(str(song_file), max_workers=2, provider=provider)
+    finally:
+        profiler.disable()
+    tracing.write_profile(profiler, str(tmp_path / "profile.txt"))
+
+    # The searches ran on pool threads, not the main thread
+    searches = [
+        calls
+        for (path, _, name), (calls, *_) in pstats.Stats(profiler).stats.items()
+        if path.endswith("search_providers.py") and name == "search"
+    ]
+    assert sum(searches) == len(songs)
+    assert (tmp_path / "profile.prof").exists()
+
+
+def test_cli_trace_and_profile_write_to_data_logs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "songs.txt").write_text("A Song  Band\na song - band\n")
+
+    res = CliRunner().invoke(cli, ["--trace", "--profile", "dedupe", "songs.txt"])
+
+    assert res.exit_code == 0, res.output
+    logs = tmp_path / "data" / "logs"
+    (report,) = logs.glob("profile-*.txt")
+    assert "Sorted by cumulative" in report.read_text()
+    assert list(logs.glob("profile-*.prof"))
+    (trace,) = logs.glob("trace-*.json")
+    assert json.loads(trace.read_text())["traceEvents"]
+    assert "Trace written to" in res.output
@@ -0,0 +1,141 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from spm2ytm.clients import yt_client
+from spm2ytm.clients.search_providers import YtDlpSearchProvider
+from spm2ytm.clients.yt_bootstrap import BootstrapCache, parse_bootstrap
+
+HOME_PAGE = (
+    '<script>ytcfg.set({"INNERTUBE_API_KEY":"AIzaTestKey",'
+    '"INNERTUBE_CLIENT_VERSION":"2.20261001.00.00",'
+    '"VISITOR_DATA":"CgtWaXNpdG9y"});</script>'
+)
+
+
+class CountingFetcher:
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def __call__(self, ttl):
+        with self._lock:
+            self.calls += 1
+            calls = self.calls
+        time.sleep(0.01)
+        if self.fail:
+            raise ConnectionError("offline")
+        return parse_bootstrap(
+            HOME_PAGE.replace("CgtWaXNpdG9y", f"visitor{calls}"), {"YSC": "y"}, ttl
+        )
+
+
+def test_parse_bootstrap_reads_client_config():
+    state = parse_bootstrap(HOME_PAGE, {"YSC": "abc"}, ttl=60)
+
+    assert (state.api_key, state.client_version, state.visitor_data) == (
+        "AIzaTestKey",
+        "2.20261001.00.00",
+        "CgtWaXNpdG9y",
+    )
+    assert state.cookies == {"YSC": "abc"}
+    assert not state.expired() and state.expired(state.fetched_at + 61)
+    with pytest.raises(ValueError, match="client config"):
+        parse_bootstrap("<html>consent</html>", {})
+
+
+def test_cache_fetches_once_and_persists_across_runs(tmp_path):
+    path = str(tmp_path / "bootstrap.json")
+    fetcher = CountingFetcher()
+    cache = BootstrapCache(path, fetcher=fetcher)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        states = list(pool.map(lambda _: cache.get(), range(200)))
+
+    assert fetcher.calls == 1
+    assert (cache.fetches, cache.reuses) == (1, 199)
+    assert len({id(state) for state in states}) == 1
+    assert cache.summary() == "Search bootstrap: 1 fetched, 199 reused"
+
+    # A later run (or worker process) picks it up from disk
+    next_run = BootstrapCache(path, fetcher=fetcher)
+    assert next_run.get().visitor_data == "visitor1"
+    assert (next_run.fetches, fetcher.calls) == (0, 1)
+
+    # ...unless it has expired
+    with open(path) as f:
+        data = json.load(f)
+    data["expires_at"] = time.time() - 1
+    with open(path, "w") as f:
+        json.dump(data, f)
+    assert BootstrapCache(path, fetcher=fetcher).get().visitor_data == "visitor2"
+
+
+def test_invalidate_refreshes_once_and_failures_back_off(tmp_path):
+    fetcher = CountingFetcher()
+    cache = BootstrapCache(None, fetcher=fetcher, min_refresh_interval=0)
+    stale = cache.get()
+
+    # Many workers report the same failing bootstrap; one refetch results
+    for _ in range(5):
+        cache.invalidate(stale)
+    fresh = cache.get()
+    cache.invalidate(stale)
+    assert cache.get() is fresh
+    assert fetcher.calls == 2
+
+    offline = BootstrapCache(None, fetcher=CountingFetcher(fail=True))
+    assert offline.get() is None
+    assert offline.get() is None
+    assert (offline.fetcher.calls, offline.fetches) == (1, 0)
+
+
+class FakeYoutubeDL:
+    instances: list["FakeYoutubeDL"] = []
+    lock = threading.Lock()
+
+    def __init__(self, opts):
+        self.opts = opts
+        self.cookies = []
+        self.cookiejar = self
+        with self.lock:
+            self.instances.append(self)
+
+    def set_cookie(self, cookie):
+        self.cookies.append((cookie.name, cookie.value))
+
+    def extract_info(self, term, download):
+        visitor = self.opts["extractor_args"]["youtube"]["visitor_data"][0]
+        if visitor == "visitor1" and "Retry" in term:
+            raise ConnectionError("HTTP Error 400: Bad Request")
+        return {"entries": [{"id": "vid00000001", "title": term}]}
+
+    def close(self):
+        pass
+
+
+def test_ytdlp_provider_reuses_one_client_per_thread(tmp_path, monkeypatch):
+    monkeypatch.setattr(yt_client, "YoutubeDL", FakeYoutubeDL)
+    FakeYoutubeDL.instances = []
+    fetcher = CountingFetcher()
+    cache = BootstrapCache(None, fetcher=fetcher, min_refresh_interval=0)
+    provider = YtDlpSearchProvider(cache)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        hits = list(pool.map(provider.search, [f"Song {i}" for i in range(100)]))
+
+    assert all(hit.video_id == "vid00000001" for hit in hits)
+    assert len(FakeYoutubeDL.instances) <= 4
+    assert fetcher.calls == 1
+    ydl = FakeYoutubeDL.instances[0]
+    assert ydl.opts["extractor_args"]["youtubetab"] == {"skip": ["webpage"]}
+    assert ("YSC", "y") in ydl.cookies
+
+    # A rejected bootstrap is refreshed and the search retried once
+    assert provider.search("Retry Song").video_id == "vid00000001"
+    assert fetcher.calls == 2
+    assert provider.summary() == "Search bootstrap: 2 fetched, 100 reused"
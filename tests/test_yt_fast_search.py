@@ -0,0 +1,65 @@
+from pathlib import Path
+
+from spm2ytm.clients.search_providers import (FakeSearchProvider,
+                                              FastSearchProvider, SearchHit)
+from spm2ytm.clients.yt_fast_search import (has_results_layout,
+                                            parse_video_renderers)
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def load(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def test_parses_first_video_renderers_from_results_page():
+    hits = parse_video_renderers(load("youtube_search_results.html"), limit=3)
+
+    assert hits[0] == SearchHit("bx1Bh8ZvH84", "Wonderwall (Remastered)", "Oasis", 259)
+    assert hits[1].video_id == "6hzrDeceEKc"
+    assert hits[1].title == 'Oasis - Wonderwall "Live" at Knebworth & More'
+    assert hits[1].duration == 3723
+    assert hits[2].title == "Wonderwall cover 2 – acoustic"
+
+
+def test_limit_stops_the_scan_early():
+    page = load("youtube_search_results.html")
+    assert len(parse_video_renderers(page, limit=1)) == 1
+    # Includes the renderer nested in the shelf
+    assert len(parse_video_renderers(page, limit=100)) == 21
+
+
+def test_unrecognized_and_empty_pages():
+    consent = load("youtube_consent.html")
+    no_results = load("youtube_search_no_results.json")
+
+    assert parse_video_renderers(consent) == []
+    assert not has_results_layout(consent)
+    assert parse_video_renderers(no_results) == []
+    assert has_results_layout(no_results)
+
+
+class StaticPageProvider(FastSearchProvider):
+    def __init__(self, page, fallback):
+        super().__init__(fallback=fallback)
+        self.page = page
+
+    def fetch(self, query):
+        return self.page
+
+
+def test_fast_provider_falls_back_on_unknown_page_shape():
+    fallback = FakeSearchProvider({"q": "fallback_id"})
+
+    fast = StaticPageProvider(load("youtube_search_results.html"), fallback)
+    assert fast.search("q").video_id == "bx1Bh8ZvH84"
+    assert fast.fallbacks == 0
+
+    consent = StaticPageProvider(load("youtube_consent.html"), fallback)
+    assert consent.search("q").video_id == "fallback_id"
+    assert consent.fallbacks == 1
+    assert "fell back to fake 1 time(s)" in consent.summary()
+
+    empty = StaticPageProvider(load("youtube_search_no_results.json"), fallback)
+    assert empty.search("q") is None
+    assert empty.fallbacks == 0